@@ -0,0 +1,158 @@
+# app/allocator.py
+#
+# In-memory free lists of available slots, per zone and vehicle type.
+# The database stays the source of truth: every id handed out here is
+# re-checked against parking_slots before it is booked, so a stale entry
+# only costs one extra lookup. The lists are per process and only see the
+# releases this process makes; slots freed elsewhere (another worker, an
+# admin, the sweeper) are picked up by reloading a zone whose list runs dry.
+
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+class FreeList:
+    """
+    FIFO of free slot ids with O(1) amortized pop/add/remove.
+    Removed ids stay in the queue and are skipped when they reach the front.
+    """
+
+    def __init__(self, slot_ids: Iterable[int] = ()):
+        self._queue = deque(slot_ids)
+        self._free = set(self._queue)
+
+    def __len__(self):
+        return len(self._free)
+
+    def pop(self) -> Optional[int]:
+        while self._queue:
+            slot_id = self._queue.popleft()
+            if slot_id in self._free:
+                self._free.remove(slot_id)
+                return slot_id
+        return None
+
+    def add(self, slot_id: int):
+        if slot_id not in self._free:
+            self._free.add(slot_id)
+            self._queue.append(slot_id)
+
+    def remove(self, slot_id: int) -> bool:
+        if slot_id in self._free:
+            self._free.remove(slot_id)
+            return True
+        return False
+
+
+class SlotAllocator:
+    """
+    zone_id -> vehicle_type -> FreeList of available slot ids.
+    Slots are handed out lowest id first at startup, then in release order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zones: Dict[int, Dict[str, FreeList]] = {}
+
+    # ======================
+    # LOADING
+    # ======================
+    def load(self, db: Session):
+        """Rebuild every zone's free lists from parking_slots."""
+        rows = db.query(
+            models.ParkingSlot.id,
+            models.ParkingSlot.zone_id,
+            models.ParkingSlot.vehicle_type
+        ).filter(
+            models.ParkingSlot.status == "available"
+        ).order_by(models.ParkingSlot.id).all()
+
+        zones: Dict[int, Dict[str, FreeList]] = {}
+        for slot_id, zone_id, vehicle_type in rows:
+            zones.setdefault(zone_id, {}).setdefault(vehicle_type, FreeList()).add(slot_id)
+
+        # Zones without free slots still count as loaded
+        zone_ids = db.query(models.ParkingZone.id).all()
+        for (zone_id,) in zone_ids:
+            zones.setdefault(zone_id, {})
+
+        with self._lock:
+            self._zones = zones
+
+    def _load_zone(self, db: Session, zone_id: int, replace: bool = False):
+        """Read one zone's free slots; keeps an already loaded zone unless replace."""
+        rows = db.query(
+            models.ParkingSlot.id,
+            models.ParkingSlot.vehicle_type
+        ).filter(
+            models.ParkingSlot.zone_id == zone_id,
+            models.ParkingSlot.status == "available"
+        ).order_by(models.ParkingSlot.id).all()
+
+        free: Dict[str, FreeList] = {}
+        for slot_id, vehicle_type in rows:
+            free.setdefault(vehicle_type, FreeList()).add(slot_id)
+
+        with self._lock:
+            if replace:
+                self._zones[zone_id] = free
+            else:
+                self._zones.setdefault(zone_id, free)
+
+    def _ensure_zone(self, db: Session, zone_id: int):
+        """Load one zone on first use (e.g. created after startup)."""
+        if zone_id not in self._zones:
+            self._load_zone(db, zone_id)
+
+    # ======================
+    # ALLOCATION
+    # ======================
+    def acquire(self, db: Session, zone_id: int, vehicle_type: Optional[str] = None) -> Optional[int]:
+        """
+        Atomically take one free slot id from the zone, or None if it is full.
+        Without a vehicle_type any type may be returned. An empty list is
+        reloaded from the database once before giving up.
+        """
+        self._ensure_zone(db, zone_id)
+        slot_id = self._pop(zone_id, vehicle_type)
+        if slot_id is None:
+            self._load_zone(db, zone_id, replace=True)
+            slot_id = self._pop(zone_id, vehicle_type)
+        return slot_id
+
+    def _pop(self, zone_id: int, vehicle_type: Optional[str]) -> Optional[int]:
+        with self._lock:
+            free = self._zones.get(zone_id, {})
+            types = (vehicle_type,) if vehicle_type else tuple(free)
+            for vtype in types:
+                slots = free.get(vtype)
+                if slots:
+                    return slots.pop()
+        return None
+
+    def claim(self, zone_id: int, slot_id: int):
+        """Take a specific slot out of the free lists (booked or marked occupied)."""
+        with self._lock:
+            for slots in self._zones.get(zone_id, {}).values():
+                if slots.remove(slot_id):
+                    return
+
+    def release(self, zone_id: int, slot_id: int, vehicle_type: str):
+        """Return a slot to its zone's free list."""
+        with self._lock:
+            free = self._zones.get(zone_id)
+            # Unloaded zones pick the slot up from the DB on first use
+            if free is not None:
+                free.setdefault(vehicle_type, FreeList()).add(slot_id)
+
+    def discard(self, zone_id: int, slot_id: int):
+        """Forget a slot entirely (deleted)."""
+        self.claim(zone_id, slot_id)
+
+
+slot_allocator = SlotAllocator()
@@ -0,0 +1,261 @@
+# app/analytics.py
+#
+# Occupancy analytics for admins: an append-only event log folded into
+# hourly per-zone rollups.
+#
+# Write paths append an event in the same transaction as the change they
+# describe (record_events): a slot becoming occupied or free, and the
+# revenue of a booking or extension. A background job folds new events
+# into zone_hourly_stats in id order. zone_occupancy_state remembers, per
+# zone, how many slots were occupied since its last event, so occupied
+# time can be spread over the hours between two events. Each run reads
+# only events it hasn't folded yet and never touches bookings.
+#
+# The time series is read from the hourly rows, plus that state for the
+# time since a zone's last event. Events newer than the last fold show up
+# after the next run (at most PARKING_ROLLUP_INTERVAL seconds).
+
+import asyncio
+import logging
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("PARKING_ROLLUP_INTERVAL", "60"))
+ROLLUP_BATCH_SIZE = int(os.getenv("PARKING_ROLLUP_BATCH_SIZE", "5000"))
+
+HOUR = timedelta(hours=1)
+
+
+def floor_hour(at: datetime) -> datetime:
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def naive_utc(at: datetime) -> datetime:
+    """Stored times are naive UTC; convert aware ones (e.g. "...Z", "+05:30")."""
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# ======================
+# EVENT LOG
+# ======================
+def event(kind: str, zone_id: int, slot_id: Optional[int] = None,
+          booking_id: Optional[int] = None, amount: float = 0.0) -> dict:
+    """kind: "occupy" / "release" (a slot changed state) or "extend" (revenue only)."""
+    return {"kind": kind, "zone_id": zone_id, "slot_id": slot_id,
+            "booking_id": booking_id, "amount": amount}
+
+
+def record_events(db: Session, events: Iterable[dict]):
+    """Append events in the caller's transaction; they commit or roll back with it."""
+    now = datetime.utcnow()
+    rows = [{**e, "occurred_at": now} for e in events]
+    if rows:
+        db.execute(insert(models.OccupancyEvent), rows)
+
+
+# ======================
+# ROLLUP
+# ======================
+def _split_hours(start: datetime, end: datetime) -> Iterable[Tuple[datetime, float]]:
+    """(hour, seconds) pieces of [start, end)."""
+    hour = floor_hour(start)
+    while hour < end:
+        seconds = (min(end, hour + HOUR) - max(start, hour)).total_seconds()
+        if seconds > 0:
+            yield hour, seconds
+        hour += HOUR
+
+
+def fold_events(db: Session, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """Fold the next batch of events into the hourly rows. Returns events folded; committed."""
+    state, stats, log = models.ZoneOccupancyState, models.ZoneHourlyStats, models.OccupancyEvent
+
+    # Every worker runs the rollup: take the write lock before reading the
+    # cursor, so two of them fold one after the other, never the same events
+    db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+    cursor = db.query(func.coalesce(func.max(state.last_event_id), 0)).scalar()
+    events = db.query(
+        log.id, log.zone_id, log.kind, log.amount, log.occurred_at
+    ).filter(log.id > cursor).order_by(log.id).limit(batch_size).all()
+    if not events:
+        db.rollback()
+        return 0
+
+    # zone_id -> [occupied, since, last event id]
+    zones: Dict[int, list] = {
+        row.zone_id: [row.occupied, row.last_event_at, row.last_event_id]
+        for row in db.query(state.zone_id, state.occupied, state.last_event_at, state.last_event_id)
+        .filter(state.zone_id.in_({e.zone_id for e in events}))
+    }
+    # (zone_id, hour) -> [occupied_seconds, occupancies, releases, revenue]
+    buckets: Dict[Tuple[int, datetime], list] = defaultdict(lambda: [0.0, 0, 0, 0.0])
+
+    for e in events:
+        occupied, since, _ = zones.get(e.zone_id, (0, None, 0))
+        # Ids are handed out in commit order, clocks aren't quite: never go back
+        at = max(e.occurred_at, since) if since else e.occurred_at
+        if occupied and since:
+            for hour, seconds in _split_hours(since, at):
+                buckets[(e.zone_id, hour)][0] += occupied * seconds
+
+        bucket = buckets[(e.zone_id, floor_hour(at))]
+        if e.kind == "occupy":
+            occupied += 1
+            bucket[1] += 1
+        elif e.kind == "release":
+            occupied = max(0, occupied - 1)
+            bucket[2] += 1
+        bucket[3] += e.amount
+        zones[e.zone_id] = [occupied, at, e.id]
+
+    upsert = sqlite_insert(stats)
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[stats.zone_id, stats.hour],
+            set_={name: getattr(stats, name) + getattr(upsert.excluded, name)
+                  for name in ("occupied_seconds", "occupancies", "releases", "revenue")}
+        ),
+        [{"zone_id": zone_id, "hour": hour, "occupied_seconds": b[0], "occupancies": b[1],
+          "releases": b[2], "revenue": b[3]}
+         for (zone_id, hour), b in buckets.items()]
+    )
+
+    upsert = sqlite_insert(state)
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[state.zone_id],
+            set_={name: getattr(upsert.excluded, name)
+                  for name in ("occupied", "last_event_at", "last_event_id")}
+        ),
+        [{"zone_id": zone_id, "occupied": occupied, "last_event_at": since, "last_event_id": last_id}
+         for zone_id, (occupied, since, last_id) in zones.items()]
+    )
+
+    db.commit()
+    return len(events)
+
+
+def run_rollup(session_factory: Callable = SessionLocal, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """Fold every pending event, batch by batch. Returns events folded."""
+    total = 0
+    db = session_factory()
+    try:
+        while True:
+            folded = fold_events(db, batch_size)
+            total += folded
+            if folded < batch_size:
+                break
+    finally:
+        db.close()
+
+    if total:
+        logger.info("Folded %d occupancy events", total)
+    return total
+
+
+# ======================
+# SCHEDULER
+# ======================
+class OccupancyRollup:
+    def __init__(self, interval: float = ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        while True:
+            try:
+                await run_in_threadpool(run_rollup)
+            except Exception:
+                logger.exception("Occupancy rollup failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+occupancy_rollup = OccupancyRollup()
+
+
+# ======================
+# TIME SERIES
+# ======================
+def occupancy_series(db: Session, zone: models.ParkingZone, start: datetime, end: datetime,
+                     now: Optional[datetime] = None) -> dict:
+    """
+    One point per hour in [floor(start), end), capped at now: average
+    occupied slots, occupancy rate (% of the zone's current total),
+    turnover (occupancies started) and revenue.
+    """
+    now = naive_utc(now) if now else datetime.utcnow()
+    start, end = naive_utc(start), naive_utc(end)
+    stats, state = models.ZoneHourlyStats, models.ZoneOccupancyState
+    first, end = floor_hour(start), min(end, now)
+    points = max(0, math.ceil((end - first) / HOUR))
+
+    # Offsets in seconds from `first`: hour i covers [starts[i], stops[i])
+    starts = np.arange(points, dtype=np.float64) * HOUR.total_seconds()
+    stops = np.minimum(starts + HOUR.total_seconds(), (end - first).total_seconds())
+    occupied_seconds = np.zeros(points)
+    turnover = np.zeros(points, dtype=np.int64)
+    revenue = np.zeros(points)
+
+    rows = db.query(
+        stats.hour, stats.occupied_seconds, stats.occupancies, stats.revenue
+    ).filter(
+        stats.zone_id == zone.id,
+        stats.hour >= first,
+        stats.hour < end
+    ).all()
+    if rows:
+        hours, seconds, occupancies, amounts = zip(*rows)
+        index = [(hour - first) // HOUR for hour in hours]
+        occupied_seconds[index] = seconds
+        turnover[index] = occupancies
+        revenue[index] = amounts
+
+    # Occupied since the zone's last folded event, not in any row yet
+    current = db.query(state.occupied, state.last_event_at).filter(state.zone_id == zone.id).first()
+    if current and current.occupied and current.last_event_at:
+        since = (current.last_event_at - first).total_seconds()
+        occupied_seconds += current.occupied * np.clip(stops - np.maximum(starts, since), 0, None)
+
+    average = occupied_seconds / (stops - starts) if points else occupied_seconds
+    rate = average / zone.total_slots * 100 if zone.total_slots else np.zeros(points)
+
+    return {
+        "zone_id": zone.id,
+        "zone_name": zone.name,
+        "total_slots": zone.total_slots,
+        "folded_until": current.last_event_at if current else None,
+        "hours": [first + HOUR * i for i in range(points)],
+        "average_occupied": np.round(average, 3).tolist(),
+        "occupancy_rate": np.round(rate, 2).tolist(),
+        "turnover": turnover.tolist(),
+        "revenue": np.round(revenue, 2).tolist(),
+    }
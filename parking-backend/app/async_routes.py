@@ -0,0 +1,230 @@
+# app/async_routes.py
+#
+# Async stack, used when PARKING_DB_MODE=async (see app/main.py).
+# Needs the async extras: sqlalchemy[asyncio] and aiosqlite.
+#
+# Auth routes are written natively against AsyncSession. Parking routes are
+# async twins of the sync handlers in app/parking.py: each twin awaits an
+# AsyncSession and runs the unchanged handler body through run_sync(), so
+# DB I/O no longer holds a threadpool worker and both modes share one
+# implementation.
+
+import asyncio
+import inspect
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import create_access_token, rehash_statement
+from app.database import AsyncSessionLocal, AsyncReadSessionLocal
+from app.passwords import submit_hash, submit_verify
+from app.deps import (
+    Principal, get_db, get_read_db, get_token_claims, principal_cache
+)
+from app.schemas import RegisterRequest, LoginRequest, TokenResponse
+
+
+# ======================
+# DEPENDENCIES
+# ======================
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db():
+    db = AsyncReadSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# Sync session dependency -> async replacement used by the twins
+ASYNC_SESSION_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+}
+
+
+async def get_current_user_async(
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Principal:
+    """Async get_current_user; app/main.py swaps it in for the sync one."""
+    email = claims["sub"]
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(models.User).where(models.User.email == email)
+    )
+    user = result.scalars().first()
+    # Like get_current_user: don't hold the read connection for the request
+    await db.close()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    principal = Principal.from_user(user)
+    principal_cache.set(email, principal)
+    return principal
+
+
+# ======================
+# AUTH
+# ======================
+auth_router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+@auth_router.post("/register", status_code=201)
+async def register(
+    user: RegisterRequest,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
+):
+    result = await read_db.execute(
+        select(models.User).where(models.User.email == user.email)
+    )
+    existing_user = result.scalars().first()
+    # Hand the read connection back before hashing
+    await read_db.close()
+
+    if existing_user:
+        raise HTTPException(
+            status_code=400,
+            detail="Email already registered"
+        )
+
+    # bcrypt runs on the hashing process pool (503 when saturated)
+    password = await asyncio.wrap_future(submit_hash(user.password))
+
+    db.add(models.User(
+        name=user.name,
+        email=user.email,
+        password=password,
+        role=user.role
+    ))
+    await db.commit()
+
+    return {"message": "Registered successfully"}
+
+
+@auth_router.post("/login", response_model=TokenResponse)
+async def login(
+    credentials: LoginRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(
+        select(models.User).where(models.User.email == credentials.email)
+    )
+    user = result.scalars().first()
+    # Hand the read connection back before bcrypt runs; `user` stays loaded
+    await db.close()
+
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await asyncio.wrap_future(
+            submit_verify(credentials.password, user.password)
+        )
+
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+
+    if new_hash:
+        await write_db.execute(rehash_statement(user.id, user.password, new_hash))
+        await write_db.commit()
+
+    token = create_access_token({
+        "sub": user.email,
+        "role": user.role
+    })
+
+    return TokenResponse(
+        access_token=token,
+        role=user.role
+    )
+
+
+# ======================
+# ASYNC TWINS OF SYNC ROUTES
+# ======================
+def _async_endpoint(endpoint):
+    """
+    Wrap a sync handler: parameters that depend on get_db / get_read_db get
+    the matching AsyncSession instead, and the handler runs via run_sync().
+    """
+    signature = inspect.signature(endpoint)
+    session_params = {
+        name: ASYNC_SESSION_DEPENDENCIES[param.default.dependency]
+        for name, param in signature.parameters.items()
+        if isinstance(param.default, DependsParam)
+        and param.default.dependency in ASYNC_SESSION_DEPENDENCIES
+    }
+
+    async def wrapper(**kwargs):
+        sessions = {name: kwargs.pop(name) for name in session_params}
+        if not sessions:
+            return await run_in_threadpool(endpoint, **kwargs)
+
+        # Inside run_sync every session's sync facade can do async I/O
+        def call(_):
+            return endpoint(**kwargs, **{
+                name: session.sync_session for name, session in sessions.items()
+            })
+
+        return await next(iter(sessions.values())).run_sync(call)
+
+    parameters = [
+        param.replace(default=Depends(session_params[name]), annotation=AsyncSession)
+        if name in session_params else param
+        for name, param in signature.parameters.items()
+    ]
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.__name__ = endpoint.__name__
+    wrapper.__doc__ = endpoint.__doc__
+    return wrapper
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Same paths, models and status codes as `router`, with async endpoints."""
+    twin = APIRouter()
+
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            twin.routes.append(route)
+            continue
+
+        twin.add_api_route(
+            route.path,
+            _async_endpoint(route.endpoint),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            responses=route.responses,
+            response_class=route.response_class,
+            name=route.name
+        )
+
+    return twin
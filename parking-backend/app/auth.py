@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 
 from app.database import SessionLocal
+from app.deps import get_read_db
+from app.passwords import hash_password, verify_and_update
 from app import models
 from app.schemas import RegisterRequest, LoginRequest, TokenResponse
 
@@ -17,8 +19,6 @@ SECRET_KEY = "SUPER_SECRET_KEY_CHANGE_LATER"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # ======================
 # DB Dependency
 # ======================
@@ -32,14 +32,7 @@ def get_db():
 # ======================
 # UTILS
 # ======================
-def hash_password(password: str) -> str:
-    # bcrypt max length = 72 bytes
-    if len(password.encode("utf-8")) > 72:
-        password = password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    return pwd_context.hash(password)
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+# Password hashing runs on the process pool in app/passwords.py
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -47,14 +40,29 @@ def create_access_token(data: dict) -> str:
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def rehash_statement(user_id: int, old_hash: str, new_hash: str):
+    """Store an upgraded hash, unless the password changed meanwhile."""
+    return update(models.User).where(
+        models.User.id == user_id,
+        models.User.password == old_hash
+    ).values(password=new_hash).execution_options(principal_unchanged=True)
+
 # ======================
 # REGISTER
 # ======================
 @router.post("/register", status_code=201)
-def register(user: RegisterRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(models.User).filter(
+def register(
+    user: RegisterRequest,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
+    # Check on the read pool: the writer connection is only taken for the
+    # INSERT, not held while bcrypt runs
+    existing_user = read_db.query(models.User).filter(
         models.User.email == user.email
     ).first()
+    # Nor is the read connection: hand it back before hashing
+    read_db.close()
 
     if existing_user:
         raise HTTPException(
@@ -79,17 +87,31 @@ def register(user: RegisterRequest, db: Session = Depends(get_db)):
 # LOGIN
 # ======================
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+def login(
+    credentials: LoginRequest,
+    db: Session = Depends(get_read_db),
+    write_db: Session = Depends(get_db)
+):
     user = db.query(models.User).filter(
         models.User.email == credentials.email
     ).first()
+    # Hand the read connection back before bcrypt runs; `user` stays loaded
+    db.close()
 
-    if not user or not verify_password(credentials.password, user.password):
+    valid, new_hash = verify_and_update(credentials.password, user.password) if user else (False, None)
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Stored hash uses an outdated cost factor: upgrade it transparently.
+    # The writer connection is only taken in this case.
+    if new_hash:
+        write_db.execute(rehash_statement(user.id, user.password, new_hash))
+        write_db.commit()
+
     token = create_access_token({
         "sub": user.email,
         "role": user.role
@@ -0,0 +1,97 @@
+# app/cache.py
+#
+# Small in-process caches shared by the request path.
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+    Oldest entries are evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class VersionedCache:
+    """
+    One cached value tagged with the version it was built for. Callers
+    pass the current version, read from the database (app.queries.
+    zones_version), so every worker agrees on it and on the ETag; a newer
+    version than the cached one rebuilds.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._cached_version = -1
+        self._value = None
+
+    def etag(self, version: int) -> str:
+        return f'"{self.name}-{version}"'
+
+    def get(self, version: int, build):
+        """
+        (etag, value): the cached value if built for `version`, else build()
+        and cache it. Read the version *before* building: a write committed
+        meanwhile makes the next call see a newer one and rebuild.
+        """
+        with self._lock:
+            if self._cached_version == version:
+                return self.etag(version), self._value
+
+        value = build()
+        with self._lock:
+            if version >= self._cached_version:
+                self._cached_version = version
+                self._value = value
+        return self.etag(version), value
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """True if an If-None-Match header value covers `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
@@ -1,18 +1,179 @@
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 DATABASE_URL = "sqlite:///./parking.db"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
+# "sync": threadpool routes on the engine below
+# "async": async routes on an aiosqlite engine (see app/async_routes.py)
+DB_MODE = os.getenv("PARKING_DB_MODE", "sync")
+
+# "wal": WAL journal + tuned pragmas, GETs on a read-only pool and all
+#        writes through a single writer connection
+# "default": SQLite defaults, one engine for everything
+SQLITE_PROFILE = os.getenv("PARKING_SQLITE_PROFILE", "wal")
+READ_POOL_SIZE = int(os.getenv("PARKING_READ_POOL_SIZE", "8"))
+
+# Request / SQL metrics and GET /metrics (app/metrics.py); "0" turns them off
+METRICS_ENABLED = os.getenv("PARKING_METRICS", "1") != "0"
+
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),          # safe with WAL, no fsync per commit
+    ("busy_timeout", "5000"),           # ms to wait for the writer lock
+    ("mmap_size", str(256 * 1024 * 1024)),
+    ("cache_size", str(-64 * 1024)),    # negative = KiB, i.e. 64 MiB
 )
 
+
+def _pragma_listener(read_only: bool):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS:
+            # journal_mode is a database-wide setting owned by the writer
+            if read_only and name == "journal_mode":
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return set_pragmas
+
+
+def sqlite_engine_options(read_only: bool = False, profile: str = SQLITE_PROFILE) -> dict:
+    """Pool sizing for the profile: one writer connection, a pool of readers."""
+    if profile != "wal":
+        return {}
+    if read_only:
+        return {"pool_size": READ_POOL_SIZE, "max_overflow": 0}
+    return {"pool_size": 1, "max_overflow": 0}
+
+
+def apply_sqlite_profile(engine, read_only: bool = False, profile: str = SQLITE_PROFILE):
+    """Run the profile's pragmas on every new DBAPI connection of `engine`."""
+    if profile == "wal":
+        event.listen(engine, "connect", _pragma_listener(read_only))
+    return engine
+
+
+def create_sqlite_engine(url: str, read_only: bool = False, profile: str = SQLITE_PROFILE):
+    return apply_sqlite_profile(
+        create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            **sqlite_engine_options(read_only, profile)
+        ),
+        read_only,
+        profile
+    )
+
+
+# ======================
+# QUERY TIMING (app/metrics.py)
+# ======================
+class QueryStats:
+    """Statements run and seconds spent in them."""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set by the metrics middleware for the request being served; it follows
+# the request into threadpool workers and run_sync greenlets
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+# Statements outside any request: startup, sweeper, realtime broker
+background_queries = QueryStats()
+_background_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # A connection runs one statement at a time, so one slot is enough
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+    stats = request_queries.get()
+    if stats is None:
+        with _background_lock:
+            background_queries.count += 1
+            background_queries.seconds += elapsed
+    else:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def instrument_engine(engine):
+    """Count and time every statement on `engine` (no-op with PARKING_METRICS=0)."""
+    if METRICS_ENABLED:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+engine = instrument_engine(create_sqlite_engine(DATABASE_URL))
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# GET endpoints read through their own pool so they never queue behind the writer
+read_engine = (
+    instrument_engine(create_sqlite_engine(DATABASE_URL, read_only=True))
+    if SQLITE_PROFILE == "wal" else engine
+)
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
 Base = declarative_base()
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+Base.metadata.create_all(bind=engine)
+
+
+# ======================
+# ASYNC ENGINE (PARKING_DB_MODE=async)
+# ======================
+async_engine = None
+AsyncSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **sqlite_engine_options())
+    apply_sqlite_profile(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        autoflush=False,
+        bind=async_engine
+    )
+
+    async_read_engine = async_engine
+    if SQLITE_PROFILE == "wal":
+        async_read_engine = create_async_engine(
+            ASYNC_DATABASE_URL, **sqlite_engine_options(read_only=True)
+        )
+        apply_sqlite_profile(async_read_engine.sync_engine, read_only=True)
+        instrument_engine(async_read_engine.sync_engine)
+
+    AsyncReadSessionLocal = async_sessionmaker(
+        autoflush=False,
+        bind=async_read_engine
+    )
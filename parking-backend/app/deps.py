@@ -1,8 +1,12 @@
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.cache import TTLCache
+from app.database import SessionLocal, ReadSessionLocal
 from app import models
 
 SECRET_KEY = "SUPER_SECRET_KEY_CHANGE_LATER"
@@ -10,6 +14,55 @@ ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Authenticated users, keyed by token subject (email)
+AUTH_CACHE_SIZE = 4096
+AUTH_CACHE_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authenticated user as seen by route handlers.
+    A plain value, so it can be cached and shared across requests/threads.
+    """
+    id: int
+    name: str
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(id=user.id, name=user.name, email=user.email, role=user.role)
+
+
+principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(models.User, "after_insert")
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_principal(mapper, connection, user):
+    """Drop the changed user's cached principal, under its old email too."""
+    principal_cache.pop(user.email)
+    for email in inspect(user).attrs.email.history.deleted:
+        principal_cache.pop(email)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_principals(orm_execute_state):
+    """
+    UPDATE / DELETE statements on users don't say which rows they touch:
+    drop every cached principal. Statements that leave name, email and
+    role alone opt out with execution_options(principal_unchanged=True).
+    """
+    state = orm_execute_state
+    if (
+        (state.is_update or state.is_delete)
+        and state.bind_mapper is models.User.__mapper__
+        and not state.execution_options.get("principal_unchanged")
+    ):
+        principal_cache.clear()
+
 
 def get_db():
     db = SessionLocal()
@@ -19,24 +72,40 @@ def get_db():
         db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
+def get_read_db():
+    """Session on the read-only pool; for GET endpoints and lookups."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified JWT claims; decoded once per request (FastAPI caches deps)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
 
+    if not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
+    return payload
+
+
+def load_principal(email: str, db: Session) -> Principal:
+    """Principal for `email`, from the cache or one DB lookup."""
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
     user = db.query(models.User).filter(models.User.email == email).first()
     if not user:
         raise HTTPException(
@@ -44,10 +113,46 @@ def get_current_user(
             detail="User not found"
         )
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(email, principal)
+    return principal
 
 
-def require_admin(current_user: models.User = Depends(get_current_user)) -> models.User:
+def get_current_user(
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_read_db)
+) -> Principal:
+    principal = load_principal(claims["sub"], db)
+    # On a cache miss the lookup checked out a read connection; give it back
+    # so write routes don't hold it while waiting for the writer (a GET
+    # route's next query simply takes one again)
+    db.close()
+    return principal
+
+
+# Role checks run on the verified claims first, so a wrong-role request is
+# rejected before any user lookup; the role is then confirmed on the
+# (cached) user in case it changed after the token was issued.
+def _claims_role(required: str, detail: str):
+    def check(claims: dict = Depends(get_token_claims)) -> dict:
+        role = claims.get("role")
+        if role is not None and role != required:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return claims
+    return check
+
+
+_admin_claims = _claims_role("admin", "Admin access required")
+_driver_claims = _claims_role("driver", "Driver access required")
+
+
+def require_admin(
+    claims: dict = Depends(_admin_claims),
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Ensures current user is an admin"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -57,11 +162,14 @@ def require_admin(current_user: models.User = Depends(get_current_user)) -> mode
     return current_user
 
 
-def require_driver(current_user: models.User = Depends(get_current_user)) -> models.User:
+def require_driver(
+    claims: dict = Depends(_driver_claims),
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Ensures current user is a driver"""
     if current_user.role != "driver":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Driver access required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
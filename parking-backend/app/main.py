@@ -1,18 +1,112 @@
 # app/main.py
 
+import os
+
 from fastapi import FastAPI
-from app.database import engine, Base
+from fastapi.middleware.cors import CORSMiddleware
+from app.database import engine, Base, SessionLocal, DB_MODE, METRICS_ENABLED
 
 # 🔴 IMPORTANT: import models BEFORE create_all
 from app import models  
 
 from app.auth import router as auth_router
 from app.parking import router as parking_router
+from app.allocator import slot_allocator
+from app.analytics import occupancy_rollup
+from app.migrations import run_migrations
+from app.passwords import shutdown_pool
+from app.realtime import availability_broker, router as realtime_router
+from app.sweeper import expiry_sweeper, router as sweeper_router
 
 app = FastAPI(title="Parking Spot Finder API")
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app.include_router(auth_router)
-app.include_router(parking_router)
+# create_all() skips indexes on tables that already exist: those come
+# from the versioned migrations in app/migrations.py
+run_migrations(engine)
+
+if DB_MODE == "async":
+    from app.async_routes import auth_router as async_auth_router
+    from app.async_routes import async_router, get_current_user_async
+    from app.deps import get_current_user
+
+    app.include_router(async_auth_router)
+    app.include_router(async_router(parking_router))
+
+    # require_admin / require_driver resolve the user on the async engine too
+    app.dependency_overrides[get_current_user] = get_current_user_async
+else:
+    app.include_router(auth_router)
+    app.include_router(parking_router)
+
+# Native async in both modes
+app.include_router(realtime_router)
+app.include_router(sweeper_router)
+
+if METRICS_ENABLED:
+    from app.metrics import MetricsMiddleware, router as metrics_router
+
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+# Browser clients (the Expo web build) call from another origin. The
+# booking listings return their next page cursor in X-Next-Cursor, which
+# cross-origin scripts can only read if it is exposed.
+CORS_ORIGINS = os.getenv("PARKING_CORS_ORIGINS", "*").split(",")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"]
+)
+
+
+@app.on_event("startup")
+def load_slot_allocator():
+    """Rebuild the in-memory free-slot lists from parking_slots."""
+    db = SessionLocal()
+    try:
+        slot_allocator.load(db)
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+async def start_availability_push():
+    availability_broker.start()
+
+
+@app.on_event("shutdown")
+async def stop_availability_push():
+    await availability_broker.stop()
+
+
+@app.on_event("startup")
+async def start_expiry_sweeper():
+    """Complete overdue bookings every PARKING_SWEEP_INTERVAL seconds (0 = off)."""
+    expiry_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_expiry_sweeper():
+    await expiry_sweeper.stop()
+
+
+@app.on_event("startup")
+async def start_occupancy_rollup():
+    """Fold occupancy events into hourly stats every PARKING_ROLLUP_INTERVAL seconds (0 = off)."""
+    occupancy_rollup.start()
+
+
+@app.on_event("shutdown")
+async def stop_occupancy_rollup():
+    await occupancy_rollup.stop()
+
+
+@app.on_event("shutdown")
+def stop_hash_pool():
+    shutdown_pool()
@@ -0,0 +1,213 @@
+# app/metrics.py
+#
+# Request and SQL metrics in Prometheus text format at GET /metrics.
+#
+# MetricsMiddleware times every HTTP request by route template (e.g.
+# /parking/zones/{zone_id}/slots, never the raw path, so label counts stay
+# bounded) and reads the per-request statement count and time collected by
+# the cursor hooks in app/database.py. Threadpool and connection pool usage
+# are sampled when /metrics is scraped.
+#
+# All request-side bookkeeping happens on the event loop thread, so it
+# needs no locks; PARKING_METRICS=0 removes the middleware and the hooks.
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import anyio.to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database import (
+    QueryStats, background_queries, request_queries,
+    engine, read_engine, async_engine, async_read_engine
+)
+from app.sweeper import sweep_metrics
+
+# Seconds; roughly x2.5 steps from 1ms to 10s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Histogram:
+    """Cumulative-on-render histogram; observe() is one bisect and two adds."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name, self.help = name, help
+        self.labelnames, self.buckets = labelnames, buckets
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self.series: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels((*self.labelnames, 'le'), (*labels, bound))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...]):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.values: Dict[Tuple, float] = defaultdict(float)
+
+    def inc(self, labels: Tuple, amount: float = 1):
+        self.values[labels] += amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+def _gauge(name: str, help: str, samples: Iterable[Tuple[Tuple[str, ...], Tuple, float]]) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_labels(names, values)} {value}" for names, values, value in samples]
+    return lines
+
+
+# ======================
+# REQUEST METRICS
+# ======================
+ROUTE = ("method", "route")
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", (*ROUTE, "status"))
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time to response start, by route template.", ROUTE, LATENCY_BUCKETS)
+request_queries_hist = Histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ROUTE, QUERY_COUNT_BUCKETS)
+request_query_seconds = Histogram(
+    "db_query_seconds_per_request", "Time spent in SQL statements per request.", ROUTE, LATENCY_BUCKETS)
+
+in_progress = 0
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        global in_progress
+        stats = QueryStats()
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        # Streaming responses (SSE) would otherwise count their whole lifetime
+        timing = {"status": 500, "elapsed": None}
+
+        async def send_and_time(message):
+            if message["type"] == "http.response.start":
+                timing["status"] = message["status"]
+                timing["elapsed"] = time.perf_counter() - started
+            await send(message)
+
+        in_progress += 1
+        try:
+            await self.app(scope, receive, send_and_time)
+        finally:
+            in_progress -= 1
+            request_queries.reset(token)
+            elapsed = timing["elapsed"]
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+
+            # Set by FastAPI's router once a route matched
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            requests_total.inc((*labels, timing["status"]))
+            request_duration.observe(labels, elapsed)
+            request_queries_hist.observe(labels, stats.count)
+            request_query_seconds.observe(labels, stats.seconds)
+
+
+# ======================
+# SCRAPE-TIME SAMPLES
+# ======================
+def _engines():
+    named = [("writer", engine), ("reader", read_engine),
+             ("async_writer", async_engine), ("async_reader", async_read_engine)]
+    seen = set()
+    for name, candidate in named:
+        if candidate is not None and id(candidate) not in seen:
+            seen.add(id(candidate))
+            yield name, candidate
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in (requests_total, request_duration, request_queries_hist, request_query_seconds):
+        lines += metric.render()
+
+    lines += _gauge("http_requests_in_progress", "Requests being served.", [((), (), in_progress)])
+
+    lines += [
+        "# HELP db_background_queries_total SQL statements outside any request (startup, sweeper, broker).",
+        "# TYPE db_background_queries_total counter",
+        f"db_background_queries_total {background_queries.count}",
+        "# HELP db_background_query_seconds_total Time in SQL statements outside any request.",
+        "# TYPE db_background_query_seconds_total counter",
+        f"db_background_query_seconds_total {background_queries.seconds}",
+    ]
+
+    # Sync handlers and run_in_threadpool share anyio's default limiter
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    lines += _gauge("threadpool_threads_busy", "Worker threads in use.", [((), (), limiter.borrowed_tokens)])
+    lines += _gauge("threadpool_threads_max", "Worker thread limit.", [((), (), limiter.total_tokens)])
+
+    pools = [(name, e.pool) for name, e in _engines()]
+    lines += _gauge("db_pool_checked_out", "Connections in use, by engine.",
+                    [(("engine",), (name,), pool.checkedout()) for name, pool in pools])
+    lines += _gauge("db_pool_size", "Configured pool size, by engine.",
+                    [(("engine",), (name,), pool.size()) for name, pool in pools if hasattr(pool, "size")])
+
+    m = sweep_metrics
+    lines += [
+        "# HELP parking_sweeper_runs_total Expiry sweeper runs.",
+        "# TYPE parking_sweeper_runs_total counter",
+        f"parking_sweeper_runs_total {m.runs}",
+        "# HELP parking_sweeper_bookings_expired_total Bookings completed by the sweeper.",
+        "# TYPE parking_sweeper_bookings_expired_total counter",
+        f"parking_sweeper_bookings_expired_total {m.bookings_expired}",
+        "# HELP parking_sweeper_lag_seconds How overdue the oldest booking was in the last sweep.",
+        "# TYPE parking_sweeper_lag_seconds gauge",
+        f"parking_sweeper_lag_seconds {m.last_lag_seconds}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+router = APIRouter(tags=["Maintenance"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,286 @@
+# app/migrations.py
+#
+# Versioned schema changes for existing databases. create_all() only
+# creates missing tables, so anything added to an existing table (indexes,
+# triggers) or outside the ORM models (the FTS5 search table, the
+# change-feed counter) is listed
+# here once, in order, and applied at startup.
+#
+# The applied version is kept in SQLite's PRAGMA user_version. Steps are
+# idempotent (IF NOT EXISTS), so two workers starting together are safe.
+# Never edit a released migration; append a new one.
+
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple, Union
+
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+Step = Union[str, Callable[[Connection], None]]
+
+
+def _assert_unique_slot_numbers(conn: Connection):
+    """The unique index can't be built over duplicates; say which ones."""
+    duplicates = conn.exec_driver_sql(
+        "SELECT zone_id, slot_number, COUNT(*) FROM parking_slots "
+        "GROUP BY zone_id, slot_number HAVING COUNT(*) > 1 LIMIT 20"
+    ).all()
+    if duplicates:
+        listing = ", ".join(f"zone {z}: {n} x{c}" for z, n, c in duplicates)
+        raise RuntimeError(
+            f"Cannot add unique (zone_id, slot_number): duplicate slots exist ({listing}). "
+            "Rename or delete them and restart."
+        )
+
+
+def _add_version_columns(conn: Connection):
+    """ALTER TABLE has no IF NOT EXISTS; create_all() already added them on new databases."""
+    for table in ("parking_zones", "parking_slots"):
+        columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if "version" not in columns:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+
+
+# Change-feed versions come from a one-row counter: bump it, read it back.
+# Writes are serialized by SQLite, so versions commit in increasing order.
+_NEXT_VERSION = "UPDATE change_sequence SET value = value + 1; "
+_CURRENT_VERSION = "(SELECT value FROM change_sequence)"
+
+
+def _version_trigger(table: str, event: str, extra: str = "") -> str:
+    # The inner UPDATE only changes version; the WHEN guard stops it from
+    # firing the update trigger again (recursive_triggers is off anyway)
+    guard = " WHEN new.version = old.version" if event == "UPDATE" else ""
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} "
+        f"AFTER {event} ON {table}{guard} BEGIN {_NEXT_VERSION}"
+        f"UPDATE {table} SET version = {_CURRENT_VERSION} WHERE id = new.id; {extra}END"
+    )
+
+
+def _seed_occupancy_state(conn: Connection):
+    """
+    The occupancy rollup counts from events, and slots occupied before the
+    event log existed have none: start every zone from its current count.
+    """
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO zone_occupancy_state (zone_id, occupied, last_event_id, last_event_at) "
+        "SELECT zone_id, COUNT(*), 0, ? FROM parking_slots "
+        "WHERE status = 'occupied' AND zone_id IS NOT NULL GROUP BY zone_id",
+        (datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f"),)
+    )
+
+
+# zone_slot_summary: one row per (zone, vehicle type). Inserts, deletes and
+# status changes adjust the row in place; moving a slot to another zone or
+# type, or repricing it, recounts the rows involved from parking_slots.
+_SUMMARY_COLUMNS = "zone_slot_summary (zone_id, vehicle_type, slots, free_slots, min_price)"
+_SUMMARY_TOTALS = (
+    "SELECT zone_id, vehicle_type, COUNT(*), SUM(status IS 'available'), MIN(price_per_hour) "
+    "FROM parking_slots"
+)
+
+
+def _summary_recount(row: str) -> str:
+    """Trigger statements rebuilding the summary row of `row` (new / old)."""
+    return (
+        f"DELETE FROM zone_slot_summary WHERE zone_id = {row}.zone_id AND vehicle_type = {row}.vehicle_type; "
+        f"INSERT INTO {_SUMMARY_COLUMNS} {_SUMMARY_TOTALS} "
+        f"WHERE zone_id = {row}.zone_id AND vehicle_type = {row}.vehicle_type GROUP BY zone_id, vehicle_type; "
+    )
+
+
+# parking_zones_rtree row (a zero-size box) for a parking_zones row
+_ZONE_POINT = "SELECT {row}.id, {row}.latitude, {row}.latitude, {row}.longitude, {row}.longitude"
+
+
+MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "nearby-search and expiry-sweeper indexes", [
+        "CREATE INDEX IF NOT EXISTS ix_parking_zones_lat_lon "
+        "ON parking_zones (latitude, longitude)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_status_end_time "
+        "ON bookings (status, end_time)",
+    ]),
+    (2, "composite indexes for hot filters, unique slot numbers per zone", [
+        "CREATE INDEX IF NOT EXISTS ix_parking_zones_admin_id "
+        "ON parking_zones (admin_id)",
+        "CREATE INDEX IF NOT EXISTS ix_parking_slots_zone_status "
+        "ON parking_slots (zone_id, status, vehicle_type)",
+        _assert_unique_slot_numbers,
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_parking_slots_zone_slot_number "
+        "ON parking_slots (zone_id, slot_number)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_user_status "
+        "ON bookings (user_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_zone_status "
+        "ON bookings (zone_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_slot_status "
+        "ON bookings (slot_id, status)",
+    ]),
+    (3, "newest-first booking pages per driver and per zone", [
+        "CREATE INDEX IF NOT EXISTS ix_bookings_user_recent "
+        "ON bookings (user_id, id)",
+        "CREATE INDEX IF NOT EXISTS ix_bookings_zone_recent "
+        "ON bookings (zone_id, id)",
+    ]),
+    (4, "zone name search: FTS5 trigram index and NOCASE prefix index", [
+        "CREATE INDEX IF NOT EXISTS ix_parking_zones_name_nocase "
+        "ON parking_zones (name COLLATE NOCASE)",
+        # External-content table: stores only the index, names stay in parking_zones
+        "CREATE VIRTUAL TABLE IF NOT EXISTS parking_zones_fts USING fts5("
+        "name, content='parking_zones', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_fts_insert "
+        "AFTER INSERT ON parking_zones BEGIN "
+        "INSERT INTO parking_zones_fts (rowid, name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_fts_delete "
+        "AFTER DELETE ON parking_zones BEGIN "
+        "INSERT INTO parking_zones_fts (parking_zones_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); END",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_fts_update "
+        "AFTER UPDATE OF name ON parking_zones BEGIN "
+        "INSERT INTO parking_zones_fts (parking_zones_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); "
+        "INSERT INTO parking_zones_fts (rowid, name) VALUES (new.id, new.name); END",
+        # Index zones that existed before the triggers
+        "INSERT INTO parking_zones_fts (parking_zones_fts) VALUES ('rebuild')",
+    ]),
+    (5, "change feed: zone/slot versions, slot tombstones", [
+        _add_version_columns,
+        "CREATE TABLE IF NOT EXISTS change_sequence ("
+        "id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)",
+        # Existing rows get distinct versions before the triggers exist
+        "UPDATE parking_zones SET version = id WHERE version = 0",
+        "UPDATE parking_slots SET version = id + (SELECT COALESCE(MAX(id), 0) FROM parking_zones) "
+        "WHERE version = 0",
+        "INSERT OR IGNORE INTO change_sequence (id, value) VALUES (1, MAX("
+        "(SELECT COALESCE(MAX(version), 0) FROM parking_zones), "
+        "(SELECT COALESCE(MAX(version), 0) FROM parking_slots)))",
+        "CREATE INDEX IF NOT EXISTS ix_parking_zones_version "
+        "ON parking_zones (version)",
+        "CREATE INDEX IF NOT EXISTS ix_parking_slots_version "
+        "ON parking_slots (version)",
+        _version_trigger("parking_zones", "INSERT"),
+        _version_trigger("parking_zones", "UPDATE"),
+        # A reused slot id is live again: drop its tombstone
+        _version_trigger("parking_slots", "INSERT", "DELETE FROM deleted_slots WHERE id = new.id; "),
+        _version_trigger("parking_slots", "UPDATE"),
+        "CREATE TRIGGER IF NOT EXISTS parking_slots_tombstone "
+        f"AFTER DELETE ON parking_slots BEGIN {_NEXT_VERSION}"
+        "INSERT OR REPLACE INTO deleted_slots (id, zone_id, version) "
+        f"VALUES (old.id, old.zone_id, {_CURRENT_VERSION}); END",
+    ]),
+    # occupancy_events / zone_hourly_stats / zone_occupancy_state are new
+    # tables, created by create_all()
+    (6, "occupancy analytics: starting counts for the rollup", [
+        _seed_occupancy_state,
+    ]),
+    # zone_slot_summary is a new table, created by create_all()
+    (7, "zone ranking: per zone and vehicle type slot counts and lowest price", [
+        # Same prefix as the old lat/lon index, so nearby search keeps using it
+        "CREATE INDEX IF NOT EXISTS ix_parking_zones_lat_lon_counts "
+        "ON parking_zones (latitude, longitude, available_slots, total_slots)",
+        "DROP INDEX IF EXISTS ix_parking_zones_lat_lon",
+        f"INSERT OR REPLACE INTO {_SUMMARY_COLUMNS} {_SUMMARY_TOTALS} "
+        "WHERE zone_id IS NOT NULL AND vehicle_type IS NOT NULL GROUP BY zone_id, vehicle_type",
+        "CREATE TRIGGER IF NOT EXISTS parking_slots_summary_insert "
+        "AFTER INSERT ON parking_slots "
+        "WHEN new.zone_id IS NOT NULL AND new.vehicle_type IS NOT NULL BEGIN "
+        f"INSERT INTO {_SUMMARY_COLUMNS} "
+        "VALUES (new.zone_id, new.vehicle_type, 1, new.status IS 'available', new.price_per_hour) "
+        "ON CONFLICT (zone_id, vehicle_type) DO UPDATE SET "
+        "slots = slots + 1, free_slots = free_slots + excluded.free_slots, "
+        "min_price = MIN(COALESCE(min_price, excluded.min_price), COALESCE(excluded.min_price, min_price)); END",
+        # The booking path: only the free count moves
+        "CREATE TRIGGER IF NOT EXISTS parking_slots_summary_status "
+        "AFTER UPDATE OF status ON parking_slots "
+        "WHEN old.status IS NOT new.status AND old.zone_id IS new.zone_id "
+        "AND old.vehicle_type IS new.vehicle_type AND old.price_per_hour IS new.price_per_hour BEGIN "
+        "UPDATE zone_slot_summary SET free_slots = free_slots "
+        "+ (new.status IS 'available') - (old.status IS 'available') "
+        "WHERE zone_id = new.zone_id AND vehicle_type = new.vehicle_type; END",
+        "CREATE TRIGGER IF NOT EXISTS parking_slots_summary_move "
+        "AFTER UPDATE OF zone_id, vehicle_type, price_per_hour ON parking_slots "
+        "WHEN old.zone_id IS NOT new.zone_id OR old.vehicle_type IS NOT new.vehicle_type "
+        f"OR old.price_per_hour IS NOT new.price_per_hour BEGIN {_summary_recount('old')}"
+        f"{_summary_recount('new')}END",
+        # Only a delete of the cheapest slot has to look for the next cheapest
+        "CREATE TRIGGER IF NOT EXISTS parking_slots_summary_delete "
+        "AFTER DELETE ON parking_slots BEGIN "
+        "UPDATE zone_slot_summary SET slots = slots - 1, "
+        "free_slots = free_slots - (old.status IS 'available'), "
+        "min_price = CASE WHEN old.price_per_hour > min_price THEN min_price ELSE ("
+        "SELECT MIN(price_per_hour) FROM parking_slots "
+        "WHERE zone_id = old.zone_id AND vehicle_type = old.vehicle_type) END "
+        "WHERE zone_id = old.zone_id AND vehicle_type = old.vehicle_type; "
+        "DELETE FROM zone_slot_summary "
+        "WHERE zone_id = old.zone_id AND vehicle_type = old.vehicle_type AND slots <= 0; END",
+    ]),
+    (8, "nearby search filters: slot price in the zone/status/type index", [
+        # Same prefix as the old index, which it replaces
+        "CREATE INDEX IF NOT EXISTS ix_parking_slots_zone_status_price "
+        "ON parking_slots (zone_id, status, vehicle_type, price_per_hour)",
+        "DROP INDEX IF EXISTS ix_parking_slots_zone_status",
+    ]),
+    (9, "zones in a box: R*Tree over zone coordinates", [
+        # One point per zone; zones without coordinates are left out
+        "CREATE VIRTUAL TABLE IF NOT EXISTS parking_zones_rtree USING rtree("
+        "id, min_lat, max_lat, min_lon, max_lon)",
+        f"INSERT OR REPLACE INTO parking_zones_rtree {_ZONE_POINT.format(row='parking_zones')} "
+        "FROM parking_zones WHERE latitude IS NOT NULL AND longitude IS NOT NULL",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_rtree_insert "
+        "AFTER INSERT ON parking_zones "
+        "WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN "
+        f"INSERT INTO parking_zones_rtree {_ZONE_POINT.format(row='new')}; END",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_rtree_update "
+        "AFTER UPDATE OF latitude, longitude ON parking_zones BEGIN "
+        "DELETE FROM parking_zones_rtree WHERE id = old.id; "
+        f"INSERT INTO parking_zones_rtree {_ZONE_POINT.format(row='new')} "
+        "WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL; END",
+        "CREATE TRIGGER IF NOT EXISTS parking_zones_rtree_delete "
+        "AFTER DELETE ON parking_zones BEGIN "
+        "DELETE FROM parking_zones_rtree WHERE id = old.id; END",
+        # Box queries seek the R*Tree now; nothing else reads this index
+        "DROP INDEX IF EXISTS ix_parking_zones_lat_lon_counts",
+    ]),
+    # Slot changes are only served per zone now (an admin's own)
+    (10, "change feed: per-zone slot and tombstone versions", [
+        "CREATE INDEX IF NOT EXISTS ix_parking_slots_zone_version "
+        "ON parking_slots (zone_id, version)",
+        "DROP INDEX IF EXISTS ix_parking_slots_version",
+        "CREATE INDEX IF NOT EXISTS ix_deleted_slots_zone_version "
+        "ON deleted_slots (zone_id, version)",
+        "DROP INDEX IF EXISTS ix_deleted_slots_version",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply pending migrations, each in its own transaction. Returns the new version."""
+    with engine.connect() as conn:
+        current = schema_version(conn)
+
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+
+        with engine.begin() as conn:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.exec_driver_sql(step)
+            conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+
+        logger.info("Applied migration %d: %s", version, description)
+        current = version
+
+    return current
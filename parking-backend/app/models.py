@@ -1,6 +1,6 @@
 # app/models.py
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -37,10 +37,27 @@ class ParkingZone(Base):
     admin_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Change-feed sequence number, set by triggers on every insert/update
+    # (app/migrations.py); GET /parking/zones/changes reads it
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
     admin = relationship("User", back_populates="zones")
     slots = relationship("ParkingSlot", back_populates="zone")
     bookings = relationship("Booking", back_populates="zone")
 
+    # admin -> zone lookups; change feed. Boxes around a location (nearby
+    # search, ranking, map viewports) use the parking_zones_rtree R*Tree
+    # (app/migrations.py)
+    __table_args__ = (
+        Index("ix_parking_zones_admin_id", "admin_id"),
+        Index("ix_parking_zones_version", "version"),
+    )
+
+
+# Short (< 3 chars) name searches are prefix matches on this index; longer
+# ones use the parking_zones_fts trigram table (app/migrations.py)
+Index("ix_parking_zones_name_nocase", ParkingZone.name.collate("NOCASE"))
+
 
 # ------------------
 # PARKING SLOT  ✅ MUST BE BEFORE Booking
@@ -57,6 +74,52 @@ class ParkingSlot(Base):
     zone_id = Column(Integer, ForeignKey("parking_zones.id"))
     zone = relationship("ParkingZone", back_populates="slots")
 
+    # Change-feed sequence number, like ParkingZone.version
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Slot numbers are unique per zone; (zone, status, type) covers the
+    # grid filters, slot statistics and the allocator's free-slot load,
+    # plus price for nearby search's free-slot counts under a price cap;
+    # (zone, version) is an admin's change feed
+    __table_args__ = (
+        Index("uq_parking_slots_zone_slot_number", "zone_id", "slot_number", unique=True),
+        Index("ix_parking_slots_zone_status_price", "zone_id", "status", "vehicle_type", "price_per_hour"),
+        Index("ix_parking_slots_zone_version", "zone_id", "version"),
+    )
+
+
+# ------------------
+# DELETED SLOT (change-feed tombstone)
+# ------------------
+class DeletedSlot(Base):
+    """Written by a trigger when a slot is deleted; removed if its id is reused."""
+    __tablename__ = "deleted_slots"
+
+    id = Column(Integer, primary_key=True)  # the deleted slot's id
+    zone_id = Column(Integer)
+    version = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_deleted_slots_zone_version", "zone_id", "version"),
+    )
+
+
+# ------------------
+# ZONE SLOT SUMMARY (zone ranking)
+# ------------------
+class ZoneSlotSummary(Base):
+    """Per zone and vehicle type; kept up to date by triggers on parking_slots."""
+    __tablename__ = "zone_slot_summary"
+
+    zone_id = Column(Integer, primary_key=True)
+    vehicle_type = Column(String, primary_key=True)
+    slots = Column(Integer, nullable=False, default=0)
+    free_slots = Column(Integer, nullable=False, default=0)
+    min_price = Column(Float)
+
+    # Clustered on the key: a ranking lookup reads one b-tree
+    __table_args__ = {"sqlite_with_rowid": False}
+
 
 # ------------------
 # BOOKING  ❗ AFTER ParkingSlot
@@ -81,3 +144,58 @@ class Booking(Base):
 
     user = relationship("User", back_populates="bookings")
     zone = relationship("ParkingZone", back_populates="bookings")
+
+    # Expiry sweeper: range scan of active bookings by end_time;
+    # per driver / zone / slot lookups filter on status too; history
+    # pages walk (user_id, id) / (zone_id, id) newest first from a cursor
+    __table_args__ = (
+        Index("ix_bookings_status_end_time", "status", "end_time"),
+        Index("ix_bookings_user_status", "user_id", "status"),
+        Index("ix_bookings_zone_status", "zone_id", "status"),
+        Index("ix_bookings_slot_status", "slot_id", "status"),
+        Index("ix_bookings_user_recent", "user_id", "id"),
+        Index("ix_bookings_zone_recent", "zone_id", "id"),
+    )
+
+
+# ------------------
+# OCCUPANCY ANALYTICS (app/analytics.py)
+# ------------------
+class OccupancyEvent(Base):
+    """Append-only: one row per slot occupy/release (and booking extension)."""
+    __tablename__ = "occupancy_events"
+
+    id = Column(Integer, primary_key=True)
+    zone_id = Column(Integer, nullable=False)
+    slot_id = Column(Integer)
+    booking_id = Column(Integer)
+    kind = Column(String, nullable=False)  # "occupy", "release", "extend"
+    amount = Column(Float, nullable=False, default=0)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ZoneHourlyStats(Base):
+    """Events folded into one row per zone and UTC hour."""
+    __tablename__ = "zone_hourly_stats"
+
+    zone_id = Column(Integer, primary_key=True)
+    hour = Column(DateTime, primary_key=True)
+    occupied_seconds = Column(Float, nullable=False, default=0)  # slot-seconds
+    occupancies = Column(Integer, nullable=False, default=0)
+    releases = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+
+class ZoneOccupancyState(Base):
+    """Where the rollup stopped for a zone: occupied slots since last_event_at."""
+    __tablename__ = "zone_occupancy_state"
+
+    zone_id = Column(Integer, primary_key=True)
+    occupied = Column(Integer, nullable=False, default=0)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    last_event_at = Column(DateTime)
+
+    # MAX(last_event_id) is the rollup's cursor into occupancy_events
+    __table_args__ = (
+        Index("ix_zone_occupancy_state_last_event", "last_event_id"),
+    )
@@ -1,16 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 from typing import List, Optional
-
-from app import models, schemas
-from app.deps import get_db, get_current_user, require_admin, require_driver
-from app.utils import calculate_distance
+from typing_extensions import Literal
+
+from app import models, schemas, queries
+from app.allocator import slot_allocator
+from app.analytics import event, naive_utc, occupancy_series, record_events
+from app.cache import VersionedCache, etag_matches
+from app.ranking import rank_zones
+from app.realtime import zones_changed
+from app.serialization import FAST_JSON, RowsResponse, dump_rows
+from app.deps import Principal, get_db, get_read_db, get_current_user, require_admin, require_driver
+from app.utils import bounding_box, nearest_within
 
 from datetime import datetime, timedelta
 from typing import List, Optional
 router = APIRouter(prefix="/parking", tags=["Parking"])
 
 from sqlalchemy.sql import func
+
+# Slot picks retried when another driver wins the race for the same slot
+MAX_BOOKING_ATTEMPTS = 5
+
+# Bulk slot creation: slots per request, slot numbers per IN (...) check
+MAX_BULK_SLOTS = 10000
+BULK_CHUNK_SIZE = 500
+
+# Most zones GET /zones/best returns
+MAX_RANKED_ZONES = 50
+
+# Longest occupancy time series, in hourly points (about three months)
+MAX_SERIES_HOURS = 24 * 92
+
+# Serialized GET /zones body, rebuilt when the zones' latest version moves
+zone_list_cache = VersionedCache("zones")
+_zone_list_adapter = TypeAdapter(List[schemas.ParkingZoneResponse])
+
+# Names of queries.ZONE_RESPONSE_COLUMNS, in order
+ZONE_FIELDS = tuple(schemas.ParkingZoneResponse.model_fields)
+
+
+# ======================
+# ATOMIC STATE TRANSITIONS
+# ======================
+# Each helper is a single conditional UPDATE; the row count tells whether
+# this request won. Callers commit or roll back.
+def _set_slot_status(db: Session, slot_id: int, old_status: str, new_status: str) -> bool:
+    """Move a slot from old_status to new_status, only if it is still in old_status."""
+    result = db.execute(
+        update(models.ParkingSlot).where(
+            models.ParkingSlot.id == slot_id,
+            models.ParkingSlot.status == old_status
+        ).values(status=new_status)
+    )
+    return result.rowcount == 1
+
+
+def _adjust_zone_availability(db: Session, zone_id: int, delta: int) -> bool:
+    """Add delta (+1/-1) to available_slots, kept within 0..total_slots."""
+    zone = models.ParkingZone
+    stmt = update(zone).where(zone.id == zone_id)
+
+    if delta < 0:
+        stmt = stmt.where(zone.available_slots >= -delta)
+    else:
+        stmt = stmt.where(zone.available_slots + delta <= zone.total_slots)
+
+    result = db.execute(stmt.values(available_slots=zone.available_slots + delta))
+    return result.rowcount == 1
+
+
+def _release_booking(db: Session, booking: models.Booking, status: str, **values) -> bool:
+    """
+    Close an active booking (completed/cancelled), free its slot and give
+    the zone one slot back. False if the booking was no longer active.
+    """
+    result = db.execute(
+        update(models.Booking).where(
+            models.Booking.id == booking.id,
+            models.Booking.status == "active"
+        ).values(status=status, **values)
+    )
+    if result.rowcount != 1:
+        return False
+
+    if _set_slot_status(db, booking.slot_id, "occupied", "available"):
+        _adjust_zone_availability(db, booking.zone_id, 1)
+        record_events(db, [event("release", booking.zone_id, booking.slot_id, booking.id)])
+
+    return True
+
 # ======================
 # ADMIN: CREATE ZONE
 # ======================
@@ -18,7 +100,7 @@ from sqlalchemy.sql import func
 def create_zone(
     data: schemas.ParkingZoneCreate,
     db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin creates a parking zone.
@@ -48,6 +130,7 @@ def create_zone(
     db.add(zone)
     db.commit()
     db.refresh(zone)
+    zones_changed(zone.id)
 
     return {
         "message": "Parking zone created successfully",
@@ -64,7 +147,7 @@ def update_availability(
     zone_id: int,
     data: schemas.AvailabilityUpdate,
     db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin manually updates available slots count.
@@ -89,6 +172,7 @@ def update_availability(
 
     zone.available_slots = data.available_slots
     db.commit()
+    zones_changed(zone.id)
 
     return {
         "message": "Availability updated",
@@ -102,15 +186,36 @@ def update_availability(
 # ======================
 @router.get("/zones", response_model=List[schemas.ParkingZoneResponse])
 def get_all_zones(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Fetch all parking zones.
     Available to both drivers and admins.
+
+    The serialized list is cached until the next zone write, in any
+    worker. Clients that send back the ETag get a 304 after one index
+    read (the zones' latest version) and no serialization.
     """
-    zones = db.query(models.ParkingZone).all()
-    return zones
+    version = queries.zones_version(db)
+    headers = {"ETag": zone_list_cache.etag(version), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    def build():
+        if FAST_JSON:
+            return dump_rows(db.query(
+                *queries.ZONE_RESPONSE_COLUMNS
+            ).order_by(models.ParkingZone.id).all())
+
+        zones = db.query(models.ParkingZone).order_by(models.ParkingZone.id).all()
+        return _zone_list_adapter.dump_json(
+            _zone_list_adapter.validate_python(zones, from_attributes=True)
+        )
+
+    headers["ETag"], body = zone_list_cache.get(version, build)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # ======================
@@ -119,48 +224,196 @@ def get_all_zones(
 @router.get("/zones/search", response_model=List[schemas.ParkingZoneResponse])
 def search_zones(
     name: str = Query(..., min_length=1, description="Search by zone name"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Search parking zones by name (case-insensitive partial match).
+    Best matches first: names starting with the text, then the shortest
+    names containing it.
     """
-    zones = db.query(models.ParkingZone).filter(
-        models.ParkingZone.name.ilike(f"%{name}%")
-    ).all()
+    return queries.search_zone_names(db, name, limit)
 
-    return zones
+
+# ======================
+# DRIVER: ZONE NAME AUTOCOMPLETE
+# ======================
+@router.get("/zones/autocomplete", response_model=List[schemas.ZoneNameResponse])
+def autocomplete_zones(
+    q: str = Query(..., min_length=1, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Type-ahead for the search box: same matching as /zones/search, but only
+    id and name, so each keystroke stays a small response.
+    """
+    return queries.search_zone_names(
+        db, q, limit, models.ParkingZone.id, models.ParkingZone.name
+    )
+
+
+# ======================
+# ZONE CHANGE FEED
+# ======================
+@router.get("/zones/changes", response_model=schemas.ZoneChangesResponse)
+def get_zone_changes(
+    since: int = Query(0, ge=0, description="`version` from the previous call; 0 for everything"),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Delta sync: zones and slots created or changed after `since`, plus ids
+    of slots deleted since then. Store the returned `version` and pass it
+    as `since` next time; while `has_more` is true, call again at once.
+
+    Drivers get zones only, like GET /zones; admins also get the slots of
+    their own zones, like the slot grid.
+    """
+    admin_id = current_user.id if current_user.role == "admin" else None
+    return queries.zone_changes(db, since, limit, admin_id)
 
 
 # ======================
 # DRIVER: GET NEARBY ZONES
 # ======================
-@router.get("/zones/nearby", response_model=List[schemas.ParkingZoneResponse])
+@router.get("/zones/nearby", response_model=List[schemas.NearbyZoneResponse])
 def get_nearby_zones(
     latitude: float = Query(..., ge=-90, le=90),
     longitude: float = Query(..., ge=-180, le=180),
     radius_km: float = Query(default=5.0, gt=0, le=50, description="Search radius in km"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    vehicle_type: Optional[Literal["car", "bike", "truck"]] = Query(default=None),
+    max_price_per_hour: Optional[float] = Query(default=None, gt=0),
+    min_available: Optional[int] = Query(default=None, ge=1, description="Free slots matching the filters"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Find parking zones within a specified radius from user's location.
-    Uses Haversine formula for distance calculation.
+    A bounding box on the zones' R*Tree narrows the candidates in SQL;
+    only those get the exact Haversine check.
+
+    Each zone comes with its free slots per vehicle type, counting only
+    slots that match vehicle_type / max_price_per_hour. With any filter set,
+    zones need at least min_available (default 1) such slots.
     """
-    all_zones = db.query(models.ParkingZone).all()
+    zone = models.ParkingZone
+
+    # One query: zone columns plus one (type, free count) per row
+    if max_price_per_hour is None:
+        # Free counts are kept per zone and type in zone_slot_summary
+        summary = models.ZoneSlotSummary
+        on = summary.zone_id == zone.id
+        if vehicle_type:
+            on &= summary.vehicle_type == vehicle_type
+        query = db.query(
+            *queries.ZONE_RESPONSE_COLUMNS, summary.vehicle_type, summary.free_slots
+        ).outerjoin(summary, on)
+    else:
+        # Price is per slot: count the matching free slots on the covering
+        # (zone_id, status, vehicle_type, price_per_hour) index
+        slot = models.ParkingSlot
+        on = (
+            (slot.zone_id == zone.id)
+            & (slot.status == "available")
+            & (slot.price_per_hour <= max_price_per_hour)
+        )
+        if vehicle_type:
+            on &= slot.vehicle_type == vehicle_type
+        query = db.query(
+            *queries.ZONE_RESPONSE_COLUMNS, slot.vehicle_type, func.count(slot.id)
+        ).join(slot, on).group_by(zone.id, slot.vehicle_type)
+
+    rows = queries.in_box(query, bounding_box(latitude, longitude, radius_km)).all()
+
+    # One dict per zone, in id order so distance ties stay stable
+    by_id = {}
+    for row in rows:
+        zone_dict = by_id.get(row.id)
+        if zone_dict is None:
+            zone_dict = by_id[row.id] = {**dict(zip(ZONE_FIELDS, row)), "free_slots_by_type": {}}
+        slot_type, free = row[-2:]
+        if slot_type is not None and free:
+            zone_dict["free_slots_by_type"][slot_type] = free
+    zones = [by_id[zone_id] for zone_id in sorted(by_id)]
+
+    if vehicle_type or max_price_per_hour is not None or min_available:
+        needed = min_available or 1
+        zones = [z for z in zones if sum(z["free_slots_by_type"].values()) >= needed]
+
+    # Exact distances for all candidates in one pass, closest first
+    indices, _ = nearest_within(
+        latitude, longitude,
+        [z["latitude"] for z in zones],
+        [z["longitude"] for z in zones],
+        radius_km=radius_km
+    )
+    nearby_zones = [zones[i] for i in indices]
 
-    nearby_zones = []
-    for zone in all_zones:
-        distance = calculate_distance(latitude, longitude, zone.latitude, zone.longitude)
-        if distance <= radius_km:
-            nearby_zones.append(zone)
+    if FAST_JSON:
+        return RowsResponse(nearby_zones)
+    return nearby_zones
 
-    # Sort by distance (closest first)
-    nearby_zones.sort(
-        key=lambda z: calculate_distance(latitude, longitude, z.latitude, z.longitude)
+
+# ======================
+# DRIVER: BEST ZONES
+# ======================
+@router.get("/zones/best", response_model=List[schemas.RankedZoneResponse])
+def get_best_zones(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(default=5.0, gt=0, le=50, description="Search radius in km"),
+    vehicle_type: Literal["car", "bike", "truck"] = Query(default="car"),
+    k: int = Query(default=5, ge=1, le=MAX_RANKED_ZONES),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    The k best zones within radius_km that have a free slot for vehicle_type,
+    scored on distance, lowest price, occupancy and free slots (app/ranking.py).
+    Candidates come from the same R*Tree bounding box as nearby search,
+    reading only what the score needs: prices and free counts come from
+    zone_slot_summary. Full rows are loaded for the k winners only.
+    """
+    zone, summary = models.ParkingZone, models.ZoneSlotSummary
+
+    candidates = queries.in_box(db.query(
+        zone.id, zone.latitude, zone.longitude, zone.available_slots, zone.total_slots,
+        summary.free_slots, summary.min_price
+    ).join(
+        summary, (summary.zone_id == zone.id) & (summary.vehicle_type == vehicle_type)
+    ).filter(
+        zone.available_slots > 0,
+        summary.free_slots > 0
+    ), bounding_box(latitude, longitude, radius_km)).all()
+    if not candidates:
+        return []
+
+    ids, latitudes, longitudes, available, total, free, prices = zip(*candidates)
+    indices, distances, scores = rank_zones(
+        latitude, longitude, radius_km,
+        latitudes, longitudes, available, total, free, prices, k
     )
 
-    return nearby_zones
+    winners = {
+        row.id: row for row in db.query(*queries.ZONE_RESPONSE_COLUMNS)
+        .filter(zone.id.in_([ids[i] for i in indices]))
+    }
+    ranked = []
+    for i, distance, score in zip(indices, distances, scores):
+        ranked.append({
+            **winners[ids[i]]._asdict(),
+            "vehicle_type": vehicle_type,
+            "free_slots": free[i],
+            "min_price_per_hour": prices[i],
+            "distance_km": round(float(distance), 2),
+            "occupancy_rate": round((1 - available[i] / total[i]) * 100, 2) if total[i] else 100.0,
+            "score": float(score),
+        })
+    return ranked
 
 
 # ======================
@@ -168,8 +421,8 @@ def get_nearby_zones(
 # ======================
 @router.get("/zones/my-zone", response_model=schemas.ParkingZoneResponse)
 def get_my_zone(
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin fetches their managed parking zone.
@@ -195,73 +448,129 @@ def get_my_zone(
 # ======================
 # ADMIN: CREATE MULTIPLE SLOTS (BULK)
 # ======================
-# @router.post("/zones/{zone_id}/slots/bulk", status_code=201)
-# def create_slots_bulk(
-#     zone_id: int,
-#     slots: List[schemas.ParkingSlotCreate],
-#     db: Session = Depends(get_db),
-#     admin: models.User = Depends(require_admin)
-# ):
-#     """
-#     Admin creates multiple slots at once for their parking zone.
-#     Used for initial slot grid setup.
-    
-#     Example: Create A1-A10, B1-B10 slots in one request.
-#     """
-#     # Verify zone ownership
-#     zone = db.query(models.ParkingZone).filter(
-#         models.ParkingZone.id == zone_id,
-#         models.ParkingZone.admin_id == admin.id
-#     ).first()
-
-#     if not zone:
-#         raise HTTPException(
-#             status_code=404,
-#             detail="Zone not found or you don't have access"
-#         )
-
-#     # Check for duplicate slot numbers
-#     slot_numbers = [slot.slot_number for slot in slots]
-#     if len(slot_numbers) != len(set(slot_numbers)):
-#         raise HTTPException(
-#             status_code=400,
-#             detail="Duplicate slot numbers detected"
-#         )
-
-#     # Check if any slot numbers already exist
-#     existing_slots = db.query(models.ParkingSlot).filter(
-#         models.ParkingSlot.zone_id == zone_id,
-#         models.ParkingSlot.slot_number.in_(slot_numbers)
-#     ).all()
-
-#     if existing_slots:
-#         existing_numbers = [s.slot_number for s in existing_slots]
-#         raise HTTPException(
-#             status_code=400,
-#             detail=f"Slot numbers already exist: {', '.join(existing_numbers)}"
-#         )
-
-#     # Create all slots
-#     new_slots = []
-#     for slot_data in slots:
-#         slot = models.ParkingSlot(
-#             slot_number=slot_data.slot_number,
-#             vehicle_type=slot_data.vehicle_type,
-#             price_per_hour=slot_data.price_per_hour,
-#             status="available",
-#             zone_id=zone_id
-#         )
-#         new_slots.append(slot)
-
-#     db.add_all(new_slots)
-#     db.commit()
-
-#     return {
-#         "message": f"Successfully created {len(new_slots)} slots",
-#         "zone_id": zone_id,
-#         "zone_name": zone.name,
-#         "slots_created": len(new_slots)
-#     }
+@router.post("/zones/{zone_id}/slots/bulk", status_code=201)
+def create_slots_bulk(
+    zone_id: int,
+    data: schemas.ParkingSlotBulkCreate,
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(require_admin)
+):
+    """
+    Admin creates multiple slots at once for their parking zone.
+    Used for initial slot grid setup.
+
+    Example: {"ranges": [{"slot_range": "A1-A500", "vehicle_type": "car"}]}
+    plus any individual "slots". Duplicates are checked in chunked IN
+    queries, all rows go in with one executemany and the zone counters
+    are updated once, in a single transaction.
+    """
+    # Verify zone ownership
+    zone = db.query(models.ParkingZone).filter(
+        models.ParkingZone.id == zone_id,
+        models.ParkingZone.admin_id == admin.id
+    ).first()
+
+    if not zone:
+        raise HTTPException(
+            status_code=404,
+            detail="Zone not found or you don't have access"
+        )
+
+    # Size check before expanding, so "A1-A99999999" can't allocate much
+    requested = len(data.slots) + sum(r.size() for r in data.ranges)
+    if requested == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="No slots given"
+        )
+    if requested > MAX_BULK_SLOTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_SLOTS} slots per request"
+        )
+
+    rows = [
+        {"slot_number": slot.slot_number, "vehicle_type": slot.vehicle_type,
+         "price_per_hour": slot.price_per_hour}
+        for slot in data.slots
+    ]
+    for slot_range in data.ranges:
+        rows.extend(
+            {"slot_number": number, "vehicle_type": slot_range.vehicle_type,
+             "price_per_hour": slot_range.price_per_hour}
+            for number in slot_range.slot_numbers()
+        )
+
+    # Check for duplicate slot numbers
+    slot_numbers = [row["slot_number"] for row in rows]
+    if len(slot_numbers) != len(set(slot_numbers)):
+        seen, repeated = set(), []
+        for number in slot_numbers:
+            if number in seen and number not in repeated:
+                repeated.append(number)
+            seen.add(number)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Duplicate slot numbers detected: {', '.join(repeated[:20])}"
+        )
+
+    # Check if any slot numbers already exist, a chunk of numbers per query
+    existing_numbers = []
+    for i in range(0, len(slot_numbers), BULK_CHUNK_SIZE):
+        existing_numbers.extend(number for (number,) in db.query(
+            models.ParkingSlot.slot_number
+        ).filter(
+            models.ParkingSlot.zone_id == zone_id,
+            models.ParkingSlot.slot_number.in_(slot_numbers[i:i + BULK_CHUNK_SIZE])
+        ))
+
+    if existing_numbers:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Slot numbers already exist: {', '.join(sorted(existing_numbers)[:20])}"
+        )
+
+    # Create all slots in one batched multi-row INSERT ... RETURNING
+    for row in rows:
+        row.update(status="available", zone_id=zone_id)
+
+    try:
+        created = db.execute(
+            insert(models.ParkingSlot).returning(
+                models.ParkingSlot.id,
+                models.ParkingSlot.vehicle_type
+            ),
+            rows
+        ).all()
+    except IntegrityError:
+        # Some numbers were added concurrently (unique zone_id, slot_number)
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Some slot numbers already exist, please retry"
+        )
+
+    # New slots are free: grow both counters once
+    db.execute(
+        update(models.ParkingZone).where(
+            models.ParkingZone.id == zone_id
+        ).values(
+            total_slots=models.ParkingZone.total_slots + len(created),
+            available_slots=models.ParkingZone.available_slots + len(created)
+        )
+    )
+    db.commit()
+    zones_changed(zone_id)
+
+    for slot_id, vehicle_type in created:
+        slot_allocator.release(zone_id, slot_id, vehicle_type)
+
+    return {
+        "message": f"Successfully created {len(created)} slots",
+        "zone_id": zone_id,
+        "zone_name": zone.name,
+        "slots_created": len(created)
+    }
 
 
 # ======================
@@ -272,7 +581,7 @@ def create_single_slot(
     zone_id: int,
     slot_data: schemas.ParkingSlotCreate,
     db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin creates a single slot in their parking zone.
@@ -311,9 +620,19 @@ def create_single_slot(
     )
 
     db.add(slot)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same number added concurrently (unique zone_id, slot_number)
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Slot {slot_data.slot_number} already exists"
+        )
     db.refresh(slot)
 
+    slot_allocator.release(zone_id, slot.id, slot.vehicle_type)
+
     return {
         "message": "Slot created successfully",
         "slot_id": slot.id,
@@ -329,8 +648,8 @@ def get_zone_slots(
     zone_id: int,
     vehicle_type: Optional[str] = Query(None, description="Filter by vehicle type"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin fetches all slots for their parking zone.
@@ -350,8 +669,9 @@ def get_zone_slots(
             detail="Zone not found or you don't have access"
         )
 
-    # Build query
-    query = db.query(models.ParkingSlot).filter(
+    # Build query (fast path: column-only rows)
+    entities = queries.SLOT_RESPONSE_COLUMNS if FAST_JSON else (models.ParkingSlot,)
+    query = db.query(*entities).filter(
         models.ParkingSlot.zone_id == zone_id
     )
 
@@ -363,6 +683,8 @@ def get_zone_slots(
 
     slots = query.order_by(models.ParkingSlot.slot_number).all()
 
+    if FAST_JSON:
+        return RowsResponse(slots)
     return slots
 
 
@@ -375,7 +697,7 @@ def update_slot_status(
     slot_id: int,
     data: schemas.ParkingSlotUpdate,
     db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin updates slot status (available ↔ occupied).
@@ -398,47 +720,65 @@ def update_slot_status(
             detail="Zone not found or you don't have access"
         )
 
-    # Get slot
-    slot = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.id == slot_id,
-        models.ParkingSlot.zone_id == zone_id
-    ).first()
-
-    if not slot:
-        raise HTTPException(
-            status_code=404,
-            detail="Slot not found in this zone"
-        )
-
-    # Get old status
-    old_status = slot.status
     new_status = data.status
 
-    # No change needed
-    if old_status == new_status:
-        return {
-            "message": "Slot status unchanged",
-            "slot_number": slot.slot_number,
-            "status": slot.status
-        }
+    for _ in range(MAX_BOOKING_ATTEMPTS):
+        # Get slot
+        slot = db.query(models.ParkingSlot).filter(
+            models.ParkingSlot.id == slot_id,
+            models.ParkingSlot.zone_id == zone_id
+        ).first()
 
-    # Update slot status
-    slot.status = new_status
+        if not slot:
+            raise HTTPException(
+                status_code=404,
+                detail="Slot not found in this zone"
+            )
 
-    # 🔥 CRITICAL: Auto-sync zone availability
-    if old_status == "available" and new_status == "occupied":
-        # Slot became occupied → decrease availability
-        if zone.available_slots > 0:
-            zone.available_slots -= 1
-    elif old_status == "occupied" and new_status == "available":
-        # Slot became available → increase availability
-        if zone.available_slots < zone.total_slots:
-            zone.available_slots += 1
+        # Get old status
+        old_status = slot.status
+
+        # No change needed
+        if old_status == new_status:
+            return {
+                "message": "Slot status unchanged",
+                "slot_number": slot.slot_number,
+                "status": slot.status
+            }
+
+        # Only applies if no booking or other admin changed the slot meanwhile
+        if not _set_slot_status(db, slot_id, old_status, new_status):
+            db.rollback()
+            continue
+
+        # 🔥 CRITICAL: Auto-sync zone availability
+        if old_status == "available" and new_status == "occupied":
+            # Slot became occupied → decrease availability
+            _adjust_zone_availability(db, zone_id, -1)
+            record_events(db, [event("occupy", zone_id, slot_id)])
+        elif old_status == "occupied" and new_status == "available":
+            # Slot became available → increase availability
+            _adjust_zone_availability(db, zone_id, 1)
+            record_events(db, [event("release", zone_id, slot_id)])
+
+        db.commit()
+        zones_changed(zone_id)
+        break
+    else:
+        raise HTTPException(
+            status_code=409,
+            detail="Slot status changed concurrently, please try again"
+        )
 
-    db.commit()
     db.refresh(slot)
     db.refresh(zone)
 
+    # Keep the free lists in sync with the grid
+    if new_status == "available":
+        slot_allocator.release(zone_id, slot.id, slot.vehicle_type)
+    else:
+        slot_allocator.claim(zone_id, slot.id)
+
     return {
         "message": "Slot status updated successfully",
         "slot_number": slot.slot_number,
@@ -457,7 +797,7 @@ def delete_slot(
     zone_id: int,
     slot_id: int,
     db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin deletes a parking slot.
@@ -502,12 +842,18 @@ def delete_slot(
     # If slot was available, adjust zone availability
     if slot.status == "available" and zone.available_slots > 0:
         zone.available_slots -= 1
+    elif slot.status == "occupied":
+        # Occupied without a booking (set by an admin): it stops counting
+        record_events(db, [event("release", zone_id, slot_id)])
 
     # Decrease total slots
     zone.total_slots -= 1
 
     db.delete(slot)
     db.commit()
+    zones_changed(zone_id)
+
+    slot_allocator.discard(zone_id, slot_id)
 
     return {
         "message": "Slot deleted successfully",
@@ -523,8 +869,8 @@ def delete_slot(
 @router.get("/zones/{zone_id}/slots/stats")
 def get_slot_statistics(
     zone_id: int,
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin gets slot statistics for their parking zone.
@@ -542,36 +888,11 @@ def get_slot_statistics(
             detail="Zone not found or you don't have access"
         )
 
-    # Count slots by status
-    total_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id
-    ).count()
-
-    available_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id,
-        models.ParkingSlot.status == "available"
-    ).count()
-
-    occupied_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id,
-        models.ParkingSlot.status == "occupied"
-    ).count()
-
-    # Count by vehicle type
-    car_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id,
-        models.ParkingSlot.vehicle_type == "car"
-    ).count()
-
-    bike_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id,
-        models.ParkingSlot.vehicle_type == "bike"
-    ).count()
-
-    truck_slots = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.zone_id == zone_id,
-        models.ParkingSlot.vehicle_type == "truck"
-    ).count()
+    # Count slots by status and vehicle type in one query
+    counts = queries.slot_statistics(db, zone_id)
+    total_slots = counts.total
+    available_slots = counts.available
+    occupied_slots = counts.occupied
 
     return {
         "zone_id": zone_id,
@@ -581,9 +902,9 @@ def get_slot_statistics(
         "occupied_slots": occupied_slots,
         "occupancy_rate": round((occupied_slots / total_slots * 100), 2) if total_slots > 0 else 0,
         "vehicle_types": {
-            "car": car_slots,
-            "bike": bike_slots,
-            "truck": truck_slots
+            "car": counts.car,
+            "bike": counts.bike,
+            "truck": counts.truck
         }
     }
 
@@ -600,7 +921,7 @@ def get_slot_statistics(
 def create_booking(
     data: schemas.BookingCreate,
     db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver creates a parking booking.
@@ -608,10 +929,10 @@ def create_booking(
     Logic:
     1. Check if zone has available slots
     2. Find an available slot (if slot_id not provided)
-    3. Create booking
-    4. Mark slot as occupied
-    5. Decrease zone availability
-    6. Calculate amount based on duration
+    3. Mark slot as occupied and decrease zone availability, each with a
+       conditional UPDATE; if another driver won the slot, pick another
+       (up to MAX_BOOKING_ATTEMPTS)
+    4. Create booking with amount based on duration
     """
     # Get zone
     zone = db.query(models.ParkingZone).filter(
@@ -643,8 +964,53 @@ def create_booking(
             detail="No available slots in this parking zone"
         )
 
-    # Find or assign slot
-    slot = None
+    for _ in range(MAX_BOOKING_ATTEMPTS):
+        slot = _pick_slot(db, data)
+        slot_id, slot_number, vehicle_type = slot.id, slot.slot_number, slot.vehicle_type
+
+        try:
+            booking = _book_slot(db, data, driver, slot)
+        except OperationalError:
+            # SQLite writer contention ("database is locked"): try again
+            db.rollback()
+            slot_allocator.release(data.zone_id, slot_id, vehicle_type)
+            continue
+        except Exception:
+            db.rollback()
+            slot_allocator.release(data.zone_id, slot_id, vehicle_type)
+            raise
+
+        if booking:
+            break
+
+        # Another driver took this slot first
+        if data.slot_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Requested slot is not available"
+            )
+    else:
+        raise HTTPException(
+            status_code=409,
+            detail="Could not reserve a slot, please try again"
+        )
+
+    db.refresh(booking)
+
+    return {
+        "message": "Booking created successfully",
+        "booking_id": booking.id,
+        "zone_name": zone.name,
+        "slot_number": slot_number,
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "duration_hours": booking.duration_hours,
+        "amount_paid": booking.amount_paid
+    }
+
+
+def _pick_slot(db: Session, data: schemas.BookingCreate) -> models.ParkingSlot:
+    """Requested slot if still available, otherwise next one from the free list."""
     if data.slot_id:
         # Specific slot requested
         slot = db.query(models.ParkingSlot).filter(
@@ -658,25 +1024,56 @@ def create_booking(
                 status_code=400,
                 detail="Requested slot is not available"
             )
-    else:
-        # Auto-assign any available slot
-        slot = db.query(models.ParkingSlot).filter(
-            models.ParkingSlot.zone_id == data.zone_id,
-            models.ParkingSlot.status == "available"
-        ).first()
 
-        if not slot:
+        slot_allocator.claim(data.zone_id, slot.id)
+        return slot
+
+    # Auto-assign from the zone's free list; skip entries gone stale
+    while True:
+        slot_id = slot_allocator.acquire(db, data.zone_id)
+        if slot_id is None:
             raise HTTPException(
                 status_code=400,
                 detail="No available slots in this zone"
             )
 
+        slot = db.query(models.ParkingSlot).filter(
+            models.ParkingSlot.id == slot_id,
+            models.ParkingSlot.zone_id == data.zone_id,
+            models.ParkingSlot.status == "available"
+        ).first()
+
+        if slot:
+            return slot
+
+
+def _book_slot(
+    db: Session,
+    data: schemas.BookingCreate,
+    driver: Principal,
+    slot: models.ParkingSlot
+) -> Optional[models.Booking]:
+    """
+    Occupy the slot, take one unit of zone availability and insert the
+    booking in one transaction. Returns None (rolled back) if the slot was
+    taken concurrently.
+    """
+    if not _set_slot_status(db, slot.id, "available", "occupied"):
+        db.rollback()
+        return None
+
+    if not _adjust_zone_availability(db, data.zone_id, -1):
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="No available slots in this parking zone"
+        )
+
     # Calculate end time and amount
     start_time = datetime.utcnow()
     end_time = start_time + timedelta(hours=data.duration_hours)
     amount = slot.price_per_hour * data.duration_hours
 
-    # Create booking
     booking = models.Booking(
         user_id=driver.id,
         zone_id=data.zone_id,
@@ -688,26 +1085,12 @@ def create_booking(
         status="active"
     )
 
-    # Update slot status
-    slot.status = "occupied"
-
-    # Decrease zone availability
-    zone.available_slots -= 1
-
     db.add(booking)
+    db.flush()
+    record_events(db, [event("occupy", data.zone_id, slot.id, booking.id, amount)])
     db.commit()
-    db.refresh(booking)
-
-    return {
-        "message": "Booking created successfully",
-        "booking_id": booking.id,
-        "zone_name": zone.name,
-        "slot_number": slot.slot_number,
-        "start_time": booking.start_time,
-        "end_time": booking.end_time,
-        "duration_hours": booking.duration_hours,
-        "amount_paid": booking.amount_paid
-    }
+    zones_changed(data.zone_id)
+    return booking
 
 
 # ======================
@@ -715,13 +1098,14 @@ def create_booking(
 # ======================
 @router.get("/bookings/active", response_model=schemas.BookingResponse)
 def get_active_booking(
-    db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    db: Session = Depends(get_read_db),
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver fetches their current active booking.
     """
-    booking = db.query(models.Booking).filter(
+    booking = queries.booking_details(
+        db,
         models.Booking.user_id == driver.id,
         models.Booking.status == "active"
     ).first()
@@ -732,20 +1116,8 @@ def get_active_booking(
             detail="No active booking found"
         )
 
-    # Enrich response with zone and slot info
-    zone = db.query(models.ParkingZone).filter(
-        models.ParkingZone.id == booking.zone_id
-    ).first()
-
-    slot = db.query(models.ParkingSlot).filter(
-        models.ParkingSlot.id == booking.slot_id
-    ).first()
-
-    response = schemas.BookingResponse.model_validate(booking)
-    response.zone_name = zone.name if zone else None
-    response.slot_number = slot.slot_number if slot else None
-
-    return response
+    # Zone name and slot number come from the same joined row
+    return schemas.BookingResponse.model_validate(booking)
 
 
 # ======================
@@ -756,7 +1128,7 @@ def extend_booking(
     booking_id: int,
     data: schemas.BookingExtend,
     db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver extends their active booking.
@@ -806,6 +1178,7 @@ def extend_booking(
     booking.end_time = new_end_time
     booking.duration_hours = new_duration
     booking.amount_paid += additional_amount
+    record_events(db, [event("extend", booking.zone_id, booking.slot_id, booking.id, additional_amount)])
 
     db.commit()
     db.refresh(booking)
@@ -828,7 +1201,7 @@ def extend_booking(
 def complete_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver completes their booking (check-out).
@@ -838,6 +1211,7 @@ def complete_booking(
     2. Mark booking as completed
     3. Free the slot (mark as available)
     4. Increase zone availability
+    Steps 2-4 are conditional UPDATEs in one transaction.
     """
     # Get booking
     booking = db.query(models.Booking).filter(
@@ -866,19 +1240,20 @@ def complete_booking(
         models.ParkingZone.id == booking.zone_id
     ).first()
 
-    # Update booking status
-    booking.status = "completed"
-    booking.end_time = datetime.utcnow()  # Actual completion time
-
-    # Free the slot
-    if slot:
-        slot.status = "available"
-
-    # Increase zone availability
-    if zone and zone.available_slots < zone.total_slots:
-        zone.available_slots += 1
+    # Close the booking, free the slot and increase zone availability;
+    # conditional UPDATEs so a concurrent complete/cancel can't run twice
+    if not _release_booking(db, booking, "completed", end_time=datetime.utcnow()):
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Booking is not active"
+        )
 
     db.commit()
+    zones_changed(booking.zone_id)
+
+    if slot:
+        slot_allocator.release(slot.zone_id, slot.id, slot.vehicle_type)
 
     return {
         "message": "Booking completed successfully",
@@ -897,7 +1272,7 @@ def complete_booking(
 def cancel_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver cancels their booking.
@@ -931,18 +1306,19 @@ def cancel_booking(
         models.ParkingZone.id == booking.zone_id
     ).first()
 
-    # Update booking status
-    booking.status = "cancelled"
-
-    # Free the slot
-    if slot:
-        slot.status = "available"
-
-    # Increase zone availability
-    if zone and zone.available_slots < zone.total_slots:
-        zone.available_slots += 1
+    # Same atomic release as complete, but status = "cancelled"
+    if not _release_booking(db, booking, "cancelled"):
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Can only cancel active bookings"
+        )
 
     db.commit()
+    zones_changed(booking.zone_id)
+
+    if slot:
+        slot_allocator.release(slot.zone_id, slot.id, slot.vehicle_type)
 
     return {
         "message": "Booking cancelled successfully",
@@ -951,25 +1327,53 @@ def cancel_booking(
     }
 
 
+# ======================
+# BOOKING LISTS: CURSOR PAGINATION
+# ======================
+def _page_bookings(query, response: Response, limit: int, skip: int, cursor: Optional[str]):
+    """Run a booking listing page; the next cursor goes in X-Next-Cursor."""
+    try:
+        bookings, next_cursor = queries.page_bookings(query, limit, skip, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return bookings
+
+
+def _rows_response(rows, response: Response) -> RowsResponse:
+    """Fast-path list body; FastAPI only merges the injected response's
+    headers into responses it builds itself, so carry them over here."""
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return RowsResponse(rows, headers=headers)
+
+
 # ======================
 # DRIVER: GET BOOKING HISTORY
 # ======================
 @router.get("/bookings/history", response_model=List[schemas.BookingHistoryResponse])
 def get_booking_history(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(10, ge=1, le=100),
     skip: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver fetches their booking history.
     
     Supports:
-    - Pagination (limit, skip)
+    - Pagination (limit + cursor; skip still works but slows down with depth)
     - Filter by status (active, completed, cancelled)
+
+    The cursor for the next page is returned in the X-Next-Cursor header
+    (absent on the last page).
     """
-    query = db.query(models.Booking).filter(
+    query = queries.booking_details(
+        db,
         models.Booking.user_id == driver.id
     )
 
@@ -977,35 +1381,28 @@ def get_booking_history(
     if status:
         query = query.filter(models.Booking.status == status)
 
-    # Order by most recent first
-    bookings = query.order_by(
-        models.Booking.id.desc()
-    ).offset(skip).limit(limit).all()
-
-    # Enrich with zone and slot info
-    result = []
-    for booking in bookings:
-        zone = db.query(models.ParkingZone).filter(
-            models.ParkingZone.id == booking.zone_id
-        ).first()
+    # Most recent first, resuming after the cursor if given
+    if FAST_JSON:
+        query = query.with_entities(*queries.BOOKING_HISTORY_COLUMNS)
 
-        slot = db.query(models.ParkingSlot).filter(
-            models.ParkingSlot.id == booking.slot_id
-        ).first()
+    bookings = _page_bookings(query, response, limit, skip, cursor)
 
-        result.append(schemas.BookingHistoryResponse(
+    if FAST_JSON:
+        return _rows_response(bookings, response)
+    return [
+        schemas.BookingHistoryResponse(
             id=booking.id,
             zone_id=booking.zone_id,
-            zone_name=zone.name if zone else "Unknown",
-            slot_number=slot.slot_number if slot else None,
+            zone_name=booking.zone_name or "Unknown",
+            slot_number=booking.slot_number,
             start_time=booking.start_time,
             end_time=booking.end_time,
             duration_hours=booking.duration_hours,
             amount_paid=booking.amount_paid,
             status=booking.status
-        ))
-
-    return result
+        )
+        for booking in bookings
+    ]
 
 
 # ======================
@@ -1013,51 +1410,23 @@ def get_booking_history(
 # ======================
 @router.get("/profile/stats", response_model=schemas.DriverStatsResponse)
 def get_driver_stats(
-    db: Session = Depends(get_db),
-    driver: models.User = Depends(require_driver)
+    db: Session = Depends(get_read_db),
+    driver: Principal = Depends(require_driver)
 ):
     """
     Driver fetches their profile statistics.
     Used in Profile page.
     """
-    # Total bookings
-    total_bookings = db.query(models.Booking).filter(
-        models.Booking.user_id == driver.id
-    ).count()
-
-    # Active bookings
-    active_bookings = db.query(models.Booking).filter(
-        models.Booking.user_id == driver.id,
-        models.Booking.status == "active"
-    ).count()
-
-    # Completed bookings
-    completed_bookings = db.query(models.Booking).filter(
-        models.Booking.user_id == driver.id,
-        models.Booking.status == "completed"
-    ).count()
-
-    # Cancelled bookings
-    cancelled_bookings = db.query(models.Booking).filter(
-        models.Booking.user_id == driver.id,
-        models.Booking.status == "cancelled"
-    ).count()
-
-    # Total amount spent
-    bookings = db.query(models.Booking).filter(
-        models.Booking.user_id == driver.id
-    ).all()
-
-    total_amount_spent = sum(b.amount_paid for b in bookings)
-    total_hours_parked = sum(b.duration_hours for b in bookings)
+    # Counts and totals in one aggregate query
+    totals = queries.booking_totals(db, models.Booking.user_id == driver.id)
 
     return schemas.DriverStatsResponse(
-        total_bookings=total_bookings,
-        active_bookings=active_bookings,
-        completed_bookings=completed_bookings,
-        cancelled_bookings=cancelled_bookings,
-        total_amount_spent=round(total_amount_spent, 2),
-        total_hours_parked=total_hours_parked
+        total_bookings=totals.total,
+        active_bookings=totals.active,
+        completed_bookings=totals.completed,
+        cancelled_bookings=totals.cancelled,
+        total_amount_spent=round(totals.amount, 2),
+        total_hours_parked=totals.hours
     )
 
 
@@ -1066,14 +1435,17 @@ def get_driver_stats(
 # ======================
 @router.get("/admin/bookings", response_model=List[schemas.BookingResponse])
 def get_zone_bookings(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(20, ge=1, le=100),
     skip: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin views all bookings for their parking zone.
+    Paginated like /bookings/history (limit + cursor, X-Next-Cursor header).
     """
     # Get admin's zone
     zone = db.query(models.ParkingZone).filter(
@@ -1086,8 +1458,9 @@ def get_zone_bookings(
             detail="You don't manage any parking zone"
         )
 
-    # Query bookings for this zone
-    query = db.query(models.Booking).filter(
+    # Query bookings for this zone (slot number joined in)
+    query = queries.booking_details(
+        db,
         models.Booking.zone_id == zone.id
     )
 
@@ -1095,24 +1468,15 @@ def get_zone_bookings(
     if status:
         query = query.filter(models.Booking.status == status)
 
-    # Order by most recent first
-    bookings = query.order_by(
-        models.Booking.id.desc()
-    ).offset(skip).limit(limit).all()
+    # Most recent first, resuming after the cursor if given
+    if FAST_JSON:
+        query = query.with_entities(*queries.BOOKING_DETAIL_COLUMNS)
 
-    # Enrich with slot info
-    result = []
-    for booking in bookings:
-        slot = db.query(models.ParkingSlot).filter(
-            models.ParkingSlot.id == booking.slot_id
-        ).first()
-
-        response = schemas.BookingResponse.model_validate(booking)
-        response.zone_name = zone.name
-        response.slot_number = slot.slot_number if slot else None
-        result.append(response)
+    bookings = _page_bookings(query, response, limit, skip, cursor)
 
-    return result
+    if FAST_JSON:
+        return _rows_response(bookings, response)
+    return [schemas.BookingResponse.model_validate(booking) for booking in bookings]
 
 
 # ======================
@@ -1120,8 +1484,8 @@ def get_zone_bookings(
 # ======================
 @router.get("/admin/bookings/stats")
 def get_admin_booking_stats(
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin)
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
 ):
     """
     Admin gets booking statistics for their zone.
@@ -1138,41 +1502,54 @@ def get_admin_booking_stats(
             detail="You don't manage any parking zone"
         )
 
-    # Total bookings
-    total_bookings = db.query(models.Booking).filter(
-        models.Booking.zone_id == zone.id
-    ).count()
-
-    # Active bookings
-    active_bookings = db.query(models.Booking).filter(
-        models.Booking.zone_id == zone.id,
-        models.Booking.status == "active"
-    ).count()
-
-    # Completed bookings
-    completed_bookings = db.query(models.Booking).filter(
-        models.Booking.zone_id == zone.id,
-        models.Booking.status == "completed"
-    ).count()
-
-    # Total revenue
-    bookings = db.query(models.Booking).filter(
-        models.Booking.zone_id == zone.id
-    ).all()
-
-    total_revenue = sum(b.amount_paid for b in bookings)
+    # Counts, revenue and hours in one aggregate query
+    totals = queries.booking_totals(db, models.Booking.zone_id == zone.id)
 
     # Average booking duration
-    total_hours = sum(b.duration_hours for b in bookings)
-    avg_duration = round(total_hours / total_bookings, 2) if total_bookings > 0 else 0
+    avg_duration = round(totals.hours / totals.total, 2) if totals.total > 0 else 0
 
     return {
         "zone_id": zone.id,
         "zone_name": zone.name,
-        "total_bookings": total_bookings,
-        "active_bookings": active_bookings,
-        "completed_bookings": completed_bookings,
-        "total_revenue": round(total_revenue, 2),
+        "total_bookings": totals.total,
+        "active_bookings": totals.active,
+        "completed_bookings": totals.completed,
+        "total_revenue": round(totals.amount, 2),
         "average_booking_duration_hours": avg_duration,
         "current_occupancy": f"{zone.total_slots - zone.available_slots}/{zone.total_slots}"
-    }
\ No newline at end of file
+    }
+
+
+# ======================
+# ADMIN: OCCUPANCY TIME SERIES
+# ======================
+@router.get("/admin/analytics/occupancy", response_model=schemas.OccupancySeriesResponse)
+def get_occupancy_series(
+    start: Optional[datetime] = Query(None, description="UTC unless it has an offset; default 24 hours before end"),
+    end: Optional[datetime] = Query(None, description="UTC unless it has an offset; default now"),
+    db: Session = Depends(get_read_db),
+    admin: Principal = Depends(require_admin)
+):
+    """
+    Hourly occupancy, turnover and revenue for the admin's zone.
+    Read from the hourly rollups (app/analytics.py), not from bookings.
+    """
+    zone = db.query(models.ParkingZone).filter(
+        models.ParkingZone.admin_id == admin.id
+    ).first()
+
+    if not zone:
+        raise HTTPException(
+            status_code=404,
+            detail="You don't manage any parking zone"
+        )
+
+    end = naive_utc(end) if end else datetime.utcnow()
+    start = naive_utc(start) if start else end - timedelta(hours=24)
+    if not start < end or end - start > timedelta(hours=MAX_SERIES_HOURS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"start must be before end, at most {MAX_SERIES_HOURS} hours apart"
+        )
+
+    return occupancy_series(db, zone, start, end)
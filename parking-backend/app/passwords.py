@@ -0,0 +1,132 @@
+# app/passwords.py
+#
+# bcrypt hashing on a dedicated process pool. Each hash/verify is a few
+# hundred ms of CPU; running it in worker processes keeps it off the GIL and
+# off the request threadpool. At most HASH_WORKERS + HASH_QUEUE_LIMIT jobs
+# are in flight; beyond that requests are shed with 503 instead of queueing.
+#
+#   PARKING_BCRYPT_ROUNDS      cost factor for new hashes (default 12)
+#   PARKING_HASH_WORKERS       worker processes (default: CPU count, max 4)
+#   PARKING_HASH_QUEUE_LIMIT   jobs allowed to wait for a worker
+#   PARKING_HASH_WORKER_NICE   niceness added to the workers (default 10)
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = int(os.getenv("PARKING_BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("PARKING_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("PARKING_HASH_QUEUE_LIMIT", str(HASH_WORKERS * 4)))
+HASH_RETRY_AFTER_SECONDS = 1
+HASH_WORKER_NICE = int(os.getenv("PARKING_HASH_WORKER_NICE", "10"))
+
+# Hashes with any other cost are flagged for rehash on the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+
+# ======================
+# WORKER FUNCTIONS (run in the pool)
+# ======================
+def _truncate(password: str) -> str:
+    # bcrypt max length = 72 bytes
+    if len(password.encode("utf-8")) > 72:
+        password = password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
+    return password
+
+
+def _init_worker():
+    # Lower priority: when cores are scarce, serving requests wins over hashing
+    if HASH_WORKER_NICE and hasattr(os, "nice"):
+        os.nice(HASH_WORKER_NICE)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(_truncate(password))
+
+
+def _verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when `hashed` uses an outdated cost."""
+    return pwd_context.verify_and_update(_truncate(plain), hashed)
+
+
+# ======================
+# POOL
+# ======================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_LIMIT)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Started on first use, so importing the app never forks."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _submit(fn, *args) -> Future:
+    """Queue a job, or raise 503 when the pool and its queue are full."""
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry",
+            headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)}
+        )
+
+    try:
+        future = _get_pool().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def submit_hash(password: str) -> Future:
+    return _submit(_hash, password)
+
+
+def submit_verify(plain: str, hashed: str) -> Future:
+    return _submit(_verify_and_update, plain, hashed)
+
+
+# ======================
+# BLOCKING HELPERS (sync routes)
+# ======================
+def hash_password(password: str) -> str:
+    return submit_hash(password).result()
+
+
+def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return submit_verify(plain, hashed).result()
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return verify_and_update(plain, hashed)[0]
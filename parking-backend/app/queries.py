@@ -0,0 +1,313 @@
+# app/queries.py
+#
+# Shared read queries. Each one returns exactly the columns an endpoint
+# needs, joined in a single SELECT, so listings stay at a fixed number of
+# queries regardless of page size.
+
+import base64
+from typing import Optional
+
+from sqlalchemy import case, column, func, select, table
+from sqlalchemy.orm import Query, Session
+
+from app import models, schemas
+
+
+# ======================
+# BOOKINGS (+ zone name, slot number)
+# ======================
+BOOKING_COLUMNS = (
+    models.Booking.id,
+    models.Booking.user_id,
+    models.Booking.zone_id,
+    models.Booking.slot_id,
+    models.Booking.start_time,
+    models.Booking.end_time,
+    models.Booking.status,
+    models.Booking.amount_paid,
+    models.Booking.duration_hours,
+)
+
+
+def booking_details(db: Session, *criteria):
+    """
+    Bookings joined with their zone name and slot number.
+    Rows expose the Booking columns plus `zone_name` and `slot_number`
+    (None when the zone or slot no longer exists).
+    """
+    return db.query(
+        *BOOKING_COLUMNS,
+        models.ParkingZone.name.label("zone_name"),
+        models.ParkingSlot.slot_number.label("slot_number")
+    ).outerjoin(
+        models.ParkingZone, models.ParkingZone.id == models.Booking.zone_id
+    ).outerjoin(
+        models.ParkingSlot, models.ParkingSlot.id == models.Booking.slot_id
+    ).filter(*criteria)
+
+
+# ======================
+# RESPONSE COLUMN SETS (fast JSON path, app/serialization.py)
+# ======================
+def response_columns(schema, model, **sources):
+    """
+    One column per field of `schema`, in field order and named after it:
+    the model attribute of the same name unless `sources` gives another
+    expression. Rows selected this way serialize to the schema's JSON.
+    """
+    return tuple(
+        sources[name].label(name) if name in sources else getattr(model, name)
+        for name in schema.model_fields
+    )
+
+
+ZONE_RESPONSE_COLUMNS = response_columns(schemas.ParkingZoneResponse, models.ParkingZone)
+SLOT_RESPONSE_COLUMNS = response_columns(schemas.ParkingSlotResponse, models.ParkingSlot)
+
+# For booking_details() queries, which join the zone and slot
+BOOKING_DETAIL_COLUMNS = response_columns(
+    schemas.BookingResponse, models.Booking,
+    zone_name=models.ParkingZone.name,
+    slot_number=models.ParkingSlot.slot_number
+)
+BOOKING_HISTORY_COLUMNS = response_columns(
+    schemas.BookingHistoryResponse, models.Booking,
+    zone_name=func.coalesce(models.ParkingZone.name, "Unknown"),
+    slot_number=models.ParkingSlot.slot_number
+)
+
+
+# ======================
+# CHANGE FEED (GET /parking/zones/changes)
+# ======================
+ZONE_CHANGE_COLUMNS = response_columns(schemas.ZoneChange, models.ParkingZone)
+SLOT_CHANGE_COLUMNS = response_columns(schemas.SlotChange, models.ParkingSlot)
+
+
+def zones_version(db: Session) -> int:
+    """
+    Latest version of any zone row: one read of the version index. Zones
+    are never deleted, so it changes exactly when some zone does, and
+    every worker sees the same value.
+    """
+    return db.query(func.max(models.ParkingZone.version)).scalar() or 0
+
+
+def zone_changes(db: Session, since: int, limit: int, admin_id: Optional[int] = None) -> dict:
+    """
+    Zones, slots and slot tombstones with version > since, at most `limit`
+    in all, oldest change first. Every row has its own version, so the
+    page ends at the limit-th smallest one and the next page starts after it.
+
+    Slots and tombstones are those of admin_id's zone; without an admin,
+    zones only (what GET /parking/zones shows).
+    """
+    zone, slot, deleted = models.ParkingZone, models.ParkingSlot, models.DeletedSlot
+    # limit + 1 of each kind: the merged list is longer than limit iff more exist
+    zones = db.query(*ZONE_CHANGE_COLUMNS).filter(
+        zone.version > since
+    ).order_by(zone.version).limit(limit + 1).all()
+
+    slots, tombstones = [], []
+    if admin_id is not None:
+        # An admin manages one zone: (zone_id, version) reads its changes in order
+        owned = select(zone.id).where(zone.admin_id == admin_id).limit(1).scalar_subquery()
+        slots = db.query(*SLOT_CHANGE_COLUMNS).filter(
+            slot.zone_id == owned, slot.version > since
+        ).order_by(slot.version).limit(limit + 1).all()
+        tombstones = db.query(deleted.id, deleted.version).filter(
+            deleted.zone_id == owned, deleted.version > since
+        ).order_by(deleted.version).limit(limit + 1).all()
+
+    versions = sorted(row.version for rows in (zones, slots, tombstones) for row in rows)
+    has_more = len(versions) > limit
+    upto = versions[limit - 1] if has_more else (versions[-1] if versions else since)
+
+    return {
+        "version": upto,
+        "has_more": has_more,
+        "zones": [row for row in zones if row.version <= upto],
+        "slots": [row for row in slots if row.version <= upto],
+        "deleted_slots": [row.id for row in tombstones if row.version <= upto],
+    }
+
+
+# ======================
+# KEYSET PAGINATION
+# ======================
+# Listings are newest first by id. A cursor is the last id of the previous
+# page, so the next page is "id < cursor": an index range read that costs
+# the same at page 1 and page 10,000, unlike OFFSET which walks every
+# skipped row. The cursor is opaque to clients; only the server decodes it.
+CURSOR_PREFIX = "b1:"
+
+# Largest id SQLite can bind (signed 64-bit); bigger ones overflow at bind time
+MAX_ROW_ID = 2 ** 63 - 1
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = f"{CURSOR_PREFIX}{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Last id from a cursor made by encode_cursor. Raises ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except Exception:
+        raise ValueError("Invalid cursor")
+    digits = raw[len(CURSOR_PREFIX):]
+    if not raw.startswith(CURSOR_PREFIX) or not (digits.isascii() and digits.isdigit()):
+        raise ValueError("Invalid cursor")
+    last_id = int(digits)
+    if not 1 <= last_id <= MAX_ROW_ID:
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def page_bookings(query: Query, limit: int, skip: int = 0, cursor: Optional[str] = None):
+    """
+    One page of a booking_details() query, most recent first.
+    With a cursor, starts after it (skip still applies on top, for old
+    clients). Returns (rows, next_cursor); next_cursor is None on the
+    last page. Reads limit + 1 rows to know whether another page exists.
+    """
+    if cursor is not None:
+        query = query.filter(models.Booking.id < decode_cursor(cursor))
+
+    rows = query.order_by(
+        models.Booking.id.desc()
+    ).offset(skip).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+
+# ======================
+# ZONES IN A BOX (nearby search, ranking, map viewports)
+# ======================
+# parking_zones_rtree is an R*Tree over zone coordinates, kept in sync by
+# triggers (migration 9). It seeks on latitude and longitude together, so
+# a box reads only the zones inside it however many share its latitude
+# band. Its bounds are 32-bit floats rounded outward: the box is checked
+# again on the zone row.
+ZONE_RTREE = table(
+    "parking_zones_rtree",
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lon"),
+    column("max_lon")
+)
+
+
+def in_box(query: Query, bbox) -> Query:
+    """`query` (over parking_zones) narrowed to zones inside (min_lat, max_lat, min_lon, max_lon)."""
+    min_lat, max_lat, min_lon, max_lon = bbox
+    zone, rtree = models.ParkingZone, ZONE_RTREE
+    return query.join(rtree, rtree.c.id == zone.id).filter(
+        rtree.c.max_lat >= min_lat, rtree.c.min_lat <= max_lat,
+        rtree.c.max_lon >= min_lon, rtree.c.min_lon <= max_lon,
+        zone.latitude.between(min_lat, max_lat),
+        zone.longitude.between(min_lon, max_lon)
+    )
+
+
+# ======================
+# ZONE NAME SEARCH
+# ======================
+# parking_zones_fts is an FTS5 trigram index over parking_zones.name, kept
+# in sync by triggers (migration 4). Trigrams match any substring of 3+
+# characters, case-insensitively. Prefix matches come from the NOCASE name
+# index instead, so they work from the first keystroke; shorter substrings
+# than a trigram scan that index.
+TRIGRAM = 3
+
+ZONE_NAME_FTS = table(
+    "parking_zones_fts",
+    column("rowid"),
+    column("rank"),
+    column("parking_zones_fts")
+)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_zone_names(db: Session, text: str, limit: int, *columns):
+    """
+    Zones whose name starts with `text` (alphabetical), then other names
+    containing it: shortest first, then by FTS rank. Every match is
+    ranked in SQL; only the page is returned. Selects `columns`, or whole
+    ParkingZone rows. Blank text matches nothing (as a prefix it would
+    match every name).
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    zone = models.ParkingZone
+    pattern = _escape_like(text)
+    prefix = zone.name.like(f"{pattern}%", escape="\\")
+    query = db.query(*(columns or (zone,))).select_from(zone)
+
+    rows = query.filter(prefix).order_by(
+        zone.name.collate("NOCASE"), zone.id
+    ).limit(limit).all()
+    if len(rows) == limit:
+        return rows
+
+    if len(text) >= TRIGRAM:
+        # Quoted as one FTS5 string so operators in user input are plain text
+        phrase = '"' + text.replace('"', '""') + '"'
+        fts = ZONE_NAME_FTS
+        rest = query.join(fts, fts.c.rowid == zone.id).filter(
+            fts.c.parking_zones_fts.match(phrase), ~prefix
+        ).order_by(func.length(zone.name), fts.c.rank, zone.id)
+    else:
+        # Too short for trigrams: scan the name index (names only, no rows)
+        # for the page's ids
+        contains = zone.name.like(f"%{pattern}%", escape="\\")
+        page = select(zone.id).where(contains, ~prefix).order_by(
+            func.length(zone.name), zone.id
+        ).limit(limit - len(rows)).scalar_subquery()
+        rest = query.filter(zone.id.in_(page)).order_by(func.length(zone.name), zone.id)
+
+    return rows + rest.limit(limit - len(rows)).all()
+
+
+# ======================
+# AGGREGATE STATISTICS
+# ======================
+def _count_where(condition):
+    """COUNT of rows matching condition (CASE yields NULL otherwise)."""
+    return func.count(case((condition, 1)))
+
+
+def slot_statistics(db: Session, zone_id: int):
+    """Slot counts by status and vehicle type for one zone, in one pass."""
+    slot = models.ParkingSlot
+    return db.query(
+        func.count(slot.id).label("total"),
+        _count_where(slot.status == "available").label("available"),
+        _count_where(slot.status == "occupied").label("occupied"),
+        _count_where(slot.vehicle_type == "car").label("car"),
+        _count_where(slot.vehicle_type == "bike").label("bike"),
+        _count_where(slot.vehicle_type == "truck").label("truck")
+    ).filter(slot.zone_id == zone_id).one()
+
+
+def booking_totals(db: Session, *criteria):
+    """Booking counts by status plus amount/hours sums, in one pass."""
+    booking = models.Booking
+    return db.query(
+        func.count(booking.id).label("total"),
+        _count_where(booking.status == "active").label("active"),
+        _count_where(booking.status == "completed").label("completed"),
+        _count_where(booking.status == "cancelled").label("cancelled"),
+        func.coalesce(func.sum(booking.amount_paid), 0).label("amount"),
+        func.coalesce(func.sum(booking.duration_hours), 0).label("hours")
+    ).filter(*criteria).one()
@@ -0,0 +1,87 @@
+# app/ranking.py
+#
+# "Best zone for me": GET /parking/zones/best scores the zones around a
+# driver and returns the top k.
+#
+# Candidates come from the zones' R*Tree (app/queries.py: in_box), like
+# nearby search, joined to zone_slot_summary for the requested vehicle
+# type. That table keeps the lowest price and free count per zone and type
+# (maintained by triggers, see app/migrations.py), so no request
+# aggregates parking_slots.
+# Scoring is one NumPy pass over the candidates; only the k best are
+# sorted.
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from app.utils import haversine_km
+
+# Share of each term in the score; they add up to 1
+RANKING_WEIGHTS = {
+    "distance": 0.4,   # distance / search radius
+    "price": 0.3,      # lowest hourly price, cheapest candidate = 0
+    "occupancy": 0.2,  # occupied share of the zone
+    "scarcity": 0.1,   # few free slots of the vehicle type, FREE_SLOTS_ENOUGH or more = 0
+}
+
+# A zone with this many free slots is as good as one with more
+FREE_SLOTS_ENOUGH = 10
+
+
+def _spread(values: np.ndarray) -> np.ndarray:
+    """Scale to 0..1 across the candidates; all equal -> 0."""
+    low, high = values.min(), values.max()
+    if high <= low:
+        return np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+def rank_zones(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    available: Sequence[int],
+    total: Sequence[int],
+    free: Sequence[int],
+    min_prices: Sequence[float],
+    k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score candidates within radius_km (0-100, higher is better) and keep
+    the k best. available/total are the zone's counts, free the free
+    slots of the requested vehicle type. Returns (indices, distances,
+    scores), best first; ties go to the closer zone. Indices refer to the
+    input arrays.
+    """
+    distances = haversine_km(lat, lon, latitudes, longitudes)
+    indices = np.flatnonzero(distances <= radius_km)
+    if not indices.size:
+        return indices, distances[indices], np.zeros(0)
+
+    distances = distances[indices]
+    available = np.asarray(available, dtype=np.float64)[indices]
+    total = np.asarray(total, dtype=np.float64)[indices]
+    free = np.asarray(free, dtype=np.float64)[indices]
+    prices = np.asarray(min_prices, dtype=np.float64)[indices]
+
+    occupancy = np.ones_like(total)
+    np.divide(total - available, total, out=occupancy, where=total > 0)
+
+    cost = (
+        RANKING_WEIGHTS["distance"] * distances / radius_km
+        + RANKING_WEIGHTS["price"] * _spread(prices)
+        + RANKING_WEIGHTS["occupancy"] * np.clip(occupancy, 0, 1)
+        + RANKING_WEIGHTS["scarcity"] * (1 - np.minimum(free, FREE_SLOTS_ENOUGH) / FREE_SLOTS_ENOUGH)
+    )
+    scores = np.round((1 - cost) * 100, 2)
+
+    # Partial sort: only the k best get fully ordered
+    if k < scores.size:
+        top = np.argpartition(-scores, k - 1)[:k]
+        indices, distances, scores = indices[top], distances[top], scores[top]
+
+    order = np.lexsort((indices, distances, -scores))
+    return indices[order], distances[order], scores[order]
@@ -0,0 +1,420 @@
+# app/realtime.py
+#
+# Server-Sent Events push of zone availability, so drivers don't have to
+# poll GET /parking/zones, and GET /parking/zones/availability for a
+# compact one-off refresh of map pins.
+#
+# Write paths only mark a zone dirty (zones_changed, below). Once
+# per tick the broker reads the current counts of every dirty zone in one
+# query and hands each subscriber the subset it watches. Subscribers keep a
+# pending dict instead of a message queue, so a burst of changes - or a
+# slow client - collapses into one message with the latest counts.
+#
+# Like app/allocator.py the broker is per process: with several workers
+# each one only sees the writes it served. The counter table behind
+# /zones/availability is not; it follows the zones' versions in the database.
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.database import ReadSessionLocal
+from app.deps import Principal, get_current_user
+from app.queries import MAX_ROW_ID, in_box, zones_version
+
+logger = logging.getLogger(__name__)
+
+# Seconds between fan-outs; also the worst-case delay of a push
+TICK_SECONDS = 0.25
+# Comment line sent on idle streams so proxies keep them open
+HEARTBEAT_SECONDS = 15
+
+# zone_id -> (available_slots, total_slots)
+Counts = Dict[int, Tuple[int, int]]
+BBox = Tuple[float, float, float, float]  # min_lat, max_lat, min_lon, max_lon
+
+
+class Subscription:
+    """One client's filter plus the counts not yet sent to it."""
+
+    def __init__(self, zone_ids: Optional[Set[int]] = None, bbox: Optional[BBox] = None):
+        self.zone_ids = zone_ids
+        self.bbox = bbox
+        self.pending: Counts = {}
+        self._ready = asyncio.Event()
+
+    def push(self, counts: Counts):
+        self.pending.update(counts)
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Counts:
+        """Everything pending (possibly several ticks' worth), or {} on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self._ready.clear()
+        counts, self.pending = self.pending, {}
+        return counts
+
+
+class AvailabilityBroker:
+    def __init__(self, session_factory: Callable = ReadSessionLocal, tick: float = TICK_SECONDS):
+        self.session_factory = session_factory
+        self.tick = tick
+        self.sequence = 0
+        self._dirty: Set[int] = set()
+        self._dirty_lock = threading.Lock()  # publishers run on threadpool threads
+        self._by_zone: Dict[int, Set[Subscription]] = {}
+        self._everyone: Set[Subscription] = set()
+        # Viewport subscribers, with their boxes as one array for vectorized matching
+        self._viewports: List[Subscription] = []
+        self._bounds: Optional[np.ndarray] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ======================
+    # PUBLISHING (any thread)
+    # ======================
+    def publish(self, zone_ids: Iterable[int]):
+        """Mark zones whose counts changed; sent on the next tick."""
+        with self._dirty_lock:
+            self._dirty.update(zone_ids)
+
+    # ======================
+    # SUBSCRIBERS (event loop)
+    # ======================
+    def subscribe(self, zone_ids: Optional[Set[int]] = None, bbox: Optional[BBox] = None) -> Subscription:
+        sub = Subscription(zone_ids, bbox)
+        if zone_ids is not None:
+            for zone_id in zone_ids:
+                self._by_zone.setdefault(zone_id, set()).add(sub)
+        elif bbox is not None:
+            self._viewports.append(sub)
+            self._bounds = None
+        else:
+            self._everyone.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._everyone.discard(sub)
+        if sub.bbox is not None and sub.zone_ids is None:
+            self._viewports.remove(sub)
+            self._bounds = None
+        for zone_id in sub.zone_ids or ():
+            subs = self._by_zone.get(zone_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_zone[zone_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        by_zone = {s for subs in self._by_zone.values() for s in subs}
+        return len(self._everyone) + len(self._viewports) + len(by_zone)
+
+    def _viewport_bounds(self) -> np.ndarray:
+        if self._bounds is None:
+            self._bounds = np.array([s.bbox for s in self._viewports], dtype=np.float64).reshape(-1, 4)
+        return self._bounds
+
+    # ======================
+    # FAN-OUT
+    # ======================
+    def _load(self, zone_ids: List[int] = None, bbox: Optional[BBox] = None):
+        """(id, available, total, latitude, longitude) rows, from the read pool."""
+        zone = models.ParkingZone
+        db = self.session_factory()
+        try:
+            query = db.query(zone.id, zone.available_slots, zone.total_slots, zone.latitude, zone.longitude)
+            if zone_ids is not None:
+                query = query.filter(zone.id.in_(zone_ids))
+            if bbox is not None:
+                query = in_box(query, bbox)
+            return query.order_by(zone.id).all()
+        finally:
+            db.close()
+
+    def snapshot(self, zone_ids: Optional[Set[int]] = None, bbox: Optional[BBox] = None) -> Counts:
+        """Current counts for a new subscriber (blocking; run in a thread)."""
+        rows = self._load(sorted(zone_ids) if zone_ids is not None else None, bbox)
+        return {row.id: (row.available_slots, row.total_slots) for row in rows}
+
+    async def flush(self) -> int:
+        """Send one tick's worth of changes. Returns the number of zones sent."""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return 0
+
+        try:
+            rows = await run_in_threadpool(self._load, sorted(dirty))
+        except Exception:
+            # Retried on the next tick, with whatever changed meanwhile
+            self.publish(dirty)
+            raise
+        self.sequence += 1
+
+        bounds = self._viewport_bounds()
+        batches: Dict[Subscription, Counts] = {}
+        for row in rows:
+            counts = (row.available_slots, row.total_slots)
+            for sub in self._by_zone.get(row.id, ()):
+                batches.setdefault(sub, {})[row.id] = counts
+            for sub in self._everyone:
+                batches.setdefault(sub, {})[row.id] = counts
+            if len(bounds):
+                inside = np.flatnonzero(
+                    (bounds[:, 0] <= row.latitude) & (row.latitude <= bounds[:, 1])
+                    & (bounds[:, 2] <= row.longitude) & (row.longitude <= bounds[:, 3])
+                )
+                for i in inside:
+                    batches.setdefault(self._viewports[i], {})[row.id] = counts
+
+        for sub, counts in batches.items():
+            sub.push(counts)
+        return len(rows)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Availability fan-out failed")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+availability_broker = AvailabilityBroker()
+
+
+def zones_changed(*zone_ids: int):
+    """Call after committing any change to these zones' rows."""
+    availability_broker.publish(zone_ids)
+
+
+# ======================
+# COUNTER TABLE (GET /zones/availability)
+# ======================
+class ZoneCounters:
+    """
+    Every zone's (available, total) as parallel arrays sorted by id, plus
+    coordinates for viewport lookups. refresh() compares the zones' latest
+    version in the database with the one the table was loaded at and
+    reloads only the zones changed since (a zone it hasn't seen reloads
+    everything), so writes served by any worker show up. A refresh builds
+    new arrays and swaps them in, so readers never see a half-patched table.
+    """
+
+    def __init__(self, session_factory: Callable = ReadSessionLocal):
+        self.session_factory = session_factory
+        self._refresh_lock = threading.Lock()
+        self._version = 0
+        # (ids, latitudes, longitudes, available, total), or None until loaded
+        self._table: Optional[Tuple[np.ndarray, ...]] = None
+
+    def _load(self, db, since: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        zone = models.ParkingZone
+        query = db.query(zone.id, zone.latitude, zone.longitude, zone.available_slots, zone.total_slots)
+        if since is not None:
+            query = query.filter(zone.version > since)
+        rows = query.order_by(zone.id).all()
+
+        columns = list(zip(*rows)) or [()] * 5
+        return (
+            np.array(columns[0], dtype=np.int64),
+            np.array(columns[1], dtype=np.float64),
+            np.array(columns[2], dtype=np.float64),
+            np.array(columns[3], dtype=np.int64),
+            np.array(columns[4], dtype=np.int64),
+        )
+
+    def refresh(self):
+        """Bring the table up to date (blocking; run in a thread)."""
+        with self._refresh_lock:
+            db = self.session_factory()
+            try:
+                # Read the version first: rows written meanwhile are reloaded next time
+                version = zones_version(db)
+                table = self._table
+                if table is not None and version != self._version:
+                    table = self._patched(table, self._load(db, since=self._version))
+                if table is None:
+                    table = self._load(db)
+            finally:
+                db.close()
+            self._table, self._version = table, version
+
+    def _patched(self, table, changed) -> Optional[Tuple[np.ndarray, ...]]:
+        """`table` with the changed rows swapped in; None if one of them is new."""
+        ids = table[0]
+        pos = np.searchsorted(ids, changed[0])
+        if (pos >= len(ids)).any() or not np.array_equal(ids[pos], changed[0]):
+            return None
+
+        patched = [ids]
+        for column, values in zip(table[1:], changed[1:]):
+            column = column.copy()
+            column[pos] = values
+            patched.append(column)
+        return tuple(patched)
+
+    def lookup(self, zone_ids: Optional[Set[int]] = None, bbox: Optional[BBox] = None):
+        """(ids, available, total) lists for the zones asked for, by id; refresh() first."""
+        ids, lat, lon, available, total = self._table
+        if zone_ids is not None:
+            wanted = np.array(sorted(zone_ids), dtype=np.int64)
+            pos = np.searchsorted(ids, wanted)
+            inside = pos < len(ids)
+            pos, wanted = pos[inside], wanted[inside]
+            picked = pos[ids[pos] == wanted]
+        elif bbox is not None:
+            min_lat, max_lat, min_lon, max_lon = bbox
+            picked = np.flatnonzero(
+                (min_lat <= lat) & (lat <= max_lat) & (min_lon <= lon) & (lon <= max_lon)
+            )
+        else:
+            picked = slice(None)
+        return ids[picked].tolist(), available[picked].tolist(), total[picked].tolist()
+
+
+zone_counters = ZoneCounters()
+
+
+# ======================
+# SSE ENDPOINT
+# ======================
+router = APIRouter(prefix="/parking", tags=["Realtime"])
+
+
+def encode_event(sequence: int, counts: Counts) -> str:
+    """Compact delta: {"seq": n, "zones": [[id, available, total], ...]}"""
+    data = json.dumps(
+        {"seq": sequence, "zones": [[zone_id, *c] for zone_id, c in sorted(counts.items())]},
+        separators=(",", ":")
+    )
+    return f"event: availability\ndata: {data}\n\n"
+
+
+def _parse_zone_ids(zone_ids: Optional[str]) -> Optional[Set[int]]:
+    if not zone_ids:
+        return None
+    try:
+        ids = {int(part) for part in zone_ids.split(",") if part.strip()}
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="zone_ids must be a comma-separated list of integers"
+        )
+    # The counter table holds int64 ids, like SQLite
+    if any(not 1 <= zone_id <= MAX_ROW_ID for zone_id in ids):
+        raise HTTPException(
+            status_code=400,
+            detail="zone_ids out of range"
+        )
+    return ids
+
+
+def _parse_viewport(ids, corners) -> Optional[BBox]:
+    """The four viewport corners as a box, unless zone ids were given."""
+    if ids is not None or all(c is None for c in corners):
+        return None
+    if any(c is None for c in corners):
+        raise HTTPException(
+            status_code=400,
+            detail="Viewport needs min_lat, max_lat, min_lon and max_lon"
+        )
+    return corners
+
+
+@router.get("/zones/availability")
+async def get_zones_availability(
+    zone_ids: Optional[str] = Query(None, description="Comma-separated zone ids"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Current counts for map pins, as parallel arrays ordered by zone id:
+    `{"ids": [...], "available": [...], "total": [...]}`.
+
+    Same filters as /zones/stream (zone ids, a viewport, or every zone).
+    Served from the in-process counter table; only zones written since
+    the last call, by any worker, are read from the database.
+    """
+    ids = _parse_zone_ids(zone_ids)
+    bbox = _parse_viewport(ids, (min_lat, max_lat, min_lon, max_lon))
+
+    await run_in_threadpool(zone_counters.refresh)
+    zone_list, available, total = zone_counters.lookup(ids, bbox)
+
+    body = json.dumps({"ids": zone_list, "available": available, "total": total}, separators=(",", ":"))
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/zones/stream")
+async def stream_availability(
+    request: Request,
+    zone_ids: Optional[str] = Query(None, description="Comma-separated zone ids"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of zone availability.
+
+    Subscribe to zone ids (`zone_ids=1,2,3`) or a map viewport (all four
+    of min_lat/max_lat/min_lon/max_lon); with neither, every zone. The
+    first event is a snapshot, later ones only carry zones whose counts
+    changed: `{"seq": n, "zones": [[id, available_slots, total_slots], ...]}`.
+    """
+    ids = _parse_zone_ids(zone_ids)
+    bbox = _parse_viewport(ids, (min_lat, max_lat, min_lon, max_lon))
+
+    broker = availability_broker
+    broker.start()
+    # Subscribe before the snapshot so no change falls between the two
+    sub = broker.subscribe(ids, bbox)
+    try:
+        snapshot = await run_in_threadpool(broker.snapshot, ids, bbox)
+    except BaseException:
+        broker.unsubscribe(sub)
+        raise
+
+    async def events():
+        try:
+            yield encode_event(broker.sequence, snapshot)
+            while not await request.is_disconnected():
+                counts = await sub.next(timeout=HEARTBEAT_SECONDS)
+                yield encode_event(broker.sequence, counts) if counts else ": ping\n\n"
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field
+import re
+
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from pydantic import StringConstraints
 from typing_extensions import Annotated, Literal
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # ======================
@@ -51,6 +53,31 @@ class ParkingZoneResponse(BaseModel):
         from_attributes = True
 
 
+class NearbyZoneResponse(ParkingZoneResponse):
+    # Free slots per vehicle type, counting only slots that match the
+    # search filters; types with none are left out
+    free_slots_by_type: Dict[str, int]
+
+
+class RankedZoneResponse(ParkingZoneResponse):
+    vehicle_type: str
+    # Free slots and lowest hourly price for vehicle_type
+    free_slots: int
+    min_price_per_hour: float
+    distance_km: float
+    occupancy_rate: float
+    # 0-100, higher is better; see app/ranking.py
+    score: float
+
+
+class ZoneNameResponse(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
 class AvailabilityUpdate(BaseModel):
     available_slots: int = Field(..., ge=0)
 
@@ -80,6 +107,47 @@ class ParkingSlotResponse(BaseModel):
         from_attributes = True
 
 
+# "A1-A500", "B001-B120", "12-40": shared prefix, inclusive number range
+SLOT_RANGE_PATTERN = re.compile(r"^([A-Za-z]*)(\d+)-([A-Za-z]*)(\d+)$")
+
+
+class ParkingSlotRangeCreate(BaseModel):
+    slot_range: str = Field(..., examples=["A1-A500"])
+    vehicle_type: Literal["car", "bike", "truck"]
+    price_per_hour: float = Field(default=20.0, gt=0)
+
+    @field_validator("slot_range")
+    @classmethod
+    def check_range(cls, value: str) -> str:
+        match = SLOT_RANGE_PATTERN.match(value.strip())
+        if not match:
+            raise ValueError("Range must look like A1-A500")
+
+        prefix, start, end_prefix, end = match.groups()
+        if prefix != end_prefix:
+            raise ValueError("Both ends of a range need the same prefix")
+        if int(end) < int(start):
+            raise ValueError("Range end must not be before its start")
+        if len(prefix) + len(end) > 10:
+            raise ValueError("Slot numbers are limited to 10 characters")
+        return value.strip()
+
+    def size(self) -> int:
+        _, start, _, end = SLOT_RANGE_PATTERN.match(self.slot_range).groups()
+        return int(end) - int(start) + 1
+
+    def slot_numbers(self) -> List[str]:
+        """Expand the range; zero padding of the start number is kept (A001-A120)."""
+        prefix, start, _, end = SLOT_RANGE_PATTERN.match(self.slot_range).groups()
+        width = len(start) if start.startswith("0") else 0
+        return [f"{prefix}{n:0{width}d}" for n in range(int(start), int(end) + 1)]
+
+
+class ParkingSlotBulkCreate(BaseModel):
+    slots: List[ParkingSlotCreate] = []
+    ranges: List[ParkingSlotRangeCreate] = []
+
+
 # ======================
 # BOOKING SCHEMAS
 # ======================
@@ -160,4 +228,42 @@ class DriverStatsResponse(BaseModel):
     completed_bookings: int
     cancelled_bookings: int
     total_amount_spent: float
-    total_hours_parked: int
\ No newline at end of file
+    total_hours_parked: int
+
+
+# ======================
+# CHANGE FEED SCHEMAS
+# ======================
+class ZoneChange(ParkingZoneResponse):
+    version: int
+
+
+class SlotChange(ParkingSlotResponse):
+    version: int
+
+
+class ZoneChangesResponse(BaseModel):
+    # Pass as `since` on the next call
+    version: int
+    # More changes after `version`; call again right away
+    has_more: bool
+    zones: List[ZoneChange]
+    slots: List[SlotChange]
+    deleted_slots: List[int]
+
+
+# ======================
+# ANALYTICS SCHEMAS
+# ======================
+class OccupancySeriesResponse(BaseModel):
+    zone_id: int
+    zone_name: str
+    total_slots: int
+    # Events after this are not in the series yet
+    folded_until: Optional[datetime]
+    # Parallel arrays, one entry per UTC hour
+    hours: List[datetime]
+    average_occupied: List[float]
+    occupancy_rate: List[float]
+    turnover: List[int]
+    revenue: List[float]
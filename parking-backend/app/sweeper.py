@@ -0,0 +1,225 @@
+# app/sweeper.py
+#
+# Background expiry of overdue bookings. Bookings stay "active" until the
+# driver checks out; once end_time has passed the sweeper completes them so
+# the slot and the zone's available_slots count come back.
+#
+# Each batch is three set-based UPDATEs in one transaction (bookings ->
+# slots -> zones), all conditional, so a driver completing or cancelling
+# at the same moment can't double-release a slot. Freed slots are logged
+# as release events (app/analytics.py) in the same transaction.
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.allocator import slot_allocator
+from app.analytics import event, record_events
+from app.database import SessionLocal
+from app.deps import Principal, require_admin
+from app.realtime import zones_changed
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL_SECONDS = float(os.getenv("PARKING_SWEEP_INTERVAL", "30"))
+SWEEP_BATCH_SIZE = int(os.getenv("PARKING_SWEEP_BATCH_SIZE", "500"))
+
+
+@dataclass
+class SweepMetrics:
+    """Counters for the last and all sweeps; lag is how overdue the oldest
+    expired booking was when the sweep released it."""
+    runs: int = 0
+    bookings_expired: int = 0
+    slots_freed: int = 0
+    last_run_at: Optional[datetime] = None
+    last_duration_ms: float = 0.0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    last_batch_sizes: List[int] = field(default_factory=list)
+    max_batch_size: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "bookings_expired": self.bookings_expired,
+            "slots_freed": self.slots_freed,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": round(self.last_duration_ms, 2),
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "last_batch_sizes": self.last_batch_sizes,
+            "max_batch_size": self.max_batch_size,
+            "errors": self.errors,
+            "interval_seconds": SWEEP_INTERVAL_SECONDS,
+            "batch_limit": SWEEP_BATCH_SIZE
+        }
+
+
+sweep_metrics = SweepMetrics()
+
+
+# ======================
+# ONE BATCH
+# ======================
+def expire_batch(db: Session, now: datetime, batch_size: int = SWEEP_BATCH_SIZE):
+    """
+    Complete up to batch_size bookings whose end_time <= now, oldest first.
+    Returns (expired booking rows, freed slot rows); committed.
+    """
+    booking = models.Booking
+    slot = models.ParkingSlot
+    zone = models.ParkingZone
+
+    # Index range scan on (status, end_time)
+    overdue = select(booking.id).where(
+        booking.status == "active",
+        booking.end_time <= now
+    ).order_by(booking.end_time).limit(batch_size)
+
+    expired = db.execute(
+        update(booking).where(
+            booking.id.in_(overdue),
+            booking.status == "active"
+        ).values(status="completed").returning(
+            booking.id, booking.slot_id, booking.end_time
+        ),
+        execution_options={"synchronize_session": False}
+    ).all()
+
+    if not expired:
+        db.rollback()
+        return [], []
+
+    # Only slots still occupied are freed, and only those give a zone a slot back
+    freed = db.execute(
+        update(slot).where(
+            slot.id.in_([row.slot_id for row in expired]),
+            slot.status == "occupied"
+        ).values(status="available").returning(
+            slot.id, slot.zone_id, slot.vehicle_type
+        ),
+        execution_options={"synchronize_session": False}
+    ).all()
+
+    booking_of_slot = {row.slot_id: row.id for row in expired}
+    record_events(db, [event("release", row.zone_id, row.id, booking_of_slot[row.id]) for row in freed])
+
+    per_zone = Counter(row.zone_id for row in freed)
+    if per_zone:
+        db.execute(
+            update(zone).where(zone.id.in_(per_zone)).values(
+                available_slots=func.min(
+                    zone.total_slots,
+                    zone.available_slots + case(per_zone, value=zone.id, else_=0)
+                )
+            ),
+            execution_options={"synchronize_session": False}
+        )
+
+    db.commit()
+
+    for row in freed:
+        slot_allocator.release(row.zone_id, row.id, row.vehicle_type)
+    if per_zone:
+        zones_changed(*per_zone)
+
+    return expired, freed
+
+
+def sweep_expired(session_factory: Callable = SessionLocal, now: Optional[datetime] = None,
+                  batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Expire everything overdue, batch by batch. Returns bookings expired."""
+    now = now or datetime.utcnow()
+    started = time.perf_counter()
+    batches, freed_total, lag = [], 0, 0.0
+
+    db = session_factory()
+    try:
+        while True:
+            expired, freed = expire_batch(db, now, batch_size)
+            if not expired:
+                break
+            if not batches:
+                # Batches run oldest first: the first row is the most overdue
+                lag = (now - min(row.end_time for row in expired)).total_seconds()
+            batches.append(len(expired))
+            freed_total += len(freed)
+            if len(expired) < batch_size:
+                break
+    finally:
+        db.close()
+
+    m = sweep_metrics
+    m.runs += 1
+    m.bookings_expired += sum(batches)
+    m.slots_freed += freed_total
+    m.last_run_at = now
+    m.last_duration_ms = (time.perf_counter() - started) * 1000
+    m.last_lag_seconds = lag
+    m.max_lag_seconds = max(m.max_lag_seconds, lag)
+    m.last_batch_sizes = batches
+    m.max_batch_size = max([m.max_batch_size, *batches])
+
+    if batches:
+        logger.info("Expired %d bookings in %d batches (lag %.1fs)", sum(batches), len(batches), lag)
+    return sum(batches)
+
+
+# ======================
+# SCHEDULER
+# ======================
+class ExpirySweeper:
+    def __init__(self, interval: float = SWEEP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        while True:
+            try:
+                # Blocking DB work: keep it off the event loop
+                await run_in_threadpool(sweep_expired)
+            except Exception:
+                sweep_metrics.errors += 1
+                logger.exception("Expiry sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+expiry_sweeper = ExpirySweeper()
+
+
+# ======================
+# METRICS ENDPOINT
+# ======================
+router = APIRouter(prefix="/parking", tags=["Maintenance"])
+
+
+@router.get("/admin/sweeper/stats")
+async def get_sweeper_stats(admin: Principal = Depends(require_admin)):
+    """Expiry sweeper counters: batch sizes, lag, totals."""
+    return sweep_metrics.as_dict()
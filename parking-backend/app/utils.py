@@ -1,5 +1,63 @@
 import math
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Radius of Earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(
+    lat: float,
+    lon: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float]
+) -> np.ndarray:
+    """
+    Distance in kilometers from one origin to many points, in one NumPy pass.
+    Results are not rounded.
+    """
+    lat1 = math.radians(lat)
+    lon1 = math.radians(lon)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon2 = np.radians(np.asarray(longitudes, dtype=np.float64))
+
+    # Haversine formula
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def nearest_within(
+    lat: float,
+    lon: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    radius_km: Optional[float] = None,
+    k: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank points by distance from (lat, lon).
+    Keeps only points within radius_km (if given) and the k closest (if given).
+    Returns (indices, distances), closest first; indices refer to the input arrays.
+    """
+    distances = haversine_km(lat, lon, latitudes, longitudes)
+    indices = np.arange(distances.size)
+
+    if radius_km is not None:
+        inside = distances <= radius_km
+        indices = indices[inside]
+        distances = distances[inside]
+
+    # Partial sort: only the k closest get fully ordered
+    if k is not None and k < distances.size:
+        top = np.argpartition(distances, k - 1)[:k]
+        indices = indices[top]
+        distances = distances[top]
+
+    order = np.lexsort((indices, distances))
+    return indices[order], distances[order]
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -7,27 +65,38 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Calculate distance between two coordinates using Haversine formula.
     Returns distance in kilometers.
     """
-    # Radius of Earth in kilometers
-    R = 6371.0
+    distance = haversine_km(lat1, lon1, (lat2,), (lon2,))[0]
+    return round(float(distance), 2)
 
-    # Convert degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
 
-    # Differences
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
+def validate_coordinates(latitude: float, longitude: float) -> bool:
+    """Validate if coordinates are within valid range"""
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
 
-    # Haversine formula
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
-    distance = R * c
-    return round(distance, 2)
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Smallest lat/lon box that contains every point within radius_km.
+    Returns (min_lat, max_lat, min_lon, max_lon). Used as an indexed SQL
+    prefilter before the exact Haversine check.
+    """
+    # Angular radius of the search circle
+    angular = radius_km / EARTH_RADIUS_KM
+    lat_rad = math.radians(latitude)
 
+    min_lat = math.degrees(lat_rad - angular)
+    max_lat = math.degrees(lat_rad + angular)
 
-def validate_coordinates(latitude: float, longitude: float) -> bool:
-    """Validate if coordinates are within valid range"""
-    return -90 <= latitude <= 90 and -180 <= longitude <= 180
\ No newline at end of file
+    # Circle covers a pole: every longitude is inside
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(lat_rad))))
+    min_lon = longitude - dlon
+    max_lon = longitude + dlon
+
+    # Box crosses the antimeridian: fall back to the full longitude range
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, min_lon, max_lon
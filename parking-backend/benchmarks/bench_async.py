@@ -0,0 +1,112 @@
+# benchmarks/bench_async.py
+#
+# Requests/s and latency percentiles of the sync (threadpool) and async
+# (aiosqlite) stacks. Each mode runs in its own uvicorn process on a fresh
+# database; concurrent clients hit read endpoints for a fixed duration.
+#   python -m benchmarks.bench_async --clients 64 --duration 10
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_ready(client):
+    for _ in range(100):
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def seed(client, zones):
+    async def token(email, role):
+        await client.post("/auth/register", json={
+            "name": role, "email": email, "password": "secret123", "role": role
+        })
+        r = await client.post("/auth/login", json={"email": email, "password": "secret123"})
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    for i in range(zones):
+        admin = await token(f"admin{i}@example.com", "admin")
+        await client.post("/parking/zones", headers=admin, json={
+            "name": f"Zone {i}", "total_slots": 20,
+            "latitude": 13.08 + random.uniform(-0.05, 0.05),
+            "longitude": 80.27 + random.uniform(-0.05, 0.05)
+        })
+    return await token("driver@example.com", "driver")
+
+
+async def drive(base_url, clients, duration, zones):
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_ready(client)
+        headers = await seed(client, zones)
+        paths = [
+            "/parking/zones",
+            "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5",
+            "/parking/bookings/history",
+            "/parking/profile/stats",
+        ]
+
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                r = await client.get(random.choice(paths), headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += r.status_code >= 400
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        return len(latencies) / elapsed, latencies, errors
+
+
+def run_mode(mode, port, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PARKING_DB_MODE=mode, PYTHONPATH=BACKEND_DIR)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=tmp, env=env
+        )
+        try:
+            return asyncio.run(drive(f"http://127.0.0.1:{port}", args.clients, args.duration, args.zones))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per mode")
+    print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in ("sync", "async"):
+        rps, latencies, errors = run_mode(mode, args.port, args)
+        print(f"{mode:<6} {rps:>8.0f} {percentile(latencies, 50):>8.1f} "
+              f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_auth.py
+#
+# Per-request cost of resolving the authenticated user: the previous
+# decode + SELECT users on every request vs. the principal cache, plus the
+# claims-only rejection of a wrong-role token.
+#   python -m benchmarks.bench_auth --users 10000 --requests 20000
+
+import argparse
+import random
+
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import insert
+
+from app import models
+from app.auth import create_access_token
+from app.deps import (
+    ALGORITHM, SECRET_KEY, get_current_user, get_token_claims,
+    principal_cache, require_admin, _admin_claims
+)
+from benchmarks.common import temp_session, timeit
+
+
+def seed(db, users):
+    db.execute(insert(models.User), [
+        {"name": f"user{i}", "email": f"user{i}@example.com", "password": "x",
+         "role": "admin" if i % 10 == 0 else "driver"}
+        for i in range(users)
+    ])
+    db.commit()
+
+
+def old_current_user(token, db):
+    """The previous implementation: decode, then look the user up every time."""
+    email = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"]
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def new_current_user(token, db):
+    return get_current_user(get_token_claims(token), db)
+
+
+def new_admin_check(token, db):
+    claims = get_token_claims(token)
+    try:
+        require_admin(_admin_claims(claims), get_current_user(claims, db))
+    except HTTPException:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--active", type=int, default=500, help="distinct users sending requests")
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        seed(db, args.users)
+
+        tokens = [
+            create_access_token({
+                "sub": f"user{i}@example.com",
+                "role": "admin" if i % 10 == 0 else "driver"
+            })
+            for i in range(args.active)
+        ]
+        stream = [random.choice(tokens) for _ in range(args.requests)]
+        driver_tokens = [t for i, t in enumerate(tokens) if i % 10]
+
+        def run(fn, batch):
+            def go():
+                for token in batch:
+                    fn(token, db)
+                    db.expunge_all()
+            return go
+
+        principal_cache.clear()
+        rows = [
+            ("decode + SELECT per request", run(old_current_user, stream)),
+            ("principal cache", run(new_current_user, stream)),
+            ("require_admin, driver token", run(new_admin_check, driver_tokens * 10)),
+        ]
+
+        print(f"{args.requests} requests from {args.active} users ({args.users} in table)")
+        for label, fn in rows:
+            median, p95 = timeit(fn, repeat=5)
+            n = len(driver_tokens) * 10 if label.startswith("require") else args.requests
+            print(f"  {label:<32} {median * 1000 / n:8.1f} us/request   (p95 run {p95:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/bench_best_zone.py
+#
+# GET /parking/zones/best on a large city: the endpoint (indexed bounding
+# box, zone_slot_summary for prices, NumPy scoring, top k by partial sort)
+# vs the naive query (every zone joined to its slots and grouped for the
+# lowest price, all scored in Python and fully sorted).
+#   python -m benchmarks.bench_best_zone --zones 100000 --slots-per-zone 8
+#
+# Slots are inserted before the migrations run, so the summary comes from
+# the backfill; the write cost of its triggers is timed separately.
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import case, func, insert, update
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import get_best_zones
+from app.queries import in_box
+from app.ranking import FREE_SLOTS_ENOUGH, RANKING_WEIGHTS
+from app.utils import bounding_box, haversine_km, nearest_within
+from benchmarks.common import temp_session, timeit
+
+USER = SimpleNamespace(id=1, role="driver")
+TYPES = ("car", "car", "bike", "truck")
+
+
+def seed(db, zones, slots_per_zone):
+    """Zones spread over roughly 110 x 110 km around (13.0, 80.0)."""
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0 + random.uniform(-0.5, 0.5),
+         "longitude": 80.0 + random.uniform(-0.5, 0.5),
+         "total_slots": slots_per_zone, "available_slots": random.randint(0, slots_per_zone),
+         "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    for first in range(0, zones, 10000):
+        db.execute(insert(models.ParkingSlot), [
+            {"slot_number": f"S{n}", "vehicle_type": TYPES[n % len(TYPES)],
+             "status": random.choice(("available", "occupied")),
+             "price_per_hour": random.choice((10.0, 15.0, 20.0, 30.0)), "zone_id": zone_id}
+            for zone_id in range(first + 1, min(first + 10000, zones) + 1)
+            for n in range(slots_per_zone)
+        ])
+    db.commit()
+
+
+def naive_best(db, lat, lon, radius_km, vehicle_type, k):
+    """No prefilter, no summary: group slots per request, score in Python, sort everything."""
+    slot = models.ParkingSlot
+    rows = db.query(
+        models.ParkingZone, func.min(slot.price_per_hour),
+        func.sum(case((slot.status == "available", 1), else_=0))
+    ).join(slot, slot.zone_id == models.ParkingZone.id).filter(
+        slot.vehicle_type == vehicle_type
+    ).group_by(models.ParkingZone.id).all()
+
+    candidates = []
+    for zone, price, free in rows:
+        distance = float(haversine_km(lat, lon, (zone.latitude,), (zone.longitude,))[0])
+        if distance <= radius_km and free and zone.available_slots > 0:
+            candidates.append((zone, price, free, distance))
+    if not candidates:
+        return []
+
+    prices = [c[1] for c in candidates]
+    low, high = min(prices), max(prices)
+    scored = []
+    for zone, price, free, distance in candidates:
+        cost = (
+            RANKING_WEIGHTS["distance"] * distance / radius_km
+            + RANKING_WEIGHTS["price"] * ((price - low) / (high - low) if high > low else 0)
+            + RANKING_WEIGHTS["occupancy"] * (1 - zone.available_slots / zone.total_slots)
+            + RANKING_WEIGHTS["scarcity"] * (1 - min(free, FREE_SLOTS_ENOUGH) / FREE_SLOTS_ENOUGH)
+        )
+        scored.append(((1 - cost) * 100, zone))
+    scored.sort(key=lambda s: -s[0])
+    return scored[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=100000)
+    parser.add_argument("--slots-per-zone", type=int, default=8)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        started = time.perf_counter()
+        seed(db, args.zones, args.slots_per_zone)
+        seeded = time.perf_counter()
+        run_migrations(db.get_bind())
+        backfilled = time.perf_counter()
+        summary_rows = db.query(func.count()).select_from(models.ZoneSlotSummary).scalar()
+        print(f"{args.zones:,} zones, {args.zones * args.slots_per_zone:,} slots: "
+              f"seeded in {seeded - started:.1f}s, summary backfill ({summary_rows:,} rows) "
+              f"in {backfilled - seeded:.1f}s")
+
+        print(f"  {'radius':>7} {'type':<6} {'in radius':>11} {'best ms':>8} {'naive ms':>9}  same top {args.k} scores")
+        for radius_km in (1, 2, 5, 10, 25):
+            for vehicle_type in ("car", "truck"):
+                def best():
+                    return get_best_zones(latitude=13.0, longitude=80.0, radius_km=radius_km,
+                                          vehicle_type=vehicle_type, k=args.k, db=db, current_user=USER)
+
+                ranked = best()
+                best_ms, _ = timeit(best)
+                naive = naive_best(db, 13.0, 80.0, radius_km, vehicle_type, args.k)
+                naive_ms, _ = timeit(lambda: naive_best(db, 13.0, 80.0, radius_km, vehicle_type, args.k), repeat=3)
+                db.expunge_all()
+
+                box = in_box(db.query(models.ParkingZone.latitude, models.ParkingZone.longitude),
+                             bounding_box(13.0, 80.0, radius_km)).all()
+                candidates = len(nearest_within(13.0, 80.0, [z.latitude for z in box],
+                                                [z.longitude for z in box], radius_km=radius_km)[0])
+                # Ids can differ on ties; the scores must not
+                same = len(ranked) == len(naive) and all(
+                    abs(z["score"] - score) <= 0.01 for z, (score, _) in zip(ranked, naive))
+                print(f"  {radius_km:>5} km {vehicle_type:<6} {candidates:>11,} {best_ms:>8.2f} {naive_ms:>9.1f}  {same}")
+
+        # The summary's write cost: what the triggers add to a booking's status flip
+        slot_ids = [random.randint(1, args.zones * args.slots_per_zone) for _ in range(2000)]
+
+        def flip():
+            started = time.perf_counter()
+            for slot_id in slot_ids:
+                db.execute(update(models.ParkingSlot).where(models.ParkingSlot.id == slot_id)
+                           .values(status=random.choice(("available", "occupied"))))
+            db.commit()
+            return (time.perf_counter() - started) / len(slot_ids) * 1e6
+
+        flip()  # warm the page cache
+        with_triggers = flip()
+        for name in ("insert", "status", "move", "delete"):
+            db.connection().exec_driver_sql(f"DROP TRIGGER parking_slots_summary_{name}")
+        without = flip()
+        print(f"  slot status update: {with_triggers:.1f} µs with summary triggers, {without:.1f} µs without")
+
+
+if __name__ == "__main__":
+    main()
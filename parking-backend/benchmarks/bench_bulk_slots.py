@@ -0,0 +1,69 @@
+# benchmarks/bench_bulk_slots.py
+#
+# Time to add 10k slots to a zone: one bulk request (ranges, one
+# executemany) vs. create_single_slot once per slot.
+#   python -m benchmarks.bench_bulk_slots --slots 10000 --single 1000
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from app import models, schemas
+from app.parking import create_single_slot, create_slots_bulk
+from benchmarks.common import temp_session
+
+ADMIN = SimpleNamespace(id=1, role="admin")
+
+
+def new_zone(db):
+    zone = models.ParkingZone(
+        name="Garage", latitude=13.0, longitude=80.0,
+        total_slots=0, available_slots=0, admin_id=ADMIN.id
+    )
+    db.add(zone)
+    db.commit()
+    return zone.id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slots", type=int, default=10000)
+    parser.add_argument("--single", type=int, default=1000,
+                        help="single-slot calls to time (extrapolated to --slots)")
+    args = parser.parse_args()
+
+    rows_per_letter = 1000
+    ranges = [
+        schemas.ParkingSlotRangeCreate(
+            slot_range=f"{chr(65 + i)}1-{chr(65 + i)}{min(rows_per_letter, args.slots - i * rows_per_letter)}",
+            vehicle_type="car"
+        )
+        for i in range((args.slots + rows_per_letter - 1) // rows_per_letter)
+    ]
+
+    with temp_session() as db:
+        zone_id = new_zone(db)
+        start = time.perf_counter()
+        result = create_slots_bulk(zone_id, schemas.ParkingSlotBulkCreate(ranges=ranges), db, ADMIN)
+        bulk_s = time.perf_counter() - start
+        assert result["slots_created"] == args.slots
+
+    with temp_session() as db:
+        zone_id = new_zone(db)
+        start = time.perf_counter()
+        for i in range(args.single):
+            create_single_slot(
+                zone_id,
+                schemas.ParkingSlotCreate(slot_number=f"S{i}", vehicle_type="car"),
+                db, ADMIN
+            )
+        single_s = (time.perf_counter() - start) * args.slots / args.single
+
+    print(f"{args.slots} slots")
+    print(f"  bulk endpoint          {bulk_s * 1000:10.0f} ms")
+    print(f"  create_single_slot x N {single_s * 1000:10.0f} ms  (from {args.single} calls)")
+    print(f"  speedup                {single_s / bulk_s:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_distance.py
+#
+# Scalar calculate_distance loop vs one batched NumPy pass.
+#   python -m benchmarks.bench_distance --sizes 100 1000 10000 100000
+
+import argparse
+import math
+import random
+
+import numpy as np
+
+from app.utils import calculate_distance, nearest_within
+from benchmarks.common import timeit
+
+ORIGIN = (13.0827, 80.2707)
+
+
+def scalar_math(lat1, lon1, lat2, lon2):
+    """The previous pure-`math` implementation of calculate_distance."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return round(6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--radius", type=float, default=5.0)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'math loop ms':>13} {'wrapper loop ms':>16} {'batch ms':>9} {'batch top-k ms':>15}")
+    for size in args.sizes:
+        lats = [ORIGIN[0] + random.uniform(-0.5, 0.5) for _ in range(size)]
+        lons = [ORIGIN[1] + random.uniform(-0.5, 0.5) for _ in range(size)]
+        lat_arr, lon_arr = np.array(lats), np.array(lons)
+        repeat = 5 if size >= 100_000 else 20
+
+        def math_loop():
+            return [p for p in zip(lats, lons) if scalar_math(*ORIGIN, *p) <= args.radius]
+
+        def wrapper_loop():
+            return [p for p in zip(lats, lons) if calculate_distance(*ORIGIN, *p) <= args.radius]
+
+        def batch():
+            return nearest_within(*ORIGIN, lat_arr, lon_arr, radius_km=args.radius)
+
+        def batch_top_k():
+            return nearest_within(*ORIGIN, lat_arr, lon_arr, radius_km=args.radius, k=args.k)
+
+        print(
+            f"{size:>8} {timeit(math_loop, repeat)[0]:>13.2f} {timeit(wrapper_loop, repeat)[0]:>16.2f} "
+            f"{timeit(batch, repeat)[0]:>9.3f} {timeit(batch_top_k, repeat)[0]:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_fast_json.py
+#
+# ORM + response_model vs the PARKING_FAST_JSON path (column-only rows
+# encoded by orjson) on list endpoints returning 1k-10k rows. Each setting
+# runs in a fresh process (the flag is read at import), alternating for
+# --rounds rounds, best median kept. The bodies of both runs are compared
+# so a speedup can't come from a different response.
+#   python -m benchmarks.bench_fast_json --sizes 1000 5000 10000 --rounds 3
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Zone 1 gets `size` slots; `size` zones sit within 5 km of the query point
+PATHS = {
+    "GET /parking/zones/{id}/slots": "/parking/zones/1/slots",
+    "GET /parking/zones/nearby": "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5",
+}
+
+
+def child(size: int, requests: int) -> dict:
+    """Runs inside the subprocess: seed, warm up, time each path."""
+    import asyncio
+
+    import httpx
+    from sqlalchemy import insert
+
+    from app import models
+    from app.auth import create_access_token
+    from app.database import SessionLocal
+    from app.main import app
+
+    db = SessionLocal()
+    db.execute(insert(models.User), [
+        {"name": "admin", "email": "admin@example.com", "password": "x", "role": "admin"},
+    ])
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.08 + (i % 100) * 0.0003, "longitude": 80.27 + (i // 100) * 0.0003,
+         "total_slots": size if i == 0 else 0, "available_slots": size if i == 0 else 0, "admin_id": 1}
+        for i in range(size)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{n}", "vehicle_type": ("car", "bike", "truck")[n % 3],
+         "status": "available", "price_per_hour": 10 + n % 7 * 2.5, "zone_id": 1}
+        for n in range(size)
+    ])
+    db.commit()
+    db.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'admin@example.com', 'role': 'admin'})}"}
+
+    async def run():
+        await app.router.startup()
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, path in PATHS.items():
+                r = await client.get(path, headers=headers)
+                assert r.status_code == 200, r.text
+                assert len(r.json()) == size, (label, len(r.json()))
+                for _ in range(5):
+                    await client.get(path, headers=headers)
+                samples = []
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    r = await client.get(path, headers=headers)
+                    samples.append((time.perf_counter() - start) * 1e3)
+                results[label] = {
+                    "ms": statistics.median(samples),
+                    "bytes": len(r.content),
+                    "sha1": hashlib.sha1(r.content).hexdigest(),
+                }
+        await app.router.shutdown()
+        return results
+
+    return asyncio.run(run())
+
+
+def run_child(fast: bool, size: int, requests: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PARKING_FAST_JSON="1" if fast else "0",
+                   PARKING_SWEEP_INTERVAL="0", PARKING_METRICS="0")
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_fast_json", "--child",
+             "--sizes", str(size), "--requests", str(requests)],
+            cwd=tmp, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000], help="rows per response")
+    parser.add_argument("--requests", type=int, default=30, help="timed requests per path")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.sizes[0], args.requests)))
+        return
+
+    print(f"median per request, {args.requests} requests, best of {args.rounds} rounds, in-process ASGI (ms)")
+    print(f"  {'path':<32} {'rows':>6} {'KiB':>6} {'orm':>8} {'fast':>8} {'speedup':>8}")
+    for size in args.sizes:
+        orm, fast = {}, {}
+        for _ in range(args.rounds):
+            for flag, best in ((False, orm), (True, fast)):
+                for label, result in run_child(flag, size, args.requests).items():
+                    if label not in best or result["ms"] < best[label]["ms"]:
+                        best[label] = result
+
+        for label in PATHS:
+            same = "" if orm[label]["sha1"] == fast[label]["sha1"] else "  BODY DIFFERS"
+            print(f"  {label:<32} {size:>6} {orm[label]['bytes'] / 1024:>6.0f} {orm[label]['ms']:>8.2f} "
+                  f"{fast[label]['ms']:>8.2f} {orm[label]['ms'] / fast[label]['ms']:>7.1f}x{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# benchmarks/bench_metrics_overhead.py
+#
+# Cost of the metrics middleware and cursor hooks per request. The same
+# requests run through the ASGI app in fresh processes with PARKING_METRICS
+# off and on, alternating for --rounds rounds (best median kept, so drift
+# on a busy machine doesn't count as overhead). The middleware and hooks
+# are also timed on their own, which is the overhead without the noise of
+# a full request. Also times a /metrics scrape.
+#   python -m benchmarks.bench_metrics_overhead --requests 2000 --rounds 3
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATHS = {
+    "GET /parking/zones/nearby (1 query)": "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5",
+    "GET /parking/bookings/history (1 query)": "/parking/bookings/history?limit=20",
+    "GET /parking/zones/{id}/slots/stats (2 queries)": "/parking/zones/1/slots/stats",
+}
+
+
+def child(requests: int) -> dict:
+    """Runs inside the subprocess: seed, warm up, time each path."""
+    import asyncio
+    from datetime import datetime, timedelta
+
+    import httpx
+    from sqlalchemy import insert
+
+    from app import models
+    from app.auth import create_access_token
+    from app.database import METRICS_ENABLED, SessionLocal
+    from app.main import app
+
+    db = SessionLocal()
+    db.execute(insert(models.User), [
+        {"name": "admin", "email": "admin@example.com", "password": "x", "role": "admin"},
+        {"name": "driver", "email": "driver@example.com", "password": "x", "role": "driver"},
+    ])
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.08 + i * 0.001, "longitude": 80.27,
+         "total_slots": 20, "available_slots": 20, "admin_id": 1}
+        for i in range(50)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{n}", "vehicle_type": "car", "status": "available",
+         "price_per_hour": 10, "zone_id": 1}
+        for n in range(20)
+    ])
+    now = datetime.utcnow()
+    db.execute(insert(models.Booking), [
+        {"user_id": 2, "zone_id": 1, "slot_id": 1, "start_time": now - timedelta(hours=n),
+         "end_time": now - timedelta(hours=n - 1), "duration_hours": 1,
+         "amount_paid": 10.0, "status": "completed"}
+        for n in range(100)
+    ])
+    db.commit()
+    db.close()
+
+    tokens = {
+        role: {"Authorization": f"Bearer {create_access_token({'sub': f'{role}@example.com', 'role': role})}"}
+        for role in ("admin", "driver")
+    }
+
+    async def run():
+        await app.router.startup()
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, path in PATHS.items():
+                headers = tokens["admin" if "slots" in path else "driver"]
+                for _ in range(200):
+                    await client.get(path, headers=headers)
+                samples = []
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    r = await client.get(path, headers=headers)
+                    samples.append((time.perf_counter() - start) * 1e6)
+                    assert r.status_code == 200, r.text
+                results[label] = statistics.median(samples)
+
+            if METRICS_ENABLED:
+                samples = []
+                for _ in range(200):
+                    start = time.perf_counter()
+                    await client.get("/metrics")
+                    samples.append((time.perf_counter() - start) * 1e6)
+                results["GET /metrics (scrape)"] = statistics.median(samples)
+        await app.router.shutdown()
+
+        if METRICS_ENABLED:
+            results.update(await isolated(requests * 10))
+        return results
+
+    return asyncio.run(run())
+
+
+async def isolated(calls: int) -> dict:
+    """The middleware around a no-op ASGI app, and one statement's hooks."""
+    from types import SimpleNamespace
+
+    from app.database import _after_cursor_execute, _before_cursor_execute
+    from app.metrics import MetricsMiddleware
+
+    route = SimpleNamespace(path="/parking/zones/{zone_id}/slots")
+
+    async def noop(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def drop(message):
+        pass
+
+    async def per_call(app):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app({"type": "http", "method": "GET"}, None, drop)
+        return (time.perf_counter() - start) / calls * 1e6
+
+    wrapped = MetricsMiddleware(noop)
+    bare_us, wrapped_us = await per_call(noop), await per_call(wrapped)
+
+    conn = SimpleNamespace(info={})
+    start = time.perf_counter()
+    for _ in range(calls):
+        _before_cursor_execute(conn, None, "", (), None, False)
+        _after_cursor_execute(conn, None, "", (), None, False)
+    hooks_us = (time.perf_counter() - start) / calls * 1e6
+
+    return {"middleware only": wrapped_us - bare_us, "cursor hooks per statement": hooks_us}
+
+
+def run_child(metrics: bool, requests: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PARKING_METRICS="1" if metrics else "0",
+                   PARKING_SWEEP_INTERVAL="0")
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_metrics_overhead", "--child", "--requests", str(requests)],
+            cwd=tmp, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests per path")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.requests)))
+        return
+
+    off, on = {}, {}
+    for _ in range(args.rounds):
+        for metrics, best in ((False, off), (True, on)):
+            for label, us in run_child(metrics, args.requests).items():
+                best[label] = min(best.get(label, us), us)
+
+    print(f"median per request, {args.requests} requests, best of {args.rounds} rounds, in-process ASGI (µs)")
+    print(f"  {'path':<48} {'off':>8} {'on':>8} {'overhead':>9}")
+    for label in PATHS:
+        delta = on[label] - off[label]
+        print(f"  {label:<48} {off[label]:>8.0f} {on[label]:>8.0f} {delta:>+6.0f} ({delta / off[label] * 100:+.1f}%)")
+    print(f"  {'GET /metrics (scrape)':<48} {'':>8} {on['GET /metrics (scrape)']:>8.0f}")
+    print("isolated (µs)")
+    for label in ("middleware only", "cursor hooks per statement"):
+        print(f"  {label:<48} {on[label]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
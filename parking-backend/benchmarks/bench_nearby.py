@@ -0,0 +1,90 @@
+# benchmarks/bench_nearby.py
+#
+# Latency of /parking/zones/nearby against zone count.
+#   python -m benchmarks.bench_nearby --sizes 1000 10000 100000 1000000
+#
+# Zones are spread evenly, so a bigger city also means more zones within
+# the radius; the R*Tree reads only those, so the cost per zone found
+# should stay flat as the total grows.
+
+import argparse
+import random
+
+from sqlalchemy import insert
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import get_nearby_zones
+from app.utils import calculate_distance
+from benchmarks.common import temp_session, timeit
+
+# Zones spread over a ~110 km square around a city centre
+CENTER = (13.0827, 80.2707)
+SPREAD_DEG = 0.5
+
+
+def seed_zones(db, count):
+    rows = [
+        {
+            "name": f"Zone {i}",
+            "latitude": CENTER[0] + random.uniform(-SPREAD_DEG, SPREAD_DEG),
+            "longitude": CENTER[1] + random.uniform(-SPREAD_DEG, SPREAD_DEG),
+            "total_slots": 50,
+            "available_slots": 50,
+            "admin_id": 1,
+        }
+        for i in range(count)
+    ]
+    db.execute(insert(models.ParkingZone), rows)
+    db.commit()
+
+
+def full_scan(db, latitude, longitude, radius_km):
+    """The previous implementation: load everything, haversine twice."""
+    zones = [
+        z for z in db.query(models.ParkingZone).all()
+        if calculate_distance(latitude, longitude, z.latitude, z.longitude) <= radius_km
+    ]
+    zones.sort(key=lambda z: calculate_distance(latitude, longitude, z.latitude, z.longitude))
+    return zones
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--radius", type=float, default=5.0)
+    parser.add_argument("--scan-limit", type=int, default=100_000,
+                        help="skip the full-scan baseline above this size")
+    args = parser.parse_args()
+
+    print(f"{'zones':>10} {'found':>7} {'indexed ms':>11} {'µs/found':>9} {'full scan ms':>13}")
+    for size in args.sizes:
+        with temp_session() as db:
+            seed_zones(db, size)
+            run_migrations(db.get_bind())  # R*Tree, filled from the seeded zones
+
+            def indexed():
+                db.expunge_all()
+                return get_nearby_zones(
+                    latitude=CENTER[0], longitude=CENTER[1],
+                    radius_km=args.radius, vehicle_type=None, max_price_per_hour=None,
+                    min_available=None, db=db, current_user=None
+                )
+
+            found = len(indexed())
+            indexed_ms, _ = timeit(indexed)
+
+            scan_ms = "-"
+            if size <= args.scan_limit:
+                def scan():
+                    db.expunge_all()
+                    return full_scan(db, CENTER[0], CENTER[1], args.radius)
+                assert len(scan()) == found
+                scan_ms = f"{timeit(scan, repeat=5)[0]:.1f}"
+
+            per_found = indexed_ms * 1000 / max(found, 1)
+            print(f"{size:>10} {found:>7} {indexed_ms:>11.1f} {per_found:>9.1f} {scan_ms:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_nearby_filters.py
+#
+# "Zones near me with a free car slot under 20/h": nearby search with
+# vehicle_type / max_price_per_hour / min_available (one query, per-type
+# free counts inline) vs what a client had to do before - nearby search,
+# then each zone's slot list to count free matching slots itself.
+#   python -m benchmarks.bench_nearby_filters --zones 20000 --slots-per-zone 20
+
+import argparse
+import random
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import get_nearby_zones
+from benchmarks.common import temp_session, timeit
+
+USER = SimpleNamespace(id=1, role="driver")
+CENTER = (13.0, 80.0)
+TYPES = ("car", "car", "bike", "truck")
+NO_FILTERS = dict(vehicle_type=None, max_price_per_hour=None, min_available=None)
+
+
+def seed(db, zones, slots_per_zone):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": CENTER[0] + random.uniform(-0.5, 0.5),
+         "longitude": CENTER[1] + random.uniform(-0.5, 0.5),
+         "total_slots": slots_per_zone, "available_slots": slots_per_zone, "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{n}", "vehicle_type": TYPES[n % len(TYPES)],
+         "status": "available" if random.random() < 0.3 else "occupied",
+         "price_per_hour": random.choice((10.0, 15.0, 20.0, 30.0)), "zone_id": zone_id}
+        for zone_id in range(1, zones + 1) for n in range(slots_per_zone)
+    ])
+    db.commit()
+
+
+def client_side(db, radius_km, vehicle_type, max_price, min_available):
+    """Unfiltered nearby search, then one slot listing per zone."""
+    zones = get_nearby_zones(latitude=CENTER[0], longitude=CENTER[1], radius_km=radius_km,
+                             db=db, current_user=USER, **NO_FILTERS)
+    found = []
+    for zone in zones:
+        slots = db.query(models.ParkingSlot).filter(models.ParkingSlot.zone_id == zone["id"]).all()
+        free = sum(
+            1 for s in slots
+            if s.status == "available" and s.vehicle_type == vehicle_type
+            and (max_price is None or s.price_per_hour <= max_price)
+        )
+        if free >= min_available:
+            found.append(zone["id"])
+    return found, len(zones) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=20000)
+    parser.add_argument("--slots-per-zone", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        seed(db, args.zones, args.slots_per_zone)
+        run_migrations(db.get_bind())
+        print(f"{args.zones:,} zones, {args.zones * args.slots_per_zone:,} slots")
+        print(f"  {'radius':>7} {'filters':<26} {'zones':>6} {'one query ms':>13} "
+              f"{'client-side ms':>15} {'round trips':>12}")
+
+        for radius_km in (2, 5, 10):
+            for max_price, min_available in ((None, 1), (None, 3), (20.0, 1), (15.0, 2)):
+                filters = dict(vehicle_type="car", max_price_per_hour=max_price, min_available=min_available)
+
+                def filtered():
+                    db.expunge_all()
+                    return get_nearby_zones(latitude=CENTER[0], longitude=CENTER[1], radius_km=radius_km,
+                                            db=db, current_user=USER, **filters)
+
+                def client():
+                    db.expunge_all()
+                    return client_side(db, radius_km, "car", max_price, min_available)
+
+                zones = filtered()
+                found, round_trips = client()
+                assert sorted(z["id"] for z in zones) == sorted(found)
+                one_ms, _ = timeit(filtered)
+                client_ms, _ = timeit(client, repeat=5)
+                price = f"<= {max_price:g}/h" if max_price else "any price"
+                label = f"car, {price}, >= {min_available} free"
+                print(f"  {radius_km:>4} km {label:<26} {len(zones):>6} {one_ms:>13.2f} "
+                      f"{client_ms:>15.1f} {round_trips:>12,}")
+
+
+if __name__ == "__main__":
+    main()
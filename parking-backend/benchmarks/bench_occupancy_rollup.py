@@ -0,0 +1,97 @@
+# benchmarks/bench_occupancy_rollup.py
+#
+# Occupancy analytics: how fast the rollup folds the event log, and how
+# long a time series takes to serve from the hourly rows vs. grouping the
+# zone's bookings by hour on every request (which only gets turnover and
+# revenue; occupied time would need every overlapping booking).
+#   python -m benchmarks.bench_occupancy_rollup --zones 20 --days 90 --bookings-per-hour 4
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import func, insert
+
+from app import models
+from app.analytics import run_rollup
+from app.migrations import run_migrations
+from app.parking import get_occupancy_series
+from benchmarks.common import temp_database, timeit
+
+ADMIN = SimpleNamespace(id=1, role="admin")
+
+
+def seed(db, zones, days, per_hour, now):
+    """Bookings and their occupy/release events, spread over `days`."""
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0, "longitude": 80.0,
+         "total_slots": 50, "available_slots": 50, "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    start = now - timedelta(days=days)
+    bookings, events = [], []
+    for zone_id in range(1, zones + 1):
+        for hour in range(days * 24):
+            for _ in range(per_hour):
+                begin = start + timedelta(hours=hour, minutes=random.randint(0, 59))
+                duration = random.randint(1, 3)
+                end = begin + timedelta(hours=duration)
+                bookings.append({"user_id": 1, "zone_id": zone_id, "slot_id": 1, "start_time": begin,
+                                 "end_time": end, "duration_hours": duration,
+                                 "amount_paid": 20.0 * duration, "status": "completed"})
+                events.append({"zone_id": zone_id, "slot_id": 1, "booking_id": None, "kind": "occupy",
+                               "amount": 20.0 * duration, "occurred_at": begin})
+                events.append({"zone_id": zone_id, "slot_id": 1, "booking_id": None, "kind": "release",
+                               "amount": 0.0, "occurred_at": end})
+    # The log is in commit order
+    events.sort(key=lambda e: e["occurred_at"])
+    db.execute(insert(models.Booking), bookings)
+    db.execute(insert(models.OccupancyEvent), events)
+    db.commit()
+    return len(bookings), len(events)
+
+
+def hourly_from_bookings(db, zone_id, since):
+    """Turnover and revenue per hour straight from bookings."""
+    hour = func.strftime("%Y-%m-%d %H", models.Booking.start_time)
+    return db.query(hour, func.count(), func.sum(models.Booking.amount_paid)).filter(
+        models.Booking.zone_id == zone_id,
+        models.Booking.start_time >= since
+    ).group_by(hour).all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--bookings-per-hour", type=int, default=4)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    with temp_database() as Session:
+        db = Session()
+        run_migrations(db.get_bind())
+        bookings, events = seed(db, args.zones, args.days, args.bookings_per_hour, now)
+
+        started = time.perf_counter()
+        folded = run_rollup(Session)
+        elapsed = time.perf_counter() - started
+        rows = db.query(func.count()).select_from(models.ZoneHourlyStats).scalar()
+        print(f"{args.zones} zones, {bookings:,} bookings, {events:,} events")
+        print(f"  rollup: {folded:,} events in {elapsed:.2f}s ({folded / elapsed:,.0f}/s) -> {rows:,} hourly rows")
+
+        print(f"  {'range':<10} {'points':>7} {'rollups ms':>11} {'bookings ms':>12}")
+        for hours in (24, 24 * 30, 24 * 90):
+            end = now
+            start = end - timedelta(hours=hours)
+            series = get_occupancy_series(start=start, end=end, db=db, admin=ADMIN)
+            rollup_ms, _ = timeit(lambda: get_occupancy_series(start=start, end=end, db=db, admin=ADMIN))
+            bookings_ms, _ = timeit(lambda: hourly_from_bookings(db, 1, start))
+            print(f"  {hours:>5} h    {len(series['hours']):>7} {rollup_ms:>11.2f} {bookings_ms:>12.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
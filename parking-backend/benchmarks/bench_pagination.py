@@ -0,0 +1,83 @@
+# benchmarks/bench_pagination.py
+#
+# Page latency of the admin bookings listing at increasing depth:
+# skip/limit (OFFSET) vs. the X-Next-Cursor keyset cursor.
+#   python -m benchmarks.bench_pagination --bookings 200000
+
+import argparse
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi import Response
+from sqlalchemy import insert
+
+from app import models
+from app.parking import get_zone_bookings
+from app.queries import encode_cursor
+from benchmarks.common import temp_session, timeit
+
+ADMIN = SimpleNamespace(id=1, role="admin")
+PAGE = 20
+
+
+def seed(db, bookings, zones=4, chunk=50000):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0, "longitude": 80.0,
+         "total_slots": 100, "available_slots": 100, "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{i}", "vehicle_type": "car", "status": "available",
+         "price_per_hour": 10, "zone_id": i % zones + 1}
+        for i in range(100 * zones)
+    ])
+    start = datetime.utcnow() - timedelta(days=365)
+    for offset in range(0, bookings, chunk):
+        db.execute(insert(models.Booking), [
+            {"user_id": 1000 + i % 500, "zone_id": i % zones + 1, "slot_id": i % (100 * zones) + 1,
+             "start_time": start + timedelta(minutes=i), "end_time": start + timedelta(minutes=i + 60),
+             "duration_hours": 1, "amount_paid": 10.0,
+             "status": "completed" if i % 10 else "cancelled"}
+            for i in range(offset, min(bookings, offset + chunk))
+        ])
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        seed(db, args.bookings)
+        # Zone 1's bookings, newest first: the id just above each depth is
+        # the cursor a client would hold after paging that far
+        ids = [row.id for row in db.query(models.Booking.id).filter(
+            models.Booking.zone_id == 1
+        ).order_by(models.Booking.id.desc())]
+        print(f"{len(ids)} bookings in the admin's zone, {PAGE} per page")
+        print(f"  {'depth':>8} {'offset p50':>12} {'cursor p50':>12} {'offset p95':>12} {'cursor p95':>12}")
+
+        depth = 0
+        while depth + PAGE <= len(ids):
+            cursor = encode_cursor(ids[depth - 1]) if depth else None
+
+            def by_offset():
+                return get_zone_bookings(Response(), status=None, limit=PAGE, skip=depth,
+                                         cursor=None, db=db, admin=ADMIN)
+
+            def by_cursor():
+                return get_zone_bookings(Response(), status=None, limit=PAGE, skip=0,
+                                         cursor=cursor, db=db, admin=ADMIN)
+
+            assert [b.id for b in by_offset()] == [b.id for b in by_cursor()]
+            offset_p50, offset_p95 = timeit(by_offset, args.repeat)
+            cursor_p50, cursor_p95 = timeit(by_cursor, args.repeat)
+            print(f"  {depth:>8} {offset_p50:>10.2f}ms {cursor_p50:>10.2f}ms "
+                  f"{offset_p95:>10.2f}ms {cursor_p95:>10.2f}ms")
+            depth = depth * 4 if depth else PAGE * 5
+
+
+if __name__ == "__main__":
+    main()
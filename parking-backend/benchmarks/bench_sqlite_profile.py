@@ -0,0 +1,128 @@
+# benchmarks/bench_sqlite_profile.py
+#
+# Mixed read/write load on the "default" and "wal" SQLite profiles.
+# Reader threads list and search zones while writer threads book and
+# complete parking; reports throughput and read latency per profile.
+#   python -m benchmarks.bench_sqlite_profile --readers 16 --writers 4 --duration 10
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.allocator import slot_allocator
+from app.database import Base, create_sqlite_engine
+from app.parking import complete_booking, create_booking, get_all_zones, get_nearby_zones
+from benchmarks.common import percentile
+
+
+def seed(db, zones, slots_per_zone, drivers):
+    db.execute(insert(models.User), [
+        {"name": f"user{i}", "email": f"user{i}@example.com", "password": "x",
+         "role": "admin" if i < zones else "driver"}
+        for i in range(zones + drivers)
+    ])
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0 + i * 0.001, "longitude": 80.0,
+         "total_slots": slots_per_zone, "available_slots": slots_per_zone, "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{j}", "vehicle_type": "car", "status": "available",
+         "price_per_hour": 10, "zone_id": i + 1}
+        for i in range(zones) for j in range(slots_per_zone)
+    ])
+    db.commit()
+    return list(range(zones + 1, zones + drivers + 1))
+
+
+def run_profile(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_sqlite_engine(url, profile=profile)
+        read_engine = create_sqlite_engine(url, read_only=True, profile=profile) if profile == "wal" else write_engine
+        Base.metadata.create_all(bind=write_engine)
+
+        WriteSession = sessionmaker(autoflush=False, bind=write_engine)
+        ReadSession = sessionmaker(autoflush=False, bind=read_engine)
+
+        db = WriteSession()
+        driver_ids = seed(db, args.zones, 50, args.writers)
+        slot_allocator.load(db)
+        db.close()
+
+        deadline = time.perf_counter() + args.duration
+        read_latencies, writes, errors = [], [0], [0]
+        lock = threading.Lock()
+
+        def reader(i):
+            while time.perf_counter() < deadline:
+                session = ReadSession()
+                start = time.perf_counter()
+                try:
+                    if i % 2:
+                        get_all_zones(db=session, current_user=None)
+                    else:
+                        get_nearby_zones(latitude=13.0, longitude=80.0, radius_km=5,
+                                         vehicle_type=None, max_price_per_hour=None, min_available=None,
+                                         db=session, current_user=None)
+                finally:
+                    session.close()
+                with lock:
+                    read_latencies.append((time.perf_counter() - start) * 1000)
+
+        def writer(driver_id):
+            driver = SimpleNamespace(id=driver_id)
+            zone_id = 1 + driver_id % args.zones
+            while time.perf_counter() < deadline:
+                session = WriteSession()
+                try:
+                    booked = create_booking(
+                        data=schemas.BookingCreate(zone_id=zone_id, duration_hours=1),
+                        db=session, driver=driver
+                    )
+                    complete_booking(booking_id=booked["booking_id"], db=session, driver=driver)
+                    with lock:
+                        writes[0] += 2
+                except Exception:
+                    with lock:
+                        errors[0] += 1
+                finally:
+                    session.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(d,)) for d in driver_ids]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        write_engine.dispose()
+        read_engine.dispose()
+        return len(read_latencies) / args.duration, read_latencies, writes[0] / args.duration, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--zones", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.duration:.0f}s per profile")
+    print(f"{'profile':<8} {'reads/s':>8} {'read p50':>9} {'read p99':>9} {'writes/s':>9} {'errors':>7}")
+    for profile in ("default", "wal"):
+        reads, latencies, writes, errors = run_profile(profile, args)
+        print(f"{profile:<8} {reads:>8.0f} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 99):>9.1f} {writes:>9.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
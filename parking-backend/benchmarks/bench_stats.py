@@ -0,0 +1,106 @@
+# benchmarks/bench_stats.py
+#
+# Stats endpoints on a zone with a long booking history.
+#   python -m benchmarks.bench_stats --bookings 100000
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import models
+from app.parking import get_admin_booking_stats, get_driver_stats, get_slot_statistics
+from benchmarks.common import temp_session, timeit
+
+STATUSES = ["completed", "completed", "completed", "cancelled", "active"]
+
+
+def seed(db, bookings, slots):
+    admin = models.User(name="admin", email="admin@example.com", password="x", role="admin")
+    driver = models.User(name="driver", email="driver@example.com", password="x", role="driver")
+    db.add_all([admin, driver])
+    db.flush()
+
+    zone = models.ParkingZone(
+        name="Zone", latitude=13.0, longitude=80.0,
+        total_slots=slots, available_slots=slots, admin_id=admin.id
+    )
+    db.add(zone)
+    db.flush()
+
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{i}", "vehicle_type": random.choice(["car", "bike", "truck"]),
+         "status": random.choice(["available", "occupied"]), "price_per_hour": 10, "zone_id": zone.id}
+        for i in range(slots)
+    ])
+
+    start = datetime.utcnow() - timedelta(days=365)
+    db.execute(insert(models.Booking), [
+        {"user_id": driver.id, "zone_id": zone.id, "slot_id": random.randint(1, slots),
+         "start_time": start, "end_time": start + timedelta(hours=2), "duration_hours": 2,
+         "amount_paid": 20.0, "status": random.choice(STATUSES)}
+        for _ in range(bookings)
+    ])
+    db.commit()
+    db.refresh(admin)
+    db.refresh(driver)
+    db.refresh(zone)
+    return admin, driver, zone
+
+
+def old_admin_stats(db, zone):
+    """The previous implementation: three counts plus loading every booking row."""
+    q = db.query(models.Booking).filter(models.Booking.zone_id == zone.id)
+    total = q.count()
+    q.filter(models.Booking.status == "active").count()
+    q.filter(models.Booking.status == "completed").count()
+    rows = q.all()
+    return total, sum(b.amount_paid for b in rows), sum(b.duration_hours for b in rows)
+
+
+def old_slot_stats(db, zone):
+    """The previous implementation: six separate COUNT queries."""
+    q = db.query(models.ParkingSlot).filter(models.ParkingSlot.zone_id == zone.id)
+    return (
+        q.count(),
+        q.filter(models.ParkingSlot.status == "available").count(),
+        q.filter(models.ParkingSlot.status == "occupied").count(),
+        q.filter(models.ParkingSlot.vehicle_type == "car").count(),
+        q.filter(models.ParkingSlot.vehicle_type == "bike").count(),
+        q.filter(models.ParkingSlot.vehicle_type == "truck").count(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--slots", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        admin, driver, zone = seed(db, args.bookings, args.slots)
+
+        def run(fn):
+            def call():
+                db.expunge_all()
+                return fn()
+            return call
+
+        cases = [
+            ("admin booking stats", run(lambda: get_admin_booking_stats(db=db, admin=admin)),
+             run(lambda: old_admin_stats(db, zone))),
+            ("driver stats", run(lambda: get_driver_stats(db=db, driver=driver)), None),
+            ("slot stats", run(lambda: get_slot_statistics(zone_id=zone.id, db=db, admin=admin)),
+             run(lambda: old_slot_stats(db, zone))),
+        ]
+
+        print(f"{args.bookings} bookings, {args.slots} slots")
+        print(f"{'endpoint':<22} {'aggregate ms':>13} {'previous ms':>12}")
+        for name, new, old in cases:
+            old_ms = f"{timeit(old, repeat=5)[0]:.1f}" if old else "-"
+            print(f"{name:<22} {timeit(new, repeat=10)[0]:>13.1f} {old_ms:>12}")
+
+
+if __name__ == "__main__":
+    main()
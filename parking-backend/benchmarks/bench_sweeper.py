@@ -0,0 +1,86 @@
+# benchmarks/bench_sweeper.py
+#
+# Expiring overdue bookings: the set-based sweeper vs. releasing them one
+# by one through the per-booking path used by complete_booking.
+#   python -m benchmarks.bench_sweeper --bookings 20000 --overdue 2000
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import models
+from app.parking import _release_booking
+from app.sweeper import sweep_expired, sweep_metrics
+from benchmarks.common import temp_database
+
+
+def seed(db, bookings, overdue, zones=50):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0, "longitude": 80.0,
+         "total_slots": bookings // zones + 1, "available_slots": 0, "admin_id": 1}
+        for i in range(zones)
+    ])
+    # One occupied slot per active booking, history rows on top
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{i}", "vehicle_type": "car", "status": "occupied",
+         "price_per_hour": 10, "zone_id": i % zones + 1}
+        for i in range(bookings)
+    ])
+    now = datetime.utcnow()
+    db.execute(insert(models.Booking), [
+        {"user_id": i + 1, "zone_id": i % zones + 1, "slot_id": i + 1,
+         "start_time": now - timedelta(hours=3),
+         "end_time": now - timedelta(minutes=random.randint(1, 120)) if i < overdue
+         else now + timedelta(hours=random.randint(1, 24)),
+         "duration_hours": 2, "amount_paid": 20.0, "status": "active"}
+        for i in range(bookings)
+    ])
+    db.commit()
+
+
+def per_row(Session):
+    """One ORM load + conditional release + commit per booking."""
+    db = Session()
+    try:
+        overdue = db.query(models.Booking).filter(
+            models.Booking.status == "active",
+            models.Booking.end_time <= datetime.utcnow()
+        ).all()
+        for booking in overdue:
+            _release_booking(db, booking, "completed")
+            db.commit()
+        return len(overdue)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=20000)
+    parser.add_argument("--overdue", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.bookings} active bookings, {args.overdue} overdue")
+    for label, run in (("per-booking release", per_row),
+                       ("set-based sweeper", lambda Session: sweep_expired(Session))):
+        with temp_database() as Session:
+            db = Session()
+            seed(db, args.bookings, args.overdue)
+            db.close()
+
+            start = time.perf_counter()
+            expired = run(Session)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert expired == args.overdue, expired
+            print(f"  {label:<22} {elapsed:10.0f} ms")
+
+    m = sweep_metrics
+    print(f"  sweeper batches        {m.last_batch_sizes[:3]}... ({len(m.last_batch_sizes)} total), "
+          f"lag {m.last_lag_seconds:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
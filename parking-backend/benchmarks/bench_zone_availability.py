@@ -0,0 +1,93 @@
+# benchmarks/bench_zone_availability.py
+#
+# Refreshing map pins: GET /parking/zones (full zone list, cached until the
+# next zone write) vs GET /parking/zones/availability (ids/available/total
+# for a viewport or a list of ids, from the in-process counter table).
+# Each is timed with no write in between and with one zone write before
+# every call, which is what a busy deployment sees.
+#   python -m benchmarks.bench_zone_availability --zones 10000 --calls 500
+
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert, update
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import get_all_zones
+from app.realtime import get_zones_availability, zone_counters
+from benchmarks.common import temp_database
+
+USER = SimpleNamespace(id=1, role="driver")
+
+
+def seed(db, zones):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0 + random.uniform(-0.5, 0.5),
+         "longitude": 80.0 + random.uniform(-0.5, 0.5),
+         "total_slots": 50, "available_slots": random.randint(0, 50), "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    with temp_database() as Session:
+        db = Session()
+        seed(db, args.zones)
+        run_migrations(db.get_bind())  # version triggers: the counter table follows them
+        zone_counters.session_factory = Session
+
+        # About 1% of the zones, like a zoomed-in map
+        viewport = dict(min_lat=12.95, max_lat=13.05, min_lon=79.95, max_lon=80.05)
+        pinned = ",".join(str(random.randint(1, args.zones)) for _ in range(50))
+
+        def write():
+            zone_id = random.randint(1, args.zones)
+            db.execute(update(models.ParkingZone).where(models.ParkingZone.id == zone_id)
+                       .values(available_slots=random.randint(0, 50)))
+            db.commit()
+
+        def availability(**params):
+            return loop.run_until_complete(get_zones_availability(**{
+                "zone_ids": None, "min_lat": None, "max_lat": None, "min_lon": None, "max_lon": None,
+                **params, "current_user": USER
+            })).body
+
+        rows = [
+            ("GET /zones", lambda: get_all_zones(db, USER, None).body),
+            ("availability, viewport", lambda: availability(**viewport)),
+            ("availability, 50 ids", lambda: availability(zone_ids=pinned)),
+        ]
+
+        print(f"{args.zones} zones, {args.calls} calls each (µs per call)")
+        print(f"  {'':<26} {'bytes':>8} {'no writes':>10} {'1 write/call':>13}")
+        for label, fn in rows:
+            size = len(fn())
+            timings = []
+            for with_write in (False, True):
+                elapsed = 0.0
+                for _ in range(args.calls):
+                    if with_write:
+                        write()
+                    start = time.perf_counter()
+                    fn()
+                    elapsed += time.perf_counter() - start
+                    db.expunge_all()
+                timings.append(elapsed / args.calls * 1e6)
+            print(f"  {label:<26} {size:>8,} {timings[0]:>10,.0f} {timings[1]:>13,.0f}")
+        db.close()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_zone_cache.py
+#
+# GET /parking/zones handler throughput: the previous query + serialize on
+# every call vs. a cache hit (200 with the cached body) vs. a revalidation
+# with If-None-Match (304, no DB access).
+#   python -m benchmarks.bench_zone_cache --zones 2000 --calls 2000
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app import models, schemas
+from app.migrations import run_migrations
+from app.parking import get_all_zones
+from benchmarks.common import temp_session
+
+USER = SimpleNamespace(id=1, role="driver")
+
+
+def seed(db, zones):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0 + random.uniform(-0.5, 0.5),
+         "longitude": 80.0 + random.uniform(-0.5, 0.5),
+         "total_slots": 50, "available_slots": random.randint(0, 50), "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.commit()
+
+
+def old_get_all_zones(db, adapter=TypeAdapter(list[schemas.ParkingZoneResponse])):
+    """The previous implementation: load, validate against response_model and
+    serialize on every call (what FastAPI does for the returned ORM list)."""
+    zones = db.query(models.ParkingZone).all()
+    validated = adapter.validate_python(zones, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validated, mode="json"))
+
+
+def throughput(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        seed(db, args.zones)
+        run_migrations(db.get_bind())
+
+        etag = get_all_zones(db, USER, None).headers["etag"]
+
+        def uncached():
+            old_get_all_zones(db)
+            db.expunge_all()
+
+        rows = [
+            ("query + serialize (old)", uncached),
+            ("cache hit, 200", lambda: get_all_zones(db, USER, None)),
+            ("If-None-Match, 304", lambda: get_all_zones(db, USER, etag)),
+        ]
+
+        print(f"{args.zones} zones, {args.calls} calls each")
+        for label, fn in rows:
+            calls = args.calls if "old" not in label else max(1, args.calls // 20)
+            print(f"  {label:<26} {throughput(fn, calls):>12,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
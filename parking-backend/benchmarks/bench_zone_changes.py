@@ -0,0 +1,92 @@
+# benchmarks/bench_zone_changes.py
+#
+# A client catching up after N zone/slot writes: full refresh (every zone
+# from GET /parking/zones plus every zone's slots) vs one call to
+# GET /parking/zones/changes?since=<last version>.
+#   python -m benchmarks.bench_zone_changes --zones 2000 --slots-per-zone 20
+
+import argparse
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert, text, update
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import get_zone_changes
+from app.queries import SLOT_RESPONSE_COLUMNS, ZONE_RESPONSE_COLUMNS
+from benchmarks.common import temp_session
+
+# Owns every seeded zone, so the feed carries their slots too
+USER = SimpleNamespace(id=1, role="admin")
+
+
+def seed(db, zones, slots_per_zone):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0, "longitude": 80.0,
+         "total_slots": slots_per_zone, "available_slots": slots_per_zone, "admin_id": 1}
+        for i in range(zones)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{n}", "vehicle_type": "car", "status": "available",
+         "price_per_hour": 10.0, "zone_id": zone_id}
+        for zone_id in range(1, zones + 1) for n in range(slots_per_zone)
+    ])
+    db.commit()
+
+
+def full_refresh(db) -> bytes:
+    """What a client without the feed downloads: all zones and all slots."""
+    zones = db.query(*ZONE_RESPONSE_COLUMNS).all()
+    slots = db.query(*SLOT_RESPONSE_COLUMNS).all()
+    return json.dumps({"zones": [z._asdict() for z in zones], "slots": [s._asdict() for s in slots]}).encode()
+
+
+def delta(db, since) -> bytes:
+    changes = get_zone_changes(since=since, limit=5000, db=db, current_user=USER)
+    return json.dumps({
+        "zones": [z._asdict() for z in changes["zones"]],
+        "slots": [s._asdict() for s in changes["slots"]],
+        "deleted_slots": changes["deleted_slots"],
+    }).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=2000)
+    parser.add_argument("--slots-per-zone", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        run_migrations(db.get_bind())
+        seed(db, args.zones, args.slots_per_zone)
+        total_slots = args.zones * args.slots_per_zone
+
+        print(f"{args.zones} zones, {total_slots} slots")
+        print(f"  {'writes since last sync':<24} {'full KiB':>9} {'full ms':>8} {'delta KiB':>10} {'delta ms':>9}")
+        for writes in (1, 10, 100, 1000):
+            # The client is up to date before the writes
+            since = db.execute(text("SELECT value FROM change_sequence")).scalar()
+
+            # A booking touches one slot and its zone
+            for _ in range(writes):
+                slot_id = random.randint(1, total_slots)
+                db.execute(update(models.ParkingSlot).where(models.ParkingSlot.id == slot_id)
+                           .values(status="occupied"))
+                db.execute(update(models.ParkingZone).where(models.ParkingZone.id == (slot_id - 1) // args.slots_per_zone + 1)
+                           .values(available_slots=models.ParkingZone.available_slots - 1))
+            db.commit()
+
+            start = time.perf_counter()
+            full = full_refresh(db)
+            full_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            body = delta(db, since)
+            delta_ms = (time.perf_counter() - start) * 1000
+            print(f"  {writes:<24} {len(full) / 1024:>9,.0f} {full_ms:>8.1f} {len(body) / 1024:>10,.1f} {delta_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
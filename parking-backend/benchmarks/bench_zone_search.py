@@ -0,0 +1,78 @@
+# benchmarks/bench_zone_search.py
+#
+# Zone name search at 100k zones: the old ILIKE '%text%' full scan vs. the
+# FTS5 trigram index behind /zones/search and /zones/autocomplete.
+#   python -m benchmarks.bench_zone_search --zones 100000
+
+import argparse
+import random
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app import models
+from app.migrations import run_migrations
+from app.parking import autocomplete_zones, search_zones
+from benchmarks.common import temp_session, timeit
+
+DRIVER = SimpleNamespace(id=1, role="driver")
+
+AREAS = ["Anna Nagar", "Adyar", "T Nagar", "Velachery", "Guindy", "Mylapore",
+         "Porur", "Tambaram", "Egmore", "Nungambakkam", "Besant Nagar", "Perungudi"]
+KINDS = ["Mall", "Metro", "Hospital", "Market", "Stadium", "Airport", "Tech Park",
+         "Station", "Beach", "Temple", "College", "Cinema"]
+
+# (label, text): common and rare substrings, short type-ahead, no match
+QUERIES = [
+    ("common word", "nagar"),
+    ("mid-word", "mbar"),
+    ("rare", "guindy cinema 42"),
+    ("short", "ve"),
+    ("short, mid-word", "ur"),
+    ("no match", "zzzz"),
+]
+
+
+def seed(db, zones):
+    rng = random.Random(7)
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"{rng.choice(AREAS)} {rng.choice(KINDS)} {i % 500}",
+         "latitude": 13.0, "longitude": 80.2,
+         "total_slots": 50, "available_slots": 50, "admin_id": 1}
+        for i in range(zones)
+    ])
+    db.commit()
+
+
+def ilike_scan(db, text, limit):
+    """The previous implementation, with the same limit for a fair comparison."""
+    return db.query(models.ParkingZone).filter(
+        models.ParkingZone.name.ilike(f"%{text}%")
+    ).limit(limit).all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_session() as db:
+        # Migrations create the FTS table and its triggers; seeding after
+        # them exercises the insert trigger too
+        run_migrations(db.get_bind())
+        seed(db, args.zones)
+
+        print(f"{args.zones} zones, 20 results per search, 10 per autocomplete (median ms)")
+        print(f"  {'query':<28} {'ILIKE scan':>11} {'search':>9} {'autocomplete':>13}")
+        for label, text in QUERIES:
+            scan, _ = timeit(lambda: ilike_scan(db, text, 20), args.repeat)
+            fts, _ = timeit(lambda: search_zones(
+                name=text, limit=20, db=db, current_user=DRIVER), args.repeat)
+            typeahead, _ = timeit(lambda: autocomplete_zones(
+                q=text, limit=10, db=db, current_user=DRIVER), args.repeat)
+            print(f"  {label + ' ' + repr(text):<28} {scan:>11.2f} {fts:>9.2f} {typeahead:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/check_query_counts.py
+#
+# Guards the booking listings and stats endpoints against N+1 regressions:
+# each endpoint must issue a fixed number of SQL statements regardless of
+# page size or history length.
+#   python -m benchmarks.check_query_counts
+#
+# The same checks run under pytest, for both DB modes: tests/test_query_counts.py
+
+from datetime import datetime, timedelta
+
+from fastapi import Response
+
+from app import models
+from app.parking import (
+    get_active_booking, get_admin_booking_stats, get_booking_history,
+    get_driver_stats, get_slot_statistics, get_zone_bookings
+)
+from benchmarks.common import assert_num_queries, temp_session
+
+PAGE = 100
+
+
+def seed(db):
+    admin = models.User(name="admin", email="admin@example.com", password="x", role="admin")
+    driver = models.User(name="driver", email="driver@example.com", password="x", role="driver")
+    db.add_all([admin, driver])
+    db.flush()
+
+    zone = models.ParkingZone(
+        name="Zone", latitude=13.0, longitude=80.0,
+        total_slots=PAGE, available_slots=PAGE, admin_id=admin.id
+    )
+    db.add(zone)
+    db.flush()
+
+    slots = [
+        models.ParkingSlot(slot_number=f"A{i}", vehicle_type="car", price_per_hour=10, zone_id=zone.id)
+        for i in range(PAGE)
+    ]
+    db.add_all(slots)
+    db.flush()
+
+    start = datetime.utcnow()
+    db.add_all([
+        models.Booking(
+            user_id=driver.id, zone_id=zone.id, slot_id=slot.id,
+            start_time=start, end_time=start + timedelta(hours=1),
+            duration_hours=1, amount_paid=10,
+            status="active" if i == 0 else "completed"
+        )
+        for i, slot in enumerate(slots)
+    ])
+    db.commit()
+
+    # Load ids now; the checks run against a detached identity map
+    db.refresh(admin)
+    db.refresh(driver)
+    db.expunge_all()
+    return admin, driver
+
+
+# (route, expected statements, handler, arguments besides db)
+CHECKS = [
+    ("GET /parking/bookings/history", 1, get_booking_history,
+     lambda admin, driver: dict(response=Response(), status=None, limit=PAGE, skip=0, cursor=None, driver=driver)),
+    ("GET /parking/admin/bookings", 2, get_zone_bookings,
+     lambda admin, driver: dict(response=Response(), status=None, limit=PAGE, skip=0, cursor=None, admin=admin)),
+    ("GET /parking/bookings/active", 1, get_active_booking,
+     lambda admin, driver: dict(driver=driver)),
+    ("GET /parking/profile/stats", 1, get_driver_stats,
+     lambda admin, driver: dict(driver=driver)),
+    ("GET /parking/admin/bookings/stats", 2, get_admin_booking_stats,
+     lambda admin, driver: dict(admin=admin)),
+    ("GET /parking/zones/{id}/slots/stats", 2, get_slot_statistics,
+     lambda admin, driver: dict(zone_id=1, admin=admin)),
+]
+
+
+def main():
+    with temp_session() as db:
+        admin, driver = seed(db)
+        bind = db.get_bind()
+
+        for name, expected, handler, arguments in CHECKS:
+            with assert_num_queries(expected, bind):
+                handler(db=db, **arguments(admin, driver))
+            db.expunge_all()
+            print(f"{name:<35} {expected} queries  OK")
+
+
+if __name__ == "__main__":
+    main()
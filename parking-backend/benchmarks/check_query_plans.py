@@ -0,0 +1,190 @@
+# benchmarks/check_query_plans.py
+#
+# Runs each endpoint against a fresh database (schema + migrations) and
+# asks SQLite for the EXPLAIN QUERY PLAN of every statement it issued.
+# Fails if a statement scans a whole table where an index should be used,
+# or if a paginated listing sorts instead of reading an index in order.
+#   python -m benchmarks.check_query_plans
+
+import re
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import Response
+from sqlalchemy import event
+
+from app import models, schemas
+from app.allocator import slot_allocator
+from app.analytics import run_rollup
+from app.deps import load_principal
+from app.migrations import run_migrations
+from app.queries import encode_cursor
+from app.parking import (
+    cancel_booking, complete_booking, create_booking, create_single_slot,
+    create_slots_bulk, delete_slot, extend_booking, get_active_booking,
+    get_admin_booking_stats, get_booking_history, get_driver_stats,
+    get_best_zones, get_my_zone, get_nearby_zones, get_occupancy_series, get_slot_statistics,
+    get_zone_bookings, get_zone_changes,
+    get_zone_slots, search_zones, autocomplete_zones, update_availability,
+    update_slot_status
+)
+from app.sweeper import expire_batch
+from benchmarks.common import temp_session
+
+# "SCAN t" without an index; "SCAN t USING [COVERING] INDEX ..." is fine,
+# as are an FTS5 MATCH ("SCAN t VIRTUAL TABLE INDEX 0:M1") and a subquery
+# that was already limited ("SCAN anon_1")
+FULL_SCAN = re.compile(r"^SCAN (?!anon_)(\w+)\b(?! USING)(?! VIRTUAL TABLE INDEX \d+:\S)")
+
+# Paginated listings must read an index in id order: a sort means every
+# matching row is read on every page
+SORTS = re.compile(r"^USE TEMP B-TREE FOR ORDER BY")
+PAGED = {
+    "GET /parking/bookings/history",
+    "GET /parking/bookings/history (cursor)",
+    "GET /parking/admin/bookings",
+    "GET /parking/admin/bookings (cursor, status)",
+    "GET /parking/zones/changes",
+    "GET /parking/zones/changes (driver)",
+}
+
+# Endpoints that read every row by design
+ALLOWED_SCANS = {
+    "GET /parking/zones": {"parking_zones"},
+    "startup: allocator load": {"parking_slots", "parking_zones"},
+}
+
+
+def seed(db):
+    db.add_all([
+        models.User(name="admin", email="admin@example.com", password="x", role="admin"),
+        models.User(name="driver", email="driver@example.com", password="x", role="driver"),
+    ])
+    db.flush()
+    db.add(models.ParkingZone(
+        name="Zone", latitude=13.0, longitude=80.0,
+        total_slots=0, available_slots=0, admin_id=1
+    ))
+    db.commit()
+
+
+def explain(db, statement, parameters):
+    conn = db.connection()
+    if isinstance(parameters, list):  # executemany: one row's worth
+        parameters = parameters[0]
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def main():
+    admin = SimpleNamespace(id=1, role="admin")
+    driver = SimpleNamespace(id=2, role="driver")
+
+    with temp_session() as db:
+        run_migrations(db.get_bind())
+        seed(db)
+
+        checks = [
+            ("auth: current user", lambda: load_principal("driver@example.com", db)),
+            ("GET /parking/zones/my-zone", lambda: get_my_zone(db=db, admin=admin)),
+            ("POST /parking/zones/{id}/slots/bulk", lambda: create_slots_bulk(
+                1, schemas.ParkingSlotBulkCreate(ranges=[
+                    schemas.ParkingSlotRangeCreate(slot_range="A1-A20", vehicle_type="car")
+                ]), db=db, admin=admin)),
+            ("POST /parking/zones/{id}/slots", lambda: create_single_slot(
+                1, schemas.ParkingSlotCreate(slot_number="B1", vehicle_type="bike"), db=db, admin=admin)),
+            ("PATCH /parking/zones/{id}/availability", lambda: update_availability(
+                1, schemas.AvailabilityUpdate(available_slots=20), db=db, admin=admin)),
+            ("startup: allocator load", lambda: slot_allocator.load(db)),
+            ("GET /parking/zones/search", lambda: search_zones(
+                name="zon", limit=20, db=db, current_user=driver)),
+            ("GET /parking/zones/search (short)", lambda: search_zones(
+                name="zo", limit=20, db=db, current_user=driver)),
+            ("GET /parking/zones/autocomplete", lambda: autocomplete_zones(
+                q="zone", limit=10, db=db, current_user=driver)),
+            ("GET /parking/zones/nearby", lambda: get_nearby_zones(
+                latitude=13.0, longitude=80.0, radius_km=5, vehicle_type=None,
+                max_price_per_hour=None, min_available=None, db=db, current_user=driver)),
+            ("GET /parking/zones/nearby (type, min available)", lambda: get_nearby_zones(
+                latitude=13.0, longitude=80.0, radius_km=5, vehicle_type="car",
+                max_price_per_hour=None, min_available=2, db=db, current_user=driver)),
+            ("GET /parking/zones/nearby (max price)", lambda: get_nearby_zones(
+                latitude=13.0, longitude=80.0, radius_km=5, vehicle_type="car",
+                max_price_per_hour=25, min_available=None, db=db, current_user=driver)),
+            ("GET /parking/zones/best", lambda: get_best_zones(
+                latitude=13.0, longitude=80.0, radius_km=5, vehicle_type="car", k=5,
+                db=db, current_user=driver)),
+            ("GET /parking/zones/{id}/slots", lambda: get_zone_slots(
+                1, vehicle_type="car", status="available", db=db, admin=admin)),
+            ("GET /parking/zones/{id}/slots/stats", lambda: get_slot_statistics(1, db=db, admin=admin)),
+            ("PATCH /parking/zones/{id}/slots/{id}/status", lambda: update_slot_status(
+                1, 20, schemas.ParkingSlotUpdate(status="occupied"), db=db, admin=admin)),
+            ("DELETE /parking/zones/{id}/slots/{id}", lambda: delete_slot(1, 19, db=db, admin=admin)),
+            ("POST /parking/bookings", lambda: create_booking(
+                schemas.BookingCreate(zone_id=1, duration_hours=1), db=db, driver=driver)),
+            ("GET /parking/bookings/active", lambda: get_active_booking(db=db, driver=driver)),
+            ("PATCH /parking/bookings/{id}/extend", lambda: extend_booking(
+                1, schemas.BookingExtend(additional_hours=1), db=db, driver=driver)),
+            ("PATCH /parking/bookings/{id}/complete", lambda: complete_booking(1, db=db, driver=driver)),
+            ("POST /parking/bookings (again)", lambda: create_booking(
+                schemas.BookingCreate(zone_id=1, duration_hours=1), db=db, driver=driver)),
+            ("PATCH /parking/bookings/{id}/cancel", lambda: cancel_booking(2, db=db, driver=driver)),
+            ("GET /parking/bookings/history", lambda: get_booking_history(
+                Response(), status="completed", limit=10, skip=0, cursor=None, db=db, driver=driver)),
+            ("GET /parking/bookings/history (cursor)", lambda: get_booking_history(
+                Response(), status=None, limit=10, skip=0, cursor=encode_cursor(2), db=db, driver=driver)),
+            ("GET /parking/profile/stats", lambda: get_driver_stats(db=db, driver=driver)),
+            ("GET /parking/admin/bookings", lambda: get_zone_bookings(
+                Response(), status=None, limit=20, skip=0, cursor=None, db=db, admin=admin)),
+            ("GET /parking/admin/bookings (cursor, status)", lambda: get_zone_bookings(
+                Response(), status="active", limit=20, skip=0, cursor=encode_cursor(2), db=db, admin=admin)),
+            ("GET /parking/admin/bookings/stats", lambda: get_admin_booking_stats(db=db, admin=admin)),
+            ("GET /parking/zones/changes", lambda: get_zone_changes(
+                since=5, limit=100, db=db, current_user=admin)),
+            ("GET /parking/zones/changes (driver)", lambda: get_zone_changes(
+                since=5, limit=100, db=db, current_user=driver)),
+            ("sweeper: expire batch", lambda: expire_batch(db, datetime.utcnow())),
+            ("analytics: rollup", lambda: run_rollup(lambda: db)),
+            ("GET /parking/admin/analytics/occupancy", lambda: get_occupancy_series(
+                start=None, end=None, db=db, admin=admin)),
+        ]
+
+        failures = 0
+        bind = db.get_bind()
+        for name, call in checks:
+            statements = []
+
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append((statement, parameters))
+
+            event.listen(bind, "before_cursor_execute", record)
+            try:
+                call()
+            finally:
+                event.remove(bind, "before_cursor_execute", record)
+
+            scans, sorted_page = set(), False
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+                    continue
+                for detail in explain(db, statement, parameters):
+                    match = FULL_SCAN.match(detail)
+                    if match:
+                        scans.add(match.group(1))
+                    if name in PAGED and SORTS.match(detail):
+                        sorted_page = True
+
+            unexpected = scans - ALLOWED_SCANS.get(name, set())
+            status = f"FULL SCAN {', '.join(sorted(unexpected))}" if unexpected else "OK"
+            if sorted_page:
+                status = "SORTS EVERY PAGE" if status == "OK" else f"{status}, SORTS EVERY PAGE"
+            failures += bool(unexpected) or sorted_page
+            print(f"{name:<48} {len(statements):>2} statements  {status}")
+
+    if failures:
+        sys.exit(f"{failures} endpoint(s) scan a table or sort without an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/common.py
+#
+# Shared helpers for the benchmark scripts. Run them from parking-backend/,
+# e.g. `python -m benchmarks.bench_nearby`.
+
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, engine, read_engine
+from app import models  # noqa: F401  (register tables)
+
+
+@contextmanager
+def temp_database():
+    """Fresh SQLite database in a temp dir, with all tables and indexes.
+    Yields a sessionmaker; use one session per thread."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        finally:
+            engine.dispose()
+
+
+@contextmanager
+def temp_session():
+    """Single session on a fresh temp database."""
+    with temp_database() as Session:
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+def timeit(fn, repeat=20):
+    """Run fn `repeat` times, return (median_ms, p95_ms)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def percentile(samples, pct):
+    """pct-th percentile of a list of numbers (nearest rank)."""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+@contextmanager
+def count_queries(*binds):
+    """
+    Collect every SQL statement executed on `binds` inside the block;
+    by default the app's writer and read engines.
+
+        with count_queries() as statements:
+            client.get("/parking/bookings/history")
+        assert len(statements) == 3
+    """
+    binds = binds or tuple({engine, read_engine})
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for bind in binds:
+            event.remove(bind, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_num_queries(expected: int, *binds):
+    """Fail if the block does not execute exactly `expected` SQL statements."""
+    with count_queries(*binds) as statements:
+        yield statements
+
+    if len(statements) != expected:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(statements))
+        raise AssertionError(
+            f"Expected {expected} queries, got {len(statements)}:\n{listing}"
+        )
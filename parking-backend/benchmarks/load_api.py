@@ -0,0 +1,444 @@
+# benchmarks/load_api.py
+#
+# In-process load test of every route: app/auth.py, app/parking.py,
+# app/realtime.py (map refresh and the availability stream), the sweeper
+# stats and GET /metrics.
+# Seeds a synthetic dataset on a fresh database, then concurrent virtual
+# clients drive the ASGI app (no server, no sockets) through realistic
+# flows: drivers browse and book, admins manage their zone's slots, new
+# users register and log in. Per route it reports requests/s, latency
+# percentiles and SQL statements per request; --json writes the same as
+# JSON so runs can be diffed with --baseline.
+#   python -m benchmarks.load_api --clients 32 --duration 10 --json run.json
+#   python -m benchmarks.load_api --mode async --baseline run.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import httpx
+
+# Nothing from app (or benchmarks.common, which imports it) at module level:
+# app.database opens ./parking.db on import, see main()
+
+PASSWORD = "secret123"
+
+# Virtual clients are assigned flows round-robin from this mix
+ROLE_MIX = ["driver"] * 5 + ["admin"] * 2 + ["auth"]
+
+# Statements run on behalf of the request being timed (None outside one)
+_request_statements: ContextVar[Optional[List[str]]] = ContextVar("request_statements", default=None)
+
+
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _request_statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+class Recorder:
+    """Latency, SQL count and status of every request, by route template."""
+
+    def __init__(self, client: httpx.AsyncClient, app):
+        self.client = client
+        self.app = app
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.first_error = {}
+
+    def _error(self, route: str, status: int, text: str):
+        if status >= 400:
+            self.errors[route] += 1
+            self.first_error.setdefault(route, f"{status} {text[:200]}")
+
+    async def call(self, route: str, url: str, headers=None, json=None):
+        method = route.split(" ", 1)[0]
+        token = _request_statements.set([])
+        try:
+            start = time.perf_counter()
+            r = await self.client.request(method, url, headers=headers, json=json)
+            self.latencies[route].append((time.perf_counter() - start) * 1000)
+            self.queries[route].append(len(_request_statements.get()))
+        finally:
+            _request_statements.reset(token)
+        self._error(route, r.status_code, r.text)
+        return r
+
+    async def first_event(self, route: str, url: str, headers=None):
+        """
+        GET a Server-Sent Events stream until its first event (the
+        snapshot), then disconnect. Drives the ASGI app directly: httpx's
+        ASGI transport only returns once the response body is complete.
+        """
+        path, _, query = url.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "root_path": "",
+            "server": ("load", 80), "client": ("127.0.0.1", 0),
+            "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        }
+        response = {"status": 500, "body": b""}
+        got_event = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await got_event.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+                if response["body"] or not message.get("more_body"):
+                    got_event.set()
+
+        token = _request_statements.set([])
+        try:
+            start = time.perf_counter()
+            app = asyncio.create_task(self.app(scope, receive, send))
+            await asyncio.wait({app, asyncio.create_task(got_event.wait())},
+                               return_when=asyncio.FIRST_COMPLETED)
+            self.latencies[route].append((time.perf_counter() - start) * 1000)
+            got_event.set()
+            await app
+            self.queries[route].append(len(_request_statements.get()))
+        finally:
+            _request_statements.reset(token)
+        self._error(route, response["status"], response["body"].decode(errors="replace"))
+
+    def report(self, elapsed: float) -> dict:
+        from benchmarks.common import percentile
+
+        routes = {}
+        for route in sorted(self.latencies):
+            latencies, queries = self.latencies[route], self.queries[route]
+            routes[route] = {
+                "requests": len(latencies),
+                "errors": self.errors[route],
+                "rps": round(len(latencies) / elapsed, 1),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "queries_per_request": round(sum(queries) / len(queries), 2),
+                "max_queries": max(queries),
+            }
+            if route in self.first_error:
+                routes[route]["first_error"] = self.first_error[route]
+        everything = [ms for samples in self.latencies.values() for ms in samples]
+        return {
+            "requests": len(everything),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(everything) / elapsed, 1),
+            "p50_ms": round(percentile(everything, 50), 2),
+            "p95_ms": round(percentile(everything, 95), 2),
+            "p99_ms": round(percentile(everything, 99), 2),
+            "routes": routes,
+        }
+
+
+# ======================
+# SYNTHETIC DATASET
+# ======================
+def seed(db, args, password_hash):
+    """Admins own one zone each; drivers have booking history."""
+    from sqlalchemy import insert
+
+    from app import models
+
+    rng = random.Random(args.seed)
+    db.execute(insert(models.User), [
+        {"name": f"Admin {i}", "email": f"admin{i}@example.com",
+         "password": password_hash, "role": "admin"}
+        for i in range(args.zones)
+    ] + [
+        {"name": f"Driver {i}", "email": f"driver{i}@example.com",
+         "password": password_hash, "role": "driver"}
+        for i in range(args.users)
+    ])
+
+    areas = ["Anna Nagar", "Adyar", "T Nagar", "Velachery", "Guindy", "Mylapore", "Porur", "Egmore"]
+    kinds = ["Mall", "Metro", "Hospital", "Market", "Station", "Beach", "Tech Park", "Cinema"]
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"{rng.choice(areas)} {rng.choice(kinds)} {i}",
+         "latitude": 13.08 + rng.uniform(-0.1, 0.1), "longitude": 80.27 + rng.uniform(-0.1, 0.1),
+         "total_slots": args.slots_per_zone, "available_slots": args.slots_per_zone,
+         "admin_id": i + 1}
+        for i in range(args.zones)
+    ])
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{n + 1}", "vehicle_type": ("car", "car", "bike", "truck")[n % 4],
+         "status": "available", "price_per_hour": 10 + n % 4 * 5, "zone_id": z + 1}
+        for z in range(args.zones) for n in range(args.slots_per_zone)
+    ])
+
+    # Finished bookings only, so every driver starts without an active one
+    now = datetime.utcnow()
+    for offset in range(0, args.bookings, 50000):
+        rows = []
+        for _ in range(offset, min(args.bookings, offset + 50000)):
+            zone = rng.randrange(args.zones)
+            start = now - timedelta(minutes=rng.randrange(180 * 24 * 60))
+            hours = rng.randint(1, 4)
+            rows.append({
+                "user_id": args.zones + 1 + rng.randrange(args.users), "zone_id": zone + 1,
+                "slot_id": zone * args.slots_per_zone + rng.randrange(args.slots_per_zone) + 1,
+                "start_time": start, "end_time": start + timedelta(hours=hours),
+                "duration_hours": hours, "amount_paid": 10.0 * hours,
+                "status": "completed" if rng.random() < 0.85 else "cancelled"
+            })
+        db.execute(insert(models.Booking), rows)
+    db.commit()
+
+
+def bearer(email: str, role: str) -> dict:
+    from app.auth import create_access_token
+    return {"Authorization": f"Bearer {create_access_token({'sub': email, 'role': role})}"}
+
+
+# ======================
+# FLOWS (one iteration each)
+# ======================
+async def driver_flow(rec: Recorder, me: dict, i: int, args, state: dict):
+    zone_id = random.randint(1, args.zones)
+    await rec.call("GET /parking/zones", "/parking/zones", me)
+    await sync_changes(rec, me, state)
+    await rec.call("GET /parking/zones/search", f"/parking/zones/search?name={random.choice(['nagar', 'mall', 'metro 1'])}", me)
+    await rec.call("GET /parking/zones/autocomplete", f"/parking/zones/autocomplete?q={random.choice(['ad', 'gui', 'vela'])}", me)
+    await rec.call("GET /parking/zones/nearby", "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5", me)
+    await rec.call("GET /parking/zones/nearby (filtered)",
+                   "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5&vehicle_type=car&max_price_per_hour=15", me)
+    await rec.call("GET /parking/zones/best",
+                   f"/parking/zones/best?latitude=13.08&longitude=80.27&radius_km=5&vehicle_type={random.choice(['car', 'bike'])}", me)
+    await rec.call("GET /parking/zones/availability",
+                   "/parking/zones/availability?min_lat=13.03&max_lat=13.13&min_lon=80.22&max_lon=80.32", me)
+    await rec.first_event("GET /parking/zones/stream",
+                          "/parking/zones/stream?min_lat=13.03&max_lat=13.13&min_lon=80.22&max_lon=80.32", me)
+
+    r = await rec.call("POST /parking/bookings", "/parking/bookings", me, {"zone_id": zone_id, "duration_hours": 2})
+    if r.status_code == 201:
+        booking_id = r.json()["booking_id"]
+        await rec.call("GET /parking/bookings/active", "/parking/bookings/active", me)
+        await rec.call("PATCH /parking/bookings/{booking_id}/extend",
+                       f"/parking/bookings/{booking_id}/extend", me, {"additional_hours": 1})
+        action = "complete" if i % 2 else "cancel"
+        await rec.call(f"PATCH /parking/bookings/{{booking_id}}/{action}",
+                       f"/parking/bookings/{booking_id}/{action}", me)
+
+    r = await rec.call("GET /parking/bookings/history", "/parking/bookings/history?limit=20", me)
+    cursor = r.headers.get("x-next-cursor")
+    if cursor:
+        await rec.call("GET /parking/bookings/history?cursor",
+                       f"/parking/bookings/history?limit=20&cursor={cursor}", me)
+    await rec.call("GET /parking/profile/stats", "/parking/profile/stats", me)
+
+
+async def sync_changes(rec: Recorder, me: dict, state: dict):
+    """Delta sync from the client's last version, like a mobile app on resume."""
+    r = await rec.call("GET /parking/zones/changes",
+                       f"/parking/zones/changes?since={state.get('since', 0)}&limit=1000", me)
+    if r.status_code == 200:
+        state["since"] = r.json()["version"]
+
+
+async def admin_flow(rec: Recorder, me: dict, i: int, args, client_id: int, zone_id: int, state: dict):
+    base = f"/parking/zones/{zone_id}"
+    zone = (await rec.call("GET /parking/zones/my-zone", "/parking/zones/my-zone", me)).json()
+    await sync_changes(rec, me, state)
+
+    r = await rec.call("POST /parking/zones/{zone_id}/slots", f"{base}/slots", me,
+                       {"slot_number": f"L{client_id}-{i}", "vehicle_type": "car", "price_per_hour": 20})
+    if r.status_code == 201:
+        slot = f"{base}/slots/{r.json()['slot_id']}"
+        for status in ("occupied", "available"):
+            await rec.call("PATCH /parking/zones/{zone_id}/slots/{slot_id}/status",
+                           f"{slot}/status", me, {"status": status})
+        await rec.call("DELETE /parking/zones/{zone_id}/slots/{slot_id}", slot, me)
+
+    first = (client_id * 100000 + i) * 5 + 1
+    await rec.call("POST /parking/zones/{zone_id}/slots/bulk", f"{base}/slots/bulk", me,
+                   {"ranges": [{"slot_range": f"B{first}-B{first + 4}", "vehicle_type": "bike"}]})
+    await rec.call("GET /parking/zones/{zone_id}/slots", f"{base}/slots?status=available&vehicle_type=car", me)
+    await rec.call("GET /parking/zones/{zone_id}/slots/stats", f"{base}/slots/stats", me)
+    await rec.call("PATCH /parking/zones/{zone_id}/availability", f"{base}/availability", me,
+                   {"available_slots": zone["available_slots"]})
+    await rec.call("GET /parking/admin/bookings", "/parking/admin/bookings?limit=20", me)
+    await rec.call("GET /parking/admin/bookings/stats", "/parking/admin/bookings/stats", me)
+    await rec.call("GET /parking/admin/analytics/occupancy", "/parking/admin/analytics/occupancy", me)
+    await rec.call("GET /parking/admin/sweeper/stats", "/parking/admin/sweeper/stats", me)
+    # Stands in for the Prometheus scraper
+    await rec.call("GET /metrics", "/metrics")
+
+
+async def auth_flow(rec: Recorder, i: int, client_id: int):
+    role = "admin" if (client_id + i) % 2 else "driver"
+    email = f"new-{role}-{client_id}-{i}@example.com"
+    await rec.call("POST /auth/register", "/auth/register", None,
+                   {"name": "New", "email": email, "password": PASSWORD, "role": role})
+    r = await rec.call("POST /auth/login", "/auth/login", None, {"email": email, "password": PASSWORD})
+    if role == "admin" and r.status_code == 200:
+        me = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        await rec.call("POST /parking/zones", "/parking/zones", me, {
+            "name": f"New Zone {client_id}-{i}", "total_slots": 10,
+            "latitude": 13.08 + random.uniform(-0.1, 0.1), "longitude": 80.27 + random.uniform(-0.1, 0.1)
+        })
+
+
+async def drive(app, args) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+        rec = Recorder(client, app)
+        deadline = time.perf_counter() + args.duration
+
+        async def virtual_client(client_id: int):
+            role = ROLE_MIX[client_id % len(ROLE_MIX)]
+            # Each driver / admin client is a different seeded user, so
+            # one-active-booking and one-zone rules never collide
+            if role == "driver":
+                me = bearer(f"driver{client_id}@example.com", "driver")
+            elif role == "admin":
+                me = bearer(f"admin{client_id}@example.com", "admin")
+            i, state = 0, {}
+            while time.perf_counter() < deadline:
+                if role == "driver":
+                    await driver_flow(rec, me, i, args, state)
+                elif role == "admin":
+                    await admin_flow(rec, me, i, args, client_id, zone_id=client_id + 1, state=state)
+                else:
+                    await auth_flow(rec, i, client_id)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_client(c) for c in range(args.clients)))
+        return rec.report(time.perf_counter() - started)
+
+
+# ======================
+# REPORTING
+# ======================
+def environment(args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "cpus": os.cpu_count(),
+        "mode": os.environ["PARKING_DB_MODE"],
+        "sqlite_profile": os.getenv("PARKING_SQLITE_PROFILE", "wal"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+    }
+
+
+def print_report(result: dict, baseline: Optional[dict]):
+    old_routes = baseline["routes"] if baseline else {}
+    print(f"{'route':<54} {'req':>6} {'req/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'sql':>5} {'err':>4}"
+          + ("   p95 vs base" if baseline else ""))
+    for route, r in {**result["routes"], "ALL": result}.items():
+        line = (f"{route:<54} {r['requests']:>6} {r['rps']:>7.1f} {r['p50_ms']:>7.1f} "
+                f"{r['p95_ms']:>7.1f} {r['p99_ms']:>7.1f} {r.get('queries_per_request', ''):>5} {r['errors']:>4}")
+        old = baseline if route == "ALL" else old_routes.get(route)
+        if old:
+            line += f"   {(r['p95_ms'] / old['p95_ms'] - 1) * 100 if old['p95_ms'] else 0:+6.0f}%"
+            # Fractions come from cache hits; flag whole-statement changes
+            if "queries_per_request" in old and abs(old["queries_per_request"] - r["queries_per_request"]) >= 0.5:
+                line += f"  sql {old['queries_per_request']} -> {r['queries_per_request']}"
+        print(line)
+        if "first_error" in r:
+            print(f"    first error: {r['first_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000, help="seeded drivers")
+    parser.add_argument("--zones", type=int, default=500, help="seeded zones (one admin each)")
+    parser.add_argument("--slots-per-zone", type=int, default=40)
+    parser.add_argument("--bookings", type=int, default=100000, help="seeded finished bookings")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent virtual clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load")
+    parser.add_argument("--mode", choices=("sync", "async"), default=os.getenv("PARKING_DB_MODE", "sync"))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results here")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    args = parser.parse_args()
+    if args.users < args.clients or args.zones < args.clients:
+        parser.error("--users and --zones must each be at least --clients")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["result"]
+    if args.json:
+        args.json = os.path.abspath(args.json)
+
+    os.environ["PARKING_DB_MODE"] = args.mode
+    os.environ.setdefault("PARKING_SWEEP_INTERVAL", "0")
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.database opens ./parking.db when imported: import the app from
+        # inside the temp dir so every run starts from an empty database
+        os.chdir(tmp)
+        from app.database import SessionLocal, engine, read_engine, async_engine, async_read_engine
+        from app.main import app
+        from app.passwords import hash_password
+        from sqlalchemy import event
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            seed(db, args, hash_password(PASSWORD))
+        finally:
+            db.close()
+        print(f"seeded {args.users} drivers, {args.zones} zones x {args.slots_per_zone} slots, "
+              f"{args.bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+        engines = {engine, read_engine}
+        engines |= {e.sync_engine for e in (async_engine, async_read_engine) if e is not None}
+        for e in engines:
+            event.listen(e, "before_cursor_execute", record_statement)
+
+        async def run():
+            await app.router.startup()
+            try:
+                return await drive(app, args)
+            finally:
+                await app.router.shutdown()
+
+        print(f"{args.clients} clients ({args.mode}), {args.duration:.0f}s")
+        result = asyncio.run(run())
+        os.chdir("/")
+
+    print_report(result, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(args), "result": result}, f, indent=2)
+        print(f"wrote {args.json}")
+    if result["errors"]:
+        sys.exit(f"{result['errors']} requests failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/load_double_booking.py
+#
+# Many threads book the same small zone at once; afterwards every slot must
+# have at most one active booking and the zone counter must match.
+#   python -m benchmarks.load_double_booking --slots 50 --drivers 400 --threads 32
+#   python -m benchmarks.load_double_booking --specific   (race on requested slots)
+
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app import models, schemas
+from app.allocator import slot_allocator
+from app.parking import create_booking
+from benchmarks.common import temp_database
+
+
+def seed(db, slots, drivers):
+    admin = models.User(name="admin", email="admin@example.com", password="x", role="admin")
+    db.add(admin)
+    db.flush()
+
+    zone = models.ParkingZone(
+        name="Hot zone", latitude=13.0, longitude=80.0,
+        total_slots=slots, available_slots=slots, admin_id=admin.id
+    )
+    db.add(zone)
+    db.flush()
+
+    db.execute(insert(models.ParkingSlot), [
+        {"slot_number": f"S{i}", "vehicle_type": "car", "status": "available",
+         "price_per_hour": 10, "zone_id": zone.id}
+        for i in range(slots)
+    ])
+    db.execute(insert(models.User), [
+        {"name": f"driver{i}", "email": f"driver{i}@example.com", "password": "x", "role": "driver"}
+        for i in range(drivers)
+    ])
+    db.commit()
+
+    driver_ids = [
+        user_id for (user_id,) in
+        db.query(models.User.id).filter(models.User.role == "driver")
+    ]
+    return zone.id, driver_ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slots", type=int, default=50)
+    parser.add_argument("--drivers", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--specific", action="store_true",
+                        help="request random specific slots instead of auto-assign")
+    args = parser.parse_args()
+
+    with temp_database() as Session:
+        db = Session()
+        zone_id, driver_ids = seed(db, args.slots, args.drivers)
+        slot_allocator.load(db)
+        db.close()
+
+        outcomes = Counter()
+
+        def book(driver_id):
+            session = Session()
+            slot_id = random.randint(1, args.slots) if args.specific else None
+            try:
+                create_booking(
+                    data=schemas.BookingCreate(zone_id=zone_id, slot_id=slot_id, duration_hours=1),
+                    db=session, driver=SimpleNamespace(id=driver_id)
+                )
+                outcomes["booked"] += 1
+            except HTTPException as exc:
+                outcomes[f"{exc.status_code} {exc.detail}"] += 1
+            except Exception as exc:
+                outcomes[f"error {type(exc).__name__}"] += 1
+            finally:
+                session.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(book, driver_ids))
+        elapsed = time.perf_counter() - start
+
+        db = Session()
+        active = db.query(models.Booking.slot_id).filter(models.Booking.status == "active").all()
+        per_slot = Counter(slot_id for (slot_id,) in active)
+        occupied = db.query(models.ParkingSlot).filter(models.ParkingSlot.status == "occupied").count()
+        zone = db.get(models.ParkingZone, zone_id)
+
+        print(f"{args.drivers} drivers, {args.slots} slots, {args.threads} threads, {elapsed:.2f}s")
+        for outcome, count in outcomes.most_common():
+            print(f"  {count:>5}  {outcome}")
+
+        double_booked = [slot_id for slot_id, n in per_slot.items() if n > 1]
+        print(f"active bookings: {len(active)}, occupied slots: {occupied}, "
+              f"zone available: {zone.available_slots}/{zone.total_slots}")
+        assert not double_booked, f"double-booked slots: {double_booked}"
+        assert len(active) == occupied == outcomes["booked"] <= args.slots
+        assert zone.available_slots == zone.total_slots - len(active)
+        print("OK: no double-booking")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
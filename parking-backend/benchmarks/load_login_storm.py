@@ -0,0 +1,103 @@
+# benchmarks/load_login_storm.py
+#
+# Latency of ordinary endpoints while a login storm runs. A uvicorn process
+# on a fresh database serves a few reader clients (zone listing / nearby)
+# first on their own, then while logins arrive at --login-rate per second,
+# far more than bcrypt can absorb. bcrypt runs on the hashing process pool,
+# so the readers should keep their latency; logins beyond the pool's queue
+# limit get a fast 503.
+#   python -m benchmarks.load_login_storm --login-rate 50 --readers 8 --duration 10
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.bench_async import BACKEND_DIR, seed, wait_ready
+from benchmarks.common import percentile
+
+READ_PATHS = [
+    "/parking/zones",
+    "/parking/zones/nearby?latitude=13.08&longitude=80.27&radius_km=5",
+]
+
+
+async def phase(client, headers, readers, login_rate, duration):
+    latencies, login_codes = [], Counter()
+    deadline = time.perf_counter() + duration
+
+    async def reader(i):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await client.get(READ_PATHS[i % len(READ_PATHS)], headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def login():
+        r = await client.post("/auth/login", json={
+            "email": "driver@example.com", "password": "secret123"
+        })
+        login_codes[r.status_code] += 1
+
+    async def storm():
+        # Open loop: new logins keep arriving whether or not earlier ones finished
+        tasks = []
+        while login_rate and time.perf_counter() < deadline:
+            tasks.append(asyncio.create_task(login()))
+            await asyncio.sleep(1 / login_rate)
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(storm(), *(reader(i) for i in range(readers)))
+    return latencies, login_codes
+
+
+async def drive(base_url, args):
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await wait_ready(client)
+        headers = await seed(client, args.zones)
+
+        results = []
+        for label, rate in (("quiet", 0), ("login storm", args.login_rate)):
+            latencies, codes = await phase(client, headers, args.readers, rate, args.duration)
+            results.append((label, latencies, codes))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--login-rate", type=float, default=50, help="login attempts per second")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--mode", default="sync", choices=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PARKING_DB_MODE=args.mode, PYTHONPATH=BACKEND_DIR)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=tmp, env=env
+        )
+        try:
+            results = asyncio.run(drive(f"http://127.0.0.1:{args.port}", args))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.mode} mode, {args.readers} readers, {args.login_rate:.0f} logins/s, {args.duration:.0f}s per phase")
+    print(f"{'phase':<12} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  logins")
+    for label, latencies, codes in results:
+        logins = ", ".join(f"{code}: {n}" for code, n in sorted(codes.items())) or "-"
+        print(f"{label:<12} {len(latencies):>7} {percentile(latencies, 50):>8.1f} "
+              f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f}  {logins}")
+
+
+if __name__ == "__main__":
+    main()
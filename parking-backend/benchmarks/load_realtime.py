@@ -0,0 +1,118 @@
+# benchmarks/load_realtime.py
+#
+# Fan-out harness for the availability push (app/realtime.py). Thousands of
+# simulated subscribers - half watching a few zone ids, half a map
+# viewport - consume from one broker while writers fire bursts of changes.
+# Checks that each burst reaches a subscriber as one message and reports
+# per-tick fan-out cost and change-to-delivery latency.
+#   python -m benchmarks.load_realtime --subscribers 5000 --bursts 20 --burst-size 100
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import insert, update
+
+from app import models
+from app.realtime import AvailabilityBroker
+from benchmarks.common import percentile, temp_database
+
+
+def seed(db, zones):
+    db.execute(insert(models.ParkingZone), [
+        {"name": f"Zone {i}", "latitude": 13.0 + random.uniform(-0.2, 0.2),
+         "longitude": 80.0 + random.uniform(-0.2, 0.2),
+         "total_slots": 100, "available_slots": 100, "admin_id": i + 1}
+        for i in range(zones)
+    ])
+    db.commit()
+
+
+def random_viewport(span=0.1):
+    lat = 13.0 + random.uniform(-0.2, 0.2)
+    lon = 80.0 + random.uniform(-0.2, 0.2)
+    return lat - span / 2, lat + span / 2, lon - span / 2, lon + span / 2
+
+
+async def run(Session, args):
+    broker = AvailabilityBroker(session_factory=Session, tick=args.tick)
+
+    subs = []
+    for i in range(args.subscribers):
+        if i % 2:
+            subs.append(broker.subscribe(bbox=random_viewport()))
+        else:
+            subs.append(broker.subscribe(zone_ids=set(random.sample(range(1, args.zones + 1), 5))))
+
+    received = [0] * len(subs)
+    latencies = []
+    burst_started = {}
+
+    async def consumer(i, sub):
+        while True:
+            counts = await sub.next()
+            received[i] += 1
+            latencies.append((time.perf_counter() - burst_started["t"]) * 1000)
+
+    consumers = [asyncio.create_task(consumer(i, s)) for i, s in enumerate(subs)]
+
+    # Drive the ticks by hand to time each fan-out
+    fanout_ms, zones_sent = [], []
+    writer = Session()
+    try:
+        for _ in range(args.bursts):
+            changed = random.sample(range(1, args.zones + 1), args.burst_size)
+            writer.execute(
+                update(models.ParkingZone)
+                .where(models.ParkingZone.id.in_(changed))
+                .values(available_slots=models.ParkingZone.available_slots - 1)
+            )
+            writer.commit()
+
+            burst_started["t"] = time.perf_counter()
+            for zone_id in changed:  # one publish per change, like the routes
+                broker.publish([zone_id])
+
+            start = time.perf_counter()
+            zones_sent.append(await broker.flush())
+            fanout_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(args.tick)
+    finally:
+        writer.close()
+
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    return received, latencies, fanout_ms, zones_sent
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--zones", type=int, default=1000)
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--burst-size", type=int, default=100, help="changes per tick")
+    parser.add_argument("--tick", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with temp_database() as Session:
+        db = Session()
+        seed(db, args.zones)
+        db.close()
+        received, latencies, fanout_ms, zones_sent = asyncio.run(run(Session, args))
+
+    active = [n for n in received if n]
+    print(f"{args.subscribers} subscribers, {args.zones} zones, "
+          f"{args.bursts} bursts of {args.burst_size} changes")
+    print(f"  zones per tick         {sum(zones_sent) / len(zones_sent):.0f}")
+    print(f"  messages delivered     {sum(received)} to {len(active)} subscribers")
+    print(f"  max messages per sub   {max(received)} (bursts: {args.bursts})")
+    print(f"  fan-out per tick       p50 {percentile(fanout_ms, 50):.1f} ms, "
+          f"p99 {percentile(fanout_ms, 99):.1f} ms")
+    print(f"  change -> delivery     p50 {percentile(latencies, 50):.1f} ms, "
+          f"p99 {percentile(latencies, 99):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
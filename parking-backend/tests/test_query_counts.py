@@ -0,0 +1,58 @@
+# tests/test_query_counts.py
+#
+# N+1 guard for the booking listings and stats routes (the checks in
+# benchmarks/check_query_counts.py), in both DB modes: each handler runs on
+# a sync Session, and as its async twin (app/async_routes.py) through
+# run_sync() on an aiosqlite AsyncSession.
+#   python -m pytest -q
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.async_routes import _async_endpoint
+from benchmarks.check_query_counts import CHECKS, seed
+from benchmarks.common import assert_num_queries, temp_database
+
+
+@pytest.fixture(scope="module")
+def database():
+    """Seeded temp database: (sessionmaker, admin, driver)."""
+    with temp_database() as Session:
+        with Session() as db:
+            admin, driver = seed(db)
+        yield Session, admin, driver
+
+
+def run_sync_mode(Session, handler, expected, arguments):
+    with Session() as db:
+        with assert_num_queries(expected, db.get_bind()):
+            handler(db=db, **arguments)
+
+
+def run_async_mode(Session, handler, expected, arguments):
+    url = Session.kw["bind"].url.set(drivername="sqlite+aiosqlite")
+
+    async def run():
+        engine = create_async_engine(url)
+        try:
+            async with AsyncSession(engine, autoflush=False) as db:
+                with assert_num_queries(expected, engine.sync_engine):
+                    await _async_endpoint(handler)(db=db, **arguments)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+MODES = {"sync": run_sync_mode, "async": run_async_mode}
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize(
+    "route, expected, handler, arguments", CHECKS, ids=[check[0] for check in CHECKS]
+)
+def test_query_count(database, mode, route, expected, handler, arguments):
+    Session, admin, driver = database
+    MODES[mode](Session, handler, expected, arguments(admin, driver))